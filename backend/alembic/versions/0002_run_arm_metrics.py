@@ -0,0 +1,91 @@
+"""materialized per-run arm metrics for leaderboards
+
+Revision ID: 0002_run_arm_metrics
+Revises: 0001_initial
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_run_arm_metrics"
+down_revision: Union[str, None] = "0001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    workload_type = sa.Enum("pr_review", "ci_triage", name="workloadtype", create_type=False)
+    provider_type = sa.Enum("openai", "anthropic", "mock", name="providertype", create_type=False)
+
+    op.create_table(
+        "run_arm_metrics",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("run_id", sa.String(length=36), sa.ForeignKey("runs.id"), nullable=False),
+        sa.Column(
+            "experiment_id", sa.String(length=36), sa.ForeignKey("experiments.id"), nullable=False
+        ),
+        sa.Column("model_arm_id", sa.String(length=36), nullable=False),
+        sa.Column("workload_type", workload_type, nullable=False),
+        sa.Column("provider", provider_type, nullable=False),
+        sa.Column("model_name", sa.String(length=255), nullable=False),
+        sa.Column("display_name", sa.String(length=255), nullable=False),
+        sa.Column("quality_avg", sa.Float(), nullable=False),
+        sa.Column("pass_rate", sa.Float(), nullable=False),
+        sa.Column("attempt_count", sa.Integer(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("latency_p50_ms", sa.Float(), nullable=False),
+        sa.Column("latency_p95_ms", sa.Float(), nullable=False),
+        sa.Column("total_cost_usd", sa.Numeric(12, 6), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("run_id", "model_arm_id", name="uq_run_arm_metric"),
+    )
+    op.create_index(
+        "ix_run_arm_metrics_experiment_quality", "run_arm_metrics", ["experiment_id", "quality_avg"]
+    )
+    op.create_index(
+        "ix_run_arm_metrics_workload_quality", "run_arm_metrics", ["workload_type", "quality_avg"]
+    )
+    op.create_index("ix_run_arm_metrics_model", "run_arm_metrics", ["provider", "model_name"])
+
+    # Backfill from summaries already stored on completed runs.
+    op.execute(
+        """
+        INSERT INTO run_arm_metrics (
+            id, run_id, experiment_id, model_arm_id, workload_type, provider, model_name,
+            display_name, quality_avg, pass_rate, attempt_count, error_count,
+            latency_p50_ms, latency_p95_ms, total_cost_usd
+        )
+        SELECT
+            md5(runs.id || (m.value ->> 'model_arm_id'))::uuid::text,
+            runs.id,
+            runs.experiment_id,
+            m.value ->> 'model_arm_id',
+            experiments.workload_type,
+            (m.value ->> 'provider')::providertype,
+            m.value ->> 'model_name',
+            m.value ->> 'display_name',
+            (m.value ->> 'quality_avg')::float,
+            (m.value ->> 'pass_rate')::float,
+            (m.value ->> 'attempt_count')::int,
+            (m.value ->> 'error_count')::int,
+            (m.value ->> 'latency_p50_ms')::float,
+            (m.value ->> 'latency_p95_ms')::float,
+            (m.value ->> 'total_cost_usd')::numeric
+        FROM runs
+        JOIN experiments ON experiments.id = runs.experiment_id
+        CROSS JOIN LATERAL json_array_elements(runs.summary_json -> 'models') AS m(value)
+        WHERE runs.summary_json IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_arm_metrics_model", table_name="run_arm_metrics")
+    op.drop_index("ix_run_arm_metrics_workload_quality", table_name="run_arm_metrics")
+    op.drop_index("ix_run_arm_metrics_experiment_quality", table_name="run_arm_metrics")
+    op.drop_table("run_arm_metrics")
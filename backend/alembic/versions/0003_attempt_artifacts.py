@@ -0,0 +1,139 @@
+"""move attempt raw responses into a compressed content-addressed store
+
+Revision ID: 0003_attempt_artifacts
+Revises: 0002_run_arm_metrics
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_attempt_artifacts"
+down_revision: Union[str, None] = "0002_run_arm_metrics"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Frozen copy of app.services.artifact_store as of this revision: digests and codecs written
+# here must not change when the service's encoding does.
+ZSTD_CODEC = "zstd"
+ZLIB_CODEC = "zlib"
+COMPRESSION_LEVEL = 6
+
+
+def canonical_bytes(payload: dict) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def compress(content: bytes) -> tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(content), ZSTD_CODEC
+    return zlib.compress(content, COMPRESSION_LEVEL), ZLIB_CODEC
+
+
+def decompress(content: bytes, codec: str) -> bytes:
+    if codec == ZSTD_CODEC:
+        if zstandard is None:
+            raise RuntimeError("Reading zstd artifacts requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(content)
+    if codec == ZLIB_CODEC:
+        return zlib.decompress(content)
+    raise ValueError(f"Unsupported artifact codec: {codec}")
+
+
+attempts = sa.table(
+    "attempts",
+    sa.column("id", sa.String),
+    sa.column("raw_response", sa.JSON),
+    sa.column("raw_response_digest", sa.String),
+)
+artifacts = sa.table(
+    "attempt_artifacts",
+    sa.column("digest", sa.String),
+    sa.column("codec", sa.String),
+    sa.column("size_bytes", sa.Integer),
+    sa.column("compressed_size_bytes", sa.Integer),
+    sa.column("content", sa.LargeBinary),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attempt_artifacts",
+        sa.Column("digest", sa.String(length=64), primary_key=True),
+        sa.Column("codec", sa.String(length=16), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("compressed_size_bytes", sa.Integer(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    # Compressed blobs gain nothing from TOAST's own pglz pass; keep them out of line as-is.
+    op.execute("ALTER TABLE attempt_artifacts ALTER COLUMN content SET STORAGE EXTERNAL")
+    op.add_column("attempts", sa.Column("raw_response_digest", sa.String(length=64), nullable=True))
+
+    bind = op.get_bind()
+    seen: set[str] = set()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(attempts.c.id, attempts.c.raw_response)
+            .where(attempts.c.id > last_id)
+            .order_by(attempts.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        new_artifacts = []
+        for row in rows:
+            if not row.raw_response:
+                continue
+            raw = canonical_bytes(row.raw_response)
+            digest = hashlib.sha256(raw).hexdigest()
+            if digest not in seen:
+                seen.add(digest)
+                compressed, codec = compress(raw)
+                new_artifacts.append(
+                    {
+                        "digest": digest,
+                        "codec": codec,
+                        "size_bytes": len(raw),
+                        "compressed_size_bytes": len(compressed),
+                        "content": compressed,
+                    }
+                )
+            bind.execute(
+                attempts.update().where(attempts.c.id == row.id).values(raw_response_digest=digest)
+            )
+        if new_artifacts:
+            bind.execute(artifacts.insert(), new_artifacts)
+
+    op.drop_column("attempts", "raw_response")
+
+
+def downgrade() -> None:
+    op.add_column("attempts", sa.Column("raw_response", sa.JSON(), nullable=True))
+    bind = op.get_bind()
+    for artifact in bind.execute(sa.select(artifacts)).yield_per(BATCH_SIZE):
+        payload = json.loads(decompress(artifact.content, artifact.codec))
+        bind.execute(
+            attempts.update()
+            .where(attempts.c.raw_response_digest == artifact.digest)
+            .values(raw_response=payload)
+        )
+    op.drop_column("attempts", "raw_response_digest")
+    op.drop_table("attempt_artifacts")
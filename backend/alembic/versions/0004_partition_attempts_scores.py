@@ -0,0 +1,88 @@
+"""partition attempts and scores by created_at month
+
+Revision ID: 0004_partition_attempts_scores
+Revises: 0003_attempt_artifacts
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.services.partitions import add_months, month_start, partition_name
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_partition_attempts_scores"
+down_revision: Union[str, None] = "0003_attempt_artifacts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+FOREIGN_KEYS = {
+    "run_id": "runs",
+    "task_instance_id": "task_instances",
+    "model_arm_id": "model_arms",
+}
+UNIQUE_CONSTRAINTS = {
+    "attempts": ("uq_attempt_unique", ("run_id", "task_instance_id", "model_arm_id")),
+}
+
+
+def _add_constraints(table: str, partitioned: bool) -> None:
+    # Unique constraints on a partitioned table must include the partition key.
+    key = ("created_at",) if partitioned else ()
+    op.create_primary_key(f"{table}_pkey", table, ["id", *key])
+    if table in UNIQUE_CONSTRAINTS:
+        name, columns = UNIQUE_CONSTRAINTS[table]
+        op.create_unique_constraint(name, table, [*columns, *key])
+    for column, referent in FOREIGN_KEYS.items():
+        op.create_foreign_key(f"{table}_{column}_fkey", table, referent, [column], ["id"])
+    op.create_index(f"ix_{table}_run_id", table, ["run_id"])
+
+
+def _monthly_partitions(table: str) -> None:
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text(f"SELECT min(created_at) FROM {table}")).scalar()
+    current = month_start(datetime.now(timezone.utc))
+    month = month_start(oldest.astimezone(timezone.utc)) if oldest else current
+    while month <= add_months(current, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE {partition_name(table, month)} PARTITION OF {table}_partitioned "
+            f"FOR VALUES FROM ('{month.date().isoformat()}') "
+            f"TO ('{add_months(month, 1).date().isoformat()}')"
+        )
+        month = add_months(month, 1)
+    # Catches rows outside the maintained window until the partition job catches up.
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table}_partitioned DEFAULT")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("attempts", "scores"):
+        op.execute(
+            f"CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+        op.execute(f"ALTER TABLE {table}_partitioned ALTER COLUMN created_at SET NOT NULL")
+        _monthly_partitions(table)
+        op.execute(f"INSERT INTO {table}_partitioned SELECT * FROM {table}")
+        op.drop_table(table)
+        op.rename_table(f"{table}_partitioned", table)
+        _add_constraints(table, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("attempts", "scores"):
+        op.execute(f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table}_unpartitioned SELECT * FROM {table}")
+        op.drop_table(table)
+        op.rename_table(f"{table}_unpartitioned", table)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL")
+        _add_constraints(table, partitioned=False)
@@ -0,0 +1,113 @@
+"""store one score row per attempt with typed metric columns
+
+Revision ID: 0005_pivot_scores
+Revises: 0004_partition_attempts_scores
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_pivot_scores"
+down_revision: Union[str, None] = "0004_partition_attempts_scores"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy: the view in app.models.entities grows with later revisions.
+SCORE_METRICS_VIEW = """
+CREATE VIEW score_metrics AS
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'quality' AS metric_name, quality AS value, created_at
+FROM scores
+UNION ALL
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'pass' AS metric_name, CASE WHEN passed THEN 1.0 ELSE 0.0 END AS value, created_at
+FROM scores
+"""
+
+
+def upgrade() -> None:
+    op.add_column("task_instances", sa.Column("scoring_details", sa.JSON(), nullable=True))
+    op.add_column("scores", sa.Column("quality", sa.Float(), nullable=True))
+    op.add_column("scores", sa.Column("passed", sa.Boolean(), nullable=True))
+
+    # Fold each attempt's pass row into its quality row, then drop the pass rows.
+    op.execute(
+        """
+        UPDATE scores AS q
+        SET quality = q.value, passed = COALESCE(p.value >= 0.5, false)
+        FROM scores AS q2
+        LEFT JOIN scores AS p
+          ON p.run_id = q2.run_id
+         AND p.task_instance_id = q2.task_instance_id
+         AND p.model_arm_id = q2.model_arm_id
+         AND p.metric_name = 'pass'
+        WHERE q.id = q2.id AND q.metric_name = 'quality'
+        """
+    )
+    op.execute(
+        """
+        UPDATE task_instances AS t
+        SET scoring_details = json_build_object(
+            'expected_terms', s.details -> 'expected_terms', 'pass_threshold', 0.6
+        )
+        FROM (
+            SELECT DISTINCT ON (task_instance_id) task_instance_id, details
+            FROM scores
+            WHERE metric_name = 'quality'
+        ) AS s
+        WHERE s.task_instance_id = t.id
+        """
+    )
+    op.execute("DELETE FROM scores WHERE metric_name <> 'quality'")
+
+    op.drop_column("scores", "metric_name")
+    op.drop_column("scores", "value")
+    op.drop_column("scores", "details")
+    op.alter_column("scores", "quality", nullable=False)
+    op.alter_column("scores", "passed", nullable=False)
+    # scores is partitioned by created_at (0004), so the key must include it.
+    op.create_unique_constraint(
+        "uq_score_unique", "scores", ["run_id", "task_instance_id", "model_arm_id", "created_at"]
+    )
+    op.execute(SCORE_METRICS_VIEW)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS score_metrics")
+    op.drop_constraint("uq_score_unique", "scores", type_="unique")
+    op.add_column("scores", sa.Column("metric_name", sa.String(length=255), nullable=True))
+    op.add_column("scores", sa.Column("value", sa.Float(), nullable=True))
+    op.add_column("scores", sa.Column("details", sa.JSON(), nullable=True))
+    op.execute(
+        """
+        INSERT INTO scores (id, run_id, task_instance_id, model_arm_id, quality, passed,
+                            metric_name, value, details, created_at)
+        SELECT gen_random_uuid()::text, run_id, task_instance_id, model_arm_id, quality, passed,
+               'pass', CASE WHEN passed THEN 1.0 ELSE 0.0 END,
+               json_build_object('threshold', 0.6), created_at
+        FROM scores
+        """
+    )
+    op.execute(
+        """
+        UPDATE scores AS s
+        SET metric_name = 'quality',
+            value = s.quality,
+            details = json_build_object(
+                'expected_terms', COALESCE(t.scoring_details -> 'expected_terms', '[]'::json)
+            )
+        FROM task_instances AS t
+        WHERE t.id = s.task_instance_id AND s.metric_name IS NULL
+        """
+    )
+    op.alter_column("scores", "metric_name", nullable=False)
+    op.alter_column("scores", "value", nullable=False)
+    op.alter_column("scores", "details", nullable=False)
+    op.drop_column("scores", "quality")
+    op.drop_column("scores", "passed")
+    op.drop_column("task_instances", "scoring_details")
@@ -0,0 +1,60 @@
+"""cascade run and experiment deletes in the database
+
+Revision ID: 0006_cascade_deletes
+Revises: 0005_pivot_scores
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_cascade_deletes"
+down_revision: Union[str, None] = "0005_pivot_scores"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table). attempts/scores.model_arm_id are left as
+# NO ACTION so replacing an experiment's arms can never silently drop history.
+CASCADING_FOREIGN_KEYS = (
+    ("model_arms", "experiment_id", "experiments"),
+    ("runs", "experiment_id", "experiments"),
+    ("task_instances", "run_id", "runs"),
+    ("task_instances", "experiment_id", "experiments"),
+    ("attempts", "run_id", "runs"),
+    ("attempts", "task_instance_id", "task_instances"),
+    ("scores", "run_id", "runs"),
+    ("scores", "task_instance_id", "task_instances"),
+    ("run_arm_metrics", "run_id", "runs"),
+    ("run_arm_metrics", "experiment_id", "experiments"),
+)
+# Referencing-side indexes so each cascade or FK check is an index lookup.
+FOREIGN_KEY_INDEXES = (
+    ("model_arms", "experiment_id"),
+    ("runs", "experiment_id"),
+    ("task_instances", "experiment_id"),
+    ("attempts", "task_instance_id"),
+    ("attempts", "model_arm_id"),
+    ("scores", "task_instance_id"),
+    ("scores", "model_arm_id"),
+)
+
+
+def _recreate_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referent in CASCADING_FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(name, table, referent, [column], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    for table, column in FOREIGN_KEY_INDEXES:
+        op.create_index(f"ix_{table}_{column}", table, [column])
+    _recreate_foreign_keys("CASCADE")
+
+
+def downgrade() -> None:
+    _recreate_foreign_keys(None)
+    for table, column in FOREIGN_KEY_INDEXES:
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
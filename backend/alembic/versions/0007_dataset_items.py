@@ -0,0 +1,138 @@
+"""store dataset rows once and reference them from task instances
+
+Revision ID: 0007_dataset_items
+Revises: 0006_cascade_deletes
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+import hashlib
+import json
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_dataset_items"
+down_revision: Union[str, None] = "0006_cascade_deletes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def row_digest(row: dict) -> str:
+    # Frozen copy of app.services.dataset_loader.row_digest as of this revision.
+    content = {"input": row.get("input", {}), "expected": row.get("expected", {})}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+task_instances = sa.table(
+    "task_instances",
+    sa.column("id", sa.String),
+    sa.column("input_payload", sa.JSON),
+    sa.column("expected_payload", sa.JSON),
+    sa.column("scoring_details", sa.JSON),
+    sa.column("dataset_item_digest", sa.String),
+)
+dataset_items = sa.table(
+    "dataset_items",
+    sa.column("digest", sa.String),
+    sa.column("input_payload", sa.JSON),
+    sa.column("expected_payload", sa.JSON),
+    sa.column("scoring_details", sa.JSON),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dataset_items",
+        sa.Column("digest", sa.String(length=64), primary_key=True),
+        sa.Column("input_payload", sa.JSON(), nullable=False),
+        sa.Column("expected_payload", sa.JSON(), nullable=False),
+        sa.Column("scoring_details", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.add_column(
+        "task_instances", sa.Column("dataset_item_digest", sa.String(length=64), nullable=True)
+    )
+
+    bind = op.get_bind()
+    seen: set[str] = set()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(
+                task_instances.c.id,
+                task_instances.c.input_payload,
+                task_instances.c.expected_payload,
+                task_instances.c.scoring_details,
+            )
+            .where(task_instances.c.id > last_id)
+            .order_by(task_instances.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        new_items = []
+        for row in rows:
+            digest = row_digest({"input": row.input_payload, "expected": row.expected_payload})
+            if digest not in seen:
+                seen.add(digest)
+                new_items.append(
+                    {
+                        "digest": digest,
+                        "input_payload": row.input_payload,
+                        "expected_payload": row.expected_payload,
+                        "scoring_details": row.scoring_details,
+                    }
+                )
+            bind.execute(
+                task_instances.update()
+                .where(task_instances.c.id == row.id)
+                .values(dataset_item_digest=digest)
+            )
+        if new_items:
+            bind.execute(dataset_items.insert(), new_items)
+
+    op.alter_column("task_instances", "dataset_item_digest", nullable=False)
+    op.create_foreign_key(
+        "task_instances_dataset_item_digest_fkey",
+        "task_instances",
+        "dataset_items",
+        ["dataset_item_digest"],
+        ["digest"],
+    )
+    op.create_index(
+        "ix_task_instances_dataset_item_digest", "task_instances", ["dataset_item_digest"]
+    )
+    op.drop_column("task_instances", "input_payload")
+    op.drop_column("task_instances", "expected_payload")
+    op.drop_column("task_instances", "scoring_details")
+
+
+def downgrade() -> None:
+    op.add_column("task_instances", sa.Column("input_payload", sa.JSON(), nullable=True))
+    op.add_column("task_instances", sa.Column("expected_payload", sa.JSON(), nullable=True))
+    op.add_column("task_instances", sa.Column("scoring_details", sa.JSON(), nullable=True))
+    op.execute(
+        """
+        UPDATE task_instances AS t
+        SET input_payload = d.input_payload,
+            expected_payload = d.expected_payload,
+            scoring_details = d.scoring_details
+        FROM dataset_items AS d
+        WHERE d.digest = t.dataset_item_digest
+        """
+    )
+    op.alter_column("task_instances", "input_payload", nullable=False)
+    op.alter_column("task_instances", "expected_payload", nullable=False)
+    op.drop_index("ix_task_instances_dataset_item_digest", table_name="task_instances")
+    op.drop_constraint(
+        "task_instances_dataset_item_digest_fkey", "task_instances", type_="foreignkey"
+    )
+    op.drop_column("task_instances", "dataset_item_digest")
+    op.drop_table("dataset_items")
@@ -0,0 +1,31 @@
+"""record run reuse keys and arm fingerprints
+
+Revision ID: 0008_run_attempt_reuse
+Revises: 0007_dataset_items
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_run_attempt_reuse"
+down_revision: Union[str, None] = "0007_dataset_items"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing runs have no key and are simply never reused.
+    op.add_column("runs", sa.Column("reuse_key", sa.String(length=64), nullable=True))
+    op.add_column("runs", sa.Column("arm_fingerprints", sa.JSON(), nullable=True))
+    op.create_index("ix_runs_reuse_key", "runs", ["reuse_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_reuse_key", table_name="runs")
+    op.drop_column("runs", "arm_fingerprints")
+    op.drop_column("runs", "reuse_key")
@@ -0,0 +1,58 @@
+"""add llm judge scores, judgment cache and experiment evaluator config
+
+Revision ID: 0009_llm_judge
+Revises: 0008_run_attempt_reuse
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_llm_judge"
+down_revision: Union[str, None] = "0008_run_attempt_reuse"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORE_METRICS = """
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'quality' AS metric_name, quality AS value, created_at
+FROM scores
+UNION ALL
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'pass' AS metric_name, CASE WHEN passed THEN 1.0 ELSE 0.0 END AS value, created_at
+FROM scores
+"""
+JUDGE_METRIC = """
+UNION ALL
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'judge' AS metric_name, judge_score AS value, created_at
+FROM scores
+WHERE judge_score IS NOT NULL
+"""
+
+
+def upgrade() -> None:
+    op.add_column("experiments", sa.Column("evaluator", sa.JSON(), nullable=True))
+    op.add_column("scores", sa.Column("judge_score", sa.Float(), nullable=True))
+    op.create_table(
+        "judgments",
+        sa.Column("key", sa.String(length=64), primary_key=True),
+        sa.Column("rubric_version", sa.String(length=64), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("rationale", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.execute("DROP VIEW IF EXISTS score_metrics")
+    op.execute(f"CREATE VIEW score_metrics AS {SCORE_METRICS}{JUDGE_METRIC}")
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS score_metrics")
+    op.execute(f"CREATE VIEW score_metrics AS {SCORE_METRICS}")
+    op.drop_table("judgments")
+    op.drop_column("scores", "judge_score")
+    op.drop_column("experiments", "evaluator")
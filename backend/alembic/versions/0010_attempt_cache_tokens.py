@@ -0,0 +1,31 @@
+"""record cached prompt tokens on attempts
+
+Revision ID: 0010_attempt_cache_tokens
+Revises: 0009_llm_judge
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_attempt_cache_tokens"
+down_revision: Union[str, None] = "0009_llm_judge"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for column in ("usage_cache_read_tokens", "usage_cache_write_tokens"):
+        op.add_column(
+            "attempts",
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("attempts", "usage_cache_write_tokens")
+    op.drop_column("attempts", "usage_cache_read_tokens")
@@ -0,0 +1,46 @@
+"""store provider names as strings so registered providers need no migration
+
+Revision ID: 0011_provider_names
+Revises: 0010_attempt_cache_tokens
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_provider_names"
+down_revision: Union[str, None] = "0010_attempt_cache_tokens"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROVIDER_TABLES = ("model_arms", "run_arm_metrics")
+
+
+def upgrade() -> None:
+    for table in PROVIDER_TABLES:
+        op.alter_column(
+            table,
+            "provider",
+            type_=sa.String(64),
+            existing_nullable=False,
+            postgresql_using="provider::text",
+        )
+    sa.Enum(name="providertype").drop(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    # Fails while rows reference providers outside the original enum.
+    provider_type = sa.Enum("openai", "anthropic", "mock", name="providertype")
+    provider_type.create(op.get_bind(), checkfirst=True)
+    for table in PROVIDER_TABLES:
+        op.alter_column(
+            table,
+            "provider",
+            type_=provider_type,
+            existing_nullable=False,
+            postgresql_using="provider::providertype",
+        )
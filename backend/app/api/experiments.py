@@ -1,22 +1,35 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Optional, Union
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from starlette.responses import Response
 
+from app.api.fields import selected_fields
+from app.core.serialization import OrjsonResponse
 from app.db.session import get_db
-from app.models.entities import Experiment, ModelArm, Run
+from app.models.entities import Experiment, ModelArm, Run, RunStatus
 from app.schemas.experiments import (
+    DeletionJobResponse,
     ExperimentCreate,
     ExperimentResponse,
     ExperimentUpdate,
     ModelArmResponse,
 )
-from app.schemas.runs import RunCreate, RunResponse
+from app.schemas.runs import RunCreate, RunEstimateRequest, RunEstimateResponse, RunResponse
+from app.services.adaptive import is_adaptive
+from app.services.deletion import delete_experiment_rows, deletion_jobs, run_deletion_job
+from app.services.estimation import estimate_run
 from app.services.execution import ExecutionError, execute_run
 from app.services.organizations import get_or_create_default_org
 from app.services.planner import SUPPORTED_WORKLOADS
+from app.services.profiling import ProfilingBusyError, profiling_active
+from app.services.reuse import arm_fingerprint, fingerprint
 
 router = APIRouter(prefix="/experiments", tags=["experiments"])
 
@@ -40,6 +53,7 @@ def _to_experiment_response(experiment: Experiment) -> ExperimentResponse:
         dataset_ref=experiment.dataset_ref,
         dataset_hash=experiment.dataset_hash,
         sampling=experiment.sampling,
+        evaluator=experiment.evaluator,
         budget_usd=experiment.budget_usd,
         seed=experiment.seed,
         model_arms=arms,
@@ -48,6 +62,36 @@ def _to_experiment_response(experiment: Experiment) -> ExperimentResponse:
     )
 
 
+def _selected_experiments(
+    db: Session, names: list[str], experiment_id: Optional[str] = None
+) -> list[dict]:
+    # Only the requested columns are selected; arms are fetched in one extra query
+    # and only when asked for.
+    column_names = [name for name in names if name not in {"id", "model_arms"}]
+    stmt = select(Experiment.id, *[getattr(Experiment, name) for name in column_names])
+    if experiment_id is not None:
+        stmt = stmt.where(Experiment.id == experiment_id)
+    rows = db.execute(stmt.order_by(Experiment.created_at.desc())).all()
+
+    arms: dict[str, list[dict]] = defaultdict(list)
+    if "model_arms" in names and rows:
+        arm_fields = list(ModelArmResponse.model_fields)
+        arm_stmt = (
+            select(ModelArm.experiment_id, *[getattr(ModelArm, name) for name in arm_fields])
+            .where(ModelArm.experiment_id.in_([row[0] for row in rows]))
+            .order_by(ModelArm.display_name)
+        )
+        for owner_id, *values in db.execute(arm_stmt):
+            arms[owner_id].append(dict(zip(arm_fields, values)))
+
+    selected = []
+    for row_id, *values in rows:
+        columns = dict(zip(column_names, values))
+        columns.update(id=row_id, model_arms=arms[row_id])
+        selected.append({name: columns[name] for name in names})
+    return selected
+
+
 @router.post("", response_model=ExperimentResponse, status_code=status.HTTP_201_CREATED)
 def create_experiment(payload: ExperimentCreate, db: Session = Depends(get_db)) -> ExperimentResponse:
     if payload.workload_type.value not in SUPPORTED_WORKLOADS:
@@ -62,6 +106,7 @@ def create_experiment(payload: ExperimentCreate, db: Session = Depends(get_db))
         workload_type=payload.workload_type,
         dataset_ref=payload.dataset_ref,
         sampling=payload.sampling,
+        evaluator=payload.evaluator,
         budget_usd=payload.budget_usd,
         seed=payload.seed,
     )
@@ -89,7 +134,11 @@ def create_experiment(payload: ExperimentCreate, db: Session = Depends(get_db))
 
 
 @router.get("", response_model=list[ExperimentResponse])
-def list_experiments(db: Session = Depends(get_db)) -> list[ExperimentResponse]:
+def list_experiments(
+    fields: Optional[str] = Query(default=None), db: Session = Depends(get_db)
+) -> Union[list[ExperimentResponse], Response]:
+    if names := selected_fields(fields, ExperimentResponse):
+        return OrjsonResponse(_selected_experiments(db, names))
     experiments = db.scalars(
         select(Experiment)
         .options(selectinload(Experiment.model_arms))
@@ -99,7 +148,14 @@ def list_experiments(db: Session = Depends(get_db)) -> list[ExperimentResponse]:
 
 
 @router.get("/{experiment_id}", response_model=ExperimentResponse)
-def get_experiment(experiment_id: str, db: Session = Depends(get_db)) -> ExperimentResponse:
+def get_experiment(
+    experiment_id: str, fields: Optional[str] = Query(default=None), db: Session = Depends(get_db)
+) -> Union[ExperimentResponse, Response]:
+    if names := selected_fields(fields, ExperimentResponse):
+        selected = _selected_experiments(db, names, experiment_id)
+        if not selected:
+            raise HTTPException(status_code=404, detail="Experiment not found")
+        return OrjsonResponse(selected[0])
     experiment = db.scalar(
         select(Experiment)
         .options(selectinload(Experiment.model_arms))
@@ -135,21 +191,38 @@ def update_experiment(
         experiment.budget_usd = payload.budget_usd
     if payload.seed is not None:
         experiment.seed = payload.seed
+    if "evaluator" in payload.model_fields_set:
+        experiment.evaluator = payload.evaluator
 
     if payload.workload_type is not None:
         experiment.workload_type = payload.workload_type
 
     if payload.model_arms is not None:
-        experiment.model_arms.clear()
-        db.flush()
+        # Unchanged arms keep their rows so later runs can reuse their attempts. Several
+        # arms may share a fingerprint, so each payload entry claims at most one of them.
+        existing: dict[str, list[ModelArm]] = defaultdict(list)
+        for arm in experiment.model_arms:
+            existing[arm_fingerprint(arm)].append(arm)
+        kept: list[ModelArm] = []
         for arm_payload in payload.model_arms:
-            arm = ModelArm(
-                experiment_id=experiment.id,
-                provider=arm_payload.provider,
-                model_name=arm_payload.model_name,
-                display_name=arm_payload.display_name or arm_payload.model_name,
-                config=arm_payload.config,
+            matches = existing.get(
+                fingerprint(arm_payload.provider, arm_payload.model_name, arm_payload.config)
             )
+            arm = matches.pop(0) if matches else None
+            if arm is None:
+                arm = ModelArm(
+                    experiment_id=experiment.id,
+                    provider=arm_payload.provider,
+                    model_name=arm_payload.model_name,
+                    config=arm_payload.config,
+                )
+            arm.display_name = arm_payload.display_name or arm_payload.model_name
+            kept.append(arm)
+        for arms in existing.values():
+            for arm in arms:
+                experiment.model_arms.remove(arm)
+        db.flush()
+        for arm in kept:
             db.add(arm)
 
     db.add(experiment)
@@ -163,13 +236,58 @@ def update_experiment(
     return _to_experiment_response(experiment)
 
 
-@router.delete("/{experiment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_experiment(experiment_id: str, db: Session = Depends(get_db)) -> None:
-    experiment = db.scalar(select(Experiment).where(Experiment.id == experiment_id))
+@router.get("/deletions/{job_id}", response_model=DeletionJobResponse)
+def get_deletion_job(job_id: str) -> DeletionJobResponse:
+    job = deletion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+    return DeletionJobResponse.model_validate(job)
+
+
+@router.delete(
+    "/{experiment_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": DeletionJobResponse}},
+)
+def delete_experiment(
+    experiment_id: str,
+    background_tasks: BackgroundTasks,
+    background: bool = False,
+    db: Session = Depends(get_db),
+) -> Response:
+    if db.scalar(select(Experiment.id).where(Experiment.id == experiment_id)) is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    if not background:
+        delete_experiment_rows(db, experiment_id)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    job = deletion_jobs.active_for(experiment_id)
+    if job is None:
+        job = deletion_jobs.create(experiment_id)
+        background_tasks.add_task(run_deletion_job, job, db.get_bind())
+    return OrjsonResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=DeletionJobResponse.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"/experiments/deletions/{job.id}"},
+    )
+
+
+@router.post("/{experiment_id}/estimate", response_model=RunEstimateResponse)
+def estimate_experiment_run(
+    experiment_id: str, payload: RunEstimateRequest, db: Session = Depends(get_db)
+) -> RunEstimateResponse:
+    experiment = db.scalar(
+        select(Experiment)
+        .options(selectinload(Experiment.model_arms))
+        .where(Experiment.id == experiment_id)
+    )
     if not experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
-    db.delete(experiment)
-    db.commit()
+    try:
+        estimate = estimate_run(db, experiment, list(experiment.model_arms), payload.seed)
+    except (FileNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return RunEstimateResponse.model_validate(estimate)
 
 
 @router.post("/{experiment_id}/runs", response_model=RunResponse, status_code=status.HTTP_201_CREATED)
@@ -182,6 +300,31 @@ def launch_run(experiment_id: str, payload: RunCreate, db: Session = Depends(get
     if not experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
 
+    if payload.incremental and is_adaptive(experiment.sampling):
+        raise HTTPException(
+            status_code=400, detail="Incremental runs do not support adaptive sampling"
+        )
+    if payload.profile and profiling_active():
+        raise HTTPException(
+            status_code=409,
+            detail="Another profiled run is in progress; retry when it finishes",
+        )
+
+    if payload.enforce_budget:
+        try:
+            estimate = estimate_run(db, experiment, list(experiment.model_arms), payload.seed)
+        except (FileNotFoundError, ValueError):
+            # Dataset and sampling problems are recorded on the failed run below.
+            estimate = None
+        if estimate is not None and not estimate["within_budget"]:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Projected cost ${estimate['projected_cost_usd']:.4f} exceeds the "
+                    f"experiment budget ${estimate['budget_usd']:.4f}"
+                ),
+            )
+
     run = Run(
         experiment_id=experiment.id,
         seed=payload.seed if payload.seed is not None else experiment.seed,
@@ -192,7 +335,22 @@ def launch_run(experiment_id: str, payload: RunCreate, db: Session = Depends(get
     db.refresh(run)
 
     try:
-        run = execute_run(db, run, experiment, list(experiment.model_arms))
+        run = execute_run(
+            db,
+            run,
+            experiment,
+            list(experiment.model_arms),
+            profile=payload.profile,
+            reuse=payload.reuse_attempts,
+            incremental=payload.incremental,
+        )
+    except ProfilingBusyError as exc:
+        # Lost the race for the profiler after the run row was created; it never started.
+        run.status = RunStatus.FAILED
+        run.error_message = str(exc)
+        run.completed_at = datetime.now(timezone.utc)
+        db.commit()
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except ExecutionError as exc:
         raise HTTPException(status_code=500, detail=f"Run execution failed: {exc}") from exc
 
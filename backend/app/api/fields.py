@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+def selected_fields(fields: Optional[str], model: type[BaseModel]) -> Optional[list[str]]:
+    # fields is a comma-separated subset of the response model; columns outside it are
+    # never selected.
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(model.model_fields))
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields {unknown}; choose from {list(model.model_fields)}",
+        )
+    # Declaration order keeps the JSON key order stable whatever order was requested.
+    return [name for name in model.model_fields if name in requested]
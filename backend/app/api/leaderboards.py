@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.entities import WorkloadType
+from app.schemas.leaderboards import LeaderboardsResponse
+from app.services.leaderboards import build_leaderboards
+
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+
+
+@router.get("", response_model=LeaderboardsResponse)
+def get_leaderboards(
+    experiment_id: Optional[str] = None,
+    workload_type: Optional[WorkloadType] = None,
+    run_id: Optional[list[str]] = Query(default=None),
+    include_failed: bool = False,
+    limit: int = Query(default=20, ge=1, le=500),
+    db: Session = Depends(get_db),
+) -> LeaderboardsResponse:
+    leaderboards = build_leaderboards(
+        db,
+        experiment_id=experiment_id,
+        workload_type=workload_type,
+        run_ids=run_id,
+        include_failed=include_failed,
+        limit=limit,
+    )
+    return LeaderboardsResponse(**leaderboards)
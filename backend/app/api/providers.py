@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+
+from fastapi import APIRouter
+
+from app.providers.registry import get_registry
+from app.schemas.providers import ProviderResponse
+
+router = APIRouter(prefix="/providers", tags=["providers"])
+
+
+@router.get("", response_model=list[ProviderResponse])
+def list_providers() -> list[ProviderResponse]:
+    registry = get_registry()
+    return [
+        ProviderResponse(name=name, **asdict(registry.capabilities(name)))
+        for name in registry.names()
+    ]
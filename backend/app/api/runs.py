@@ -1,47 +1,222 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Optional
 
+from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
 
+from app.api.fields import selected_fields
+from app.core.metrics import record_cache_lookup
+from app.core.serialization import OrjsonResponse
 from app.db.session import get_db
-from app.models.entities import Attempt, Run
-from app.schemas.runs import AttemptResponse, RunResponse, RunSummaryResponse
+from app.models.entities import Attempt, ModelArm, Run, RunStatus
+from app.schemas.runs import (
+    AttemptResponse,
+    PairedComparisonResponse,
+    ProfileArtifactResponse,
+    RunResponse,
+    RunSummaryResponse,
+)
+from app.services.artifact_store import get_artifact_store
+from app.services.comparison import compare_arms
+from app.services.export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_MEDIA_TYPES,
+    PARQUET_FORMAT,
+    require_pyarrow,
+    stream_export,
+)
+from app.services.partitions import run_partition_floor
+from app.services.profiling import PROFILE_ARTIFACTS, list_profile_artifacts, profile_artifact_path
+from app.services.scorer import COMPARISON_METRICS
+from app.services.summary_cache import (
+    RUN_VIEW,
+    SUMMARY_VIEW,
+    CachedPayload,
+    compute_etag,
+    etag_matches,
+    get_summary_cache,
+)
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
+TERMINAL_STATUSES = {RunStatus.SUCCEEDED, RunStatus.FAILED}
+
+
+def _is_cacheable(run: Run) -> bool:
+    return run.status in TERMINAL_STATUSES and run.completed_at is not None
+
+
+def _conditional_response(request: Request, payload: CachedPayload) -> Response:
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+def _cached_view(
+    request: Request,
+    db: Session,
+    run_id: str,
+    view: str,
+    render: Callable[[Run], BaseModel],
+) -> Response:
+    cache = get_summary_cache()
+    payload = cache.get(run_id, view)
+    record_cache_lookup("run_summary", hit=payload is not None)
+    if payload is None:
+        run = db.scalar(select(Run).where(Run.id == run_id))
+        if not run:
+            raise HTTPException(status_code=404, detail="Run not found")
+        body = render(run).model_dump_json().encode("utf-8")
+        payload = CachedPayload(body=body, etag=compute_etag(body))
+        if _is_cacheable(run):
+            cache.set(run_id, view, payload)
+    return _conditional_response(request, payload)
+
+
+@router.get("/export")
+def export_runs(
+    run_id: list[str] = Query(..., min_length=1),
+    export_format: str = Query(default=PARQUET_FORMAT, alias="format"),
+    chunk_size: int = Query(default=DEFAULT_CHUNK_SIZE, ge=100, le=100_000),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    if export_format not in EXPORT_MEDIA_TYPES:
+        detail = f"format must be one of {sorted(EXPORT_MEDIA_TYPES)}"
+        raise HTTPException(status_code=400, detail=detail)
+    try:
+        require_pyarrow()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=501, detail=str(exc)) from exc
+    run_ids = list(dict.fromkeys(run_id))
+    runs = db.scalars(select(Run).where(Run.id.in_(run_ids))).all()
+    found = {run.id for run in runs}
+    if missing := [value for value in run_ids if value not in found]:
+        raise HTTPException(status_code=404, detail=f"Run not found: {', '.join(missing)}")
+    floors = [floor for run in runs if (floor := run_partition_floor(run)) is not None]
+
+    filename = f"{run_ids[0] if len(run_ids) == 1 else 'runs'}.{export_format}"
+    return StreamingResponse(
+        stream_export(db, run_ids, export_format, chunk_size, since=min(floors, default=None)),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
 @router.get("/{run_id}", response_model=RunResponse)
-def get_run(run_id: str, db: Session = Depends(get_db)) -> RunResponse:
-    run = db.scalar(select(Run).where(Run.id == run_id))
-    if not run:
-        raise HTTPException(status_code=404, detail="Run not found")
-    return RunResponse.model_validate(run)
+def get_run(run_id: str, request: Request, db: Session = Depends(get_db)) -> Response:
+    return _cached_view(request, db, run_id, RUN_VIEW, RunResponse.model_validate)
 
 
 @router.get("/{run_id}/summary", response_model=RunSummaryResponse)
-def get_run_summary(run_id: str, db: Session = Depends(get_db)) -> RunSummaryResponse:
-    run = db.scalar(select(Run).where(Run.id == run_id))
-    if not run:
-        raise HTTPException(status_code=404, detail="Run not found")
-    return RunSummaryResponse(run_id=run.id, status=run.status, summary=run.summary_json)
+def get_run_summary(run_id: str, request: Request, db: Session = Depends(get_db)) -> Response:
+    return _cached_view(
+        request,
+        db,
+        run_id,
+        SUMMARY_VIEW,
+        lambda run: RunSummaryResponse(run_id=run.id, status=run.status, summary=run.summary_json),
+    )
 
 
 @router.get("/{run_id}/attempts", response_model=list[AttemptResponse])
 def list_attempts(
     run_id: str,
     model_arm_id: Optional[str] = None,
+    fields: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
-) -> list[AttemptResponse]:
+) -> Response:
+    names = selected_fields(fields, AttemptResponse) or list(AttemptResponse.model_fields)
     run = db.scalar(select(Run).where(Run.id == run_id))
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    stmt = select(Attempt).where(Attempt.run_id == run_id).order_by(Attempt.created_at.asc())
+    # Plain rows straight into orjson skip ORM identity tracking and per-row model
+    # validation; the bytes match what AttemptResponse would serialize to.
+    columns = [getattr(Attempt, name) for name in names]
+    stmt = select(*columns).where(Attempt.run_id == run_id).order_by(Attempt.created_at.asc())
+    if (floor := run_partition_floor(run)) is not None:
+        stmt = stmt.where(Attempt.created_at >= floor)
     if model_arm_id:
         stmt = stmt.where(Attempt.model_arm_id == model_arm_id)
-    attempts = db.scalars(stmt).all()
-    return [AttemptResponse.model_validate(attempt) for attempt in attempts]
+    return OrjsonResponse([row._asdict() for row in db.execute(stmt)])
+
+
+@router.get("/{run_id}/attempts/{attempt_id}/raw_response")
+def get_attempt_raw_response(run_id: str, attempt_id: str, db: Session = Depends(get_db)) -> dict:
+    attempt = db.scalar(select(Attempt).where(Attempt.id == attempt_id, Attempt.run_id == run_id))
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    raw_response = get_artifact_store().get(db, attempt.raw_response_digest)
+    if raw_response is None:
+        raise HTTPException(status_code=404, detail="Raw response not stored for this attempt")
+    return raw_response
+
+
+@router.get("/{run_id}/compare", response_model=PairedComparisonResponse)
+def compare_run_arms(
+    run_id: str,
+    arm_a: str,
+    arm_b: str,
+    metric: str = "quality",
+    n_resamples: int = Query(default=10_000, ge=100, le=100_000),
+    confidence: float = Query(default=0.95, gt=0.0, lt=1.0),
+    db: Session = Depends(get_db),
+) -> PairedComparisonResponse:
+    run = db.scalar(select(Run).where(Run.id == run_id))
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if arm_a == arm_b:
+        raise HTTPException(status_code=400, detail="arm_a and arm_b must differ")
+    if metric not in COMPARISON_METRICS:
+        raise HTTPException(
+            status_code=400, detail=f"metric must be one of {list(COMPARISON_METRICS)}"
+        )
+    known_arms = set(
+        db.scalars(
+            select(ModelArm.id).where(
+                ModelArm.experiment_id == run.experiment_id, ModelArm.id.in_([arm_a, arm_b])
+            )
+        )
+    )
+    if known_arms != {arm_a, arm_b}:
+        raise HTTPException(status_code=404, detail="Model arm not found")
+    try:
+        comparison = compare_arms(
+            db, run, arm_a, arm_b, metric=metric, n_resamples=n_resamples, confidence=confidence
+        )
+    except ValueError as exc:
+        # Both arms exist, but this run has no paired scores for them on this metric.
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return PairedComparisonResponse(**comparison.as_dict())
+
+
+@router.get("/{run_id}/profile", response_model=list[ProfileArtifactResponse])
+def list_run_profile(run_id: str, db: Session = Depends(get_db)) -> list[ProfileArtifactResponse]:
+    run = db.scalar(select(Run).where(Run.id == run_id))
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    artifacts = list_profile_artifacts(run.id)
+    if not artifacts:
+        raise HTTPException(status_code=404, detail="Run was not profiled")
+    return [ProfileArtifactResponse(**artifact) for artifact in artifacts]
+
+
+@router.get("/{run_id}/profile/{artifact}")
+def download_run_profile(run_id: str, artifact: str, db: Session = Depends(get_db)) -> FileResponse:
+    run = db.scalar(select(Run).where(Run.id == run_id))
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    path = profile_artifact_path(run.id, artifact)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile artifact not found")
+    return FileResponse(
+        path, media_type=PROFILE_ARTIFACTS[artifact], filename=f"{run_id}-{artifact}"
+    )
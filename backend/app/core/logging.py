@@ -1,8 +1,11 @@
-import json
 import logging
 import sys
 from datetime import datetime, timezone
 
+from app.core.serialization import dumps_str
+
+EXTRA_FIELDS = ("correlation_id", "stage", "duration_ms")
+
 
 class JsonLogFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -12,9 +15,10 @@ class JsonLogFormatter(logging.Formatter):
             "logger": record.name,
             "message": record.getMessage(),
         }
-        if hasattr(record, "correlation_id"):
-            payload["correlation_id"] = getattr(record, "correlation_id")
-        return json.dumps(payload)
+        for field in EXTRA_FIELDS:
+            if hasattr(record, field):
+                payload[field] = getattr(record, field)
+        return dumps_str(payload)
 
 
 def configure_logging() -> None:
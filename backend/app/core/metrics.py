@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(
+    label_names: tuple[str, ...], label_values: tuple[str, ...], extra: str = ""
+) -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple[str, ...], float] = {} if label_names else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+            if not self.label_names:
+                self._values[()] = 0.0
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[slot] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), []))
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(counts), self._sums[key]) for key, counts in self._counts.items()
+            )
+        lines: list[str] = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                bucket_labels = _format_labels(self.label_names, key, le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "modeleval_http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ("method", "route", "status"),
+    )
+)
+PROVIDER_LATENCY_SECONDS = REGISTRY.register(
+    Histogram(
+        "modeleval_provider_latency_seconds",
+        "Provider generate() latency per model arm.",
+        ("provider", "model"),
+    )
+)
+DB_OPERATION_SECONDS = REGISTRY.register(
+    Histogram(
+        "modeleval_db_operation_duration_seconds",
+        "Session flush/commit time.",
+        ("operation",),
+    )
+)
+SCORING_SECONDS = REGISTRY.register(
+    Histogram("modeleval_scoring_duration_seconds", "Time to score a single attempt.")
+)
+AGGREGATION_SECONDS = REGISTRY.register(
+    Histogram("modeleval_aggregation_duration_seconds", "Time to aggregate a run summary.")
+)
+RUN_STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "modeleval_run_stage_duration_seconds",
+        "Total time spent in each execute_run stage.",
+        ("stage",),
+        buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+    )
+)
+PENDING_TASKS = REGISTRY.register(
+    Gauge("modeleval_pending_tasks", "Planned task instances not yet executed (queue depth).")
+)
+INFLIGHT_ATTEMPTS = REGISTRY.register(
+    Gauge("modeleval_inflight_attempts", "Provider calls currently in flight.")
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "modeleval_cache_requests_total",
+        "Cache lookups by cache and result.",
+        ("cache", "result"),
+    )
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+_STARTED_AT_KEY = "modeleval_metrics_started"
+
+
+def _start_timer(operation: str):
+    def listener(session: Session, *_args) -> None:
+        session.info.setdefault(_STARTED_AT_KEY, {})[operation] = time.perf_counter()
+
+    return listener
+
+
+def _stop_timer(operation: str):
+    def listener(session: Session, *_args) -> None:
+        started = session.info.get(_STARTED_AT_KEY, {}).pop(operation, None)
+        if started is not None:
+            DB_OPERATION_SECONDS.observe(time.perf_counter() - started, operation=operation)
+
+    return listener
+
+
+def instrument_sessions() -> None:
+    if event.contains(Session, "before_commit", _session_listeners["commit_start"]):
+        return
+    event.listen(Session, "before_commit", _session_listeners["commit_start"])
+    event.listen(Session, "after_commit", _session_listeners["commit_stop"])
+    event.listen(Session, "before_flush", _session_listeners["flush_start"])
+    event.listen(Session, "after_flush_postexec", _session_listeners["flush_stop"])
+
+
+_session_listeners = {
+    "commit_start": _start_timer("commit"),
+    "commit_stop": _stop_timer("commit"),
+    "flush_start": _start_timer("flush"),
+    "flush_stop": _stop_timer("flush"),
+}
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+# UTC timestamps end in "Z" and Decimals render as strings, matching Pydantic's JSON output.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+
+
+def dumps_str(value: Any) -> str:
+    return dumps(value).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    return orjson.loads(data)
+
+
+class OrjsonResponse(JSONResponse):
+    # Only worth it for routes without a response_model: those already serialize through
+    # pydantic-core, and a custom response class would switch that fast path off.
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+TRACER_NAME = "modeleval"
+TRACING_EXPORTERS = {"memory", "file", "console"}
+_SPAN_KEY = "modeleval_tracing_spans"
+
+_configure_lock = threading.Lock()
+_span_exporter: Any = None
+
+
+def configure_tracing(exporter: Optional[str] = None, file_path: Optional[str] = None) -> Any:
+    global _span_exporter
+    settings = get_settings()
+    exporter = exporter or settings.tracing_exporter
+    if not exporter:
+        return None
+    if exporter not in TRACING_EXPORTERS:
+        raise ValueError(f"TRACING_EXPORTER must be one of {sorted(TRACING_EXPORTERS)}")
+
+    with _configure_lock:
+        if _span_exporter is not None:
+            return _span_exporter
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import (
+                BatchSpanProcessor,
+                ConsoleSpanExporter,
+                SimpleSpanProcessor,
+            )
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        except ImportError as exc:
+            raise RuntimeError("TRACING_EXPORTER requires the 'opentelemetry-sdk' package") from exc
+
+        provider = TracerProvider(
+            resource=Resource.create(
+                {"service.name": settings.app_name, "service.version": settings.app_version}
+            )
+        )
+        if exporter == "memory":
+            span_exporter = InMemorySpanExporter()
+            provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+        elif exporter == "file":
+            stream = open(file_path or settings.tracing_file_path, "a", encoding="utf-8")  # noqa: SIM115
+            span_exporter = ConsoleSpanExporter(
+                out=stream, formatter=lambda span: span.to_json(indent=None) + "\n"
+            )
+            provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        else:
+            span_exporter = ConsoleSpanExporter()
+            provider.add_span_processor(BatchSpanProcessor(span_exporter))
+
+        trace.set_tracer_provider(provider)
+        _span_exporter = span_exporter
+        return span_exporter
+
+
+def _tracer():
+    return trace.get_tracer(TRACER_NAME)
+
+
+def correlation_context(correlation_id: str) -> Any:
+    if trace is None:
+        return None
+    try:
+        correlation_int = uuid.UUID(correlation_id).int
+    except ValueError:
+        return None
+    # Spans of one run share the run's correlation_id as their trace id.
+    parent = trace.SpanContext(
+        trace_id=correlation_int,
+        span_id=(correlation_int & 0xFFFFFFFFFFFFFFFF) or 1,
+        is_remote=True,
+        trace_flags=trace.TraceFlags(trace.TraceFlags.SAMPLED),
+    )
+    return trace.set_span_in_context(trace.NonRecordingSpan(parent))
+
+
+@contextmanager
+def start_span(name: str, context: Any = None, attributes: Optional[dict] = None) -> Iterator[Any]:
+    if trace is None:
+        yield None
+        return
+    with _tracer().start_as_current_span(name, context=context, attributes=attributes) as span:
+        yield span
+
+
+def set_span_attributes(span: Any, **attributes: Any) -> None:
+    if span is None:
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            span.set_attribute(key, value)
+
+
+def _start_commit_span(session: Session) -> None:
+    span = _tracer().start_span("db.commit")
+    session.info.setdefault(_SPAN_KEY, []).append(span)
+
+
+def _end_commit_span(session: Session, *_args) -> None:
+    spans = session.info.get(_SPAN_KEY)
+    if spans:
+        spans.pop().end()
+
+
+def instrument_sessions() -> None:
+    if trace is None or event.contains(Session, "before_commit", _start_commit_span):
+        return
+    event.listen(Session, "before_commit", _start_commit_span)
+    event.listen(Session, "after_commit", _end_commit_span)
+    event.listen(Session, "after_rollback", _end_commit_span)
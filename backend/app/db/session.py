@@ -1,16 +1,39 @@
 from collections.abc import Generator
+from functools import lru_cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.core import metrics, tracing
 from app.core.config import get_settings
+from app.core.serialization import dumps_str, loads
 
-settings = get_settings()
-engine = create_engine(settings.database_url, future=True, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+# JSON columns (summaries, configs, payloads) round-trip through orjson.
+JSON_ENGINE_OPTIONS = {"json_serializer": dumps_str, "json_deserializer": loads}
+
+metrics.instrument_sessions()
+tracing.instrument_sessions()
+# Bound by get_engine(), so importing the app never loads a DB driver or builds a pool.
+SessionLocal = sessionmaker(autoflush=False, autocommit=False, future=True)
+
+
+@lru_cache
+def get_engine() -> Engine:
+    engine = create_engine(
+        get_settings().database_url, future=True, pool_pre_ping=True, **JSON_ENGINE_OPTIONS
+    )
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+def dispose_engine() -> None:
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+        get_engine.cache_clear()
 
 
 def get_db() -> Generator[Session, None, None]:
+    get_engine()
     db = SessionLocal()
     try:
         yield db
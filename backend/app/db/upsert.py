@@ -0,0 +1,17 @@
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_ignoring_conflicts(db: Session, model: type, index_elements: list[str]) -> Any:
+    # INSERT ... ON CONFLICT DO NOTHING for content-addressed rows: concurrent runs that
+    # write the same key both succeed instead of one failing on the unique constraint.
+    dialect = db.get_bind().dialect.name
+    try:
+        insert = _DIALECT_INSERTS[dialect]
+    except KeyError:
+        raise RuntimeError(f"Unsupported database dialect: {dialect}") from None
+    return insert(model).on_conflict_do_nothing(index_elements=index_elements)
@@ -2,25 +2,71 @@ from __future__ import annotations
 
 import os
 import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from starlette.requests import Request
 
 from app.api.experiments import router as experiments_router
+from app.api.leaderboards import router as leaderboards_router
+from app.api.metrics import router as metrics_router
+from app.api.providers import router as providers_router
 from app.api.runs import router as runs_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
 from app.core.logging import configure_logging
-from app.db.session import SessionLocal
+from app.core.metrics import HTTP_REQUEST_SECONDS
+from app.core.serialization import OrjsonResponse
+from app.core.tracing import configure_tracing, set_span_attributes, start_span
+from app.db.session import SessionLocal, dispose_engine, get_engine
+from app.services.partitions import ensure_partitions
 
 settings = get_settings()
 configure_logging()
+configure_tracing()
 logger = logging.getLogger("modeleval.api")
 
-app = FastAPI(title=settings.app_name, version=settings.app_version)
+
+def startup_check() -> None:
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is required")
+    if not settings.openai_api_key:
+        logger.warning("OPENAI_API_KEY is not configured")
+    if not settings.anthropic_api_key:
+        logger.warning("ANTHROPIC_API_KEY is not configured")
+    # One round trip fails fast on a bad DATABASE_URL and leaves a warm pooled connection
+    # for the first request.
+    with SessionLocal() as session:
+        session.execute(text("SELECT 1"))
+
+
+def ensure_upcoming_partitions() -> None:
+    # Every deploy tops up the monthly attempts/scores partitions; the scheduled
+    # `make partitions` job keeps long-lived processes ahead and applies retention.
+    try:
+        with SessionLocal() as session:
+            ensure_partitions(session, settings.partition_months_ahead)
+    except SQLAlchemyError:
+        logger.exception("partition maintenance failed; new rows land in the default partition")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    get_engine()
+    if os.getenv("MODELEVAL_SKIP_STARTUP_DB_CHECK") != "1":
+        startup_check()
+        ensure_upcoming_partitions()
+    yield
+    dispose_engine()
+
+
+app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()],
@@ -28,8 +74,39 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.compression_minimum_size is not None:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
 app.include_router(experiments_router)
 app.include_router(runs_router)
+app.include_router(leaderboards_router)
+app.include_router(metrics_router)
+app.include_router(providers_router)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    with start_span(
+        f"HTTP {request.method}", attributes={"http.request.method": request.method}
+    ) as span:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            route_path = getattr(request.scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=request.method,
+                route=route_path,
+                status=str(status_code),
+            )
+            if span is not None:
+                span.update_name(f"{request.method} {route_path}")
+            set_span_attributes(
+                span, **{"http.route": route_path, "http.response.status_code": status_code}
+            )
 
 
 @app.get("/healthz")
@@ -37,25 +114,13 @@ def healthz() -> dict:
     return {"status": "ok", "version": settings.app_version, "commit": settings.app_commit}
 
 
-@app.on_event("startup")
-def startup_check() -> None:
-    if os.getenv("MODELEVAL_SKIP_STARTUP_DB_CHECK") == "1":
-        return
-    if not settings.database_url:
-        raise RuntimeError("DATABASE_URL is required")
-    if not settings.openai_api_key:
-        logger.warning("OPENAI_API_KEY is not configured")
-    if not settings.anthropic_api_key:
-        logger.warning("ANTHROPIC_API_KEY is not configured")
-    with SessionLocal() as session:
-        session.execute(text("SELECT 1"))
-
-
 @app.exception_handler(ValueError)
-def value_error_handler(_: Request, exc: ValueError) -> JSONResponse:
-    return JSONResponse(status_code=400, content={"error": "validation_error", "details": str(exc)})
+def value_error_handler(_: Request, exc: ValueError) -> OrjsonResponse:
+    return OrjsonResponse(
+        status_code=400, content={"error": "validation_error", "details": str(exc)}
+    )
 
 
 @app.exception_handler(Exception)
-def generic_error_handler(_: Request, exc: Exception) -> JSONResponse:
-    return JSONResponse(status_code=500, content={"error": "internal_error", "details": str(exc)})
+def generic_error_handler(_: Request, exc: Exception) -> OrjsonResponse:
+    return OrjsonResponse(status_code=500, content={"error": "internal_error", "details": str(exc)})
@@ -1,9 +1,13 @@
 from app.models.entities import (
     Attempt,
+    AttemptArtifact,
+    DatasetItem,
     Experiment,
+    Judgment,
     ModelArm,
     Organization,
     Run,
+    RunArmMetric,
     Score,
     TaskInstance,
 )
@@ -13,7 +17,11 @@ __all__ = [
     "Experiment",
     "Run",
     "TaskInstance",
+    "DatasetItem",
     "ModelArm",
     "Attempt",
+    "AttemptArtifact",
     "Score",
+    "Judgment",
+    "RunArmMetric",
 ]
@@ -7,16 +7,21 @@ from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy import (
+    DDL,
     JSON,
+    Boolean,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    event,
     func,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -29,6 +34,7 @@ class WorkloadType(str, enum.Enum):
     CI_TRIAGE = "ci_triage"
 
 
+# The built-in providers; others are discovered through the provider registry.
 class ProviderType(str, enum.Enum):
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
@@ -68,6 +74,7 @@ class Experiment(Base):
     dataset_ref: Mapped[str] = mapped_column(String(255), nullable=False)
     dataset_hash: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
     sampling: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    evaluator: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     budget_usd: Mapped[Decimal] = mapped_column(Numeric(12, 4), nullable=False)
     seed: Mapped[int] = mapped_column(Integer, nullable=False, default=42)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -77,19 +84,24 @@ class Experiment(Base):
 
     organization: Mapped[Organization] = relationship(back_populates="experiments")
     model_arms: Mapped[list[ModelArm]] = relationship(
-        back_populates="experiment", cascade="all, delete-orphan"
+        back_populates="experiment", cascade="all, delete-orphan", passive_deletes=True
+    )
+    runs: Mapped[list[Run]] = relationship(
+        back_populates="experiment", cascade="all, delete-orphan", passive_deletes=True
     )
-    runs: Mapped[list[Run]] = relationship(back_populates="experiment", cascade="all, delete-orphan")
 
 
 class ModelArm(Base):
     __tablename__ = "model_arms"
+    __table_args__ = (Index("ix_model_arms_experiment_id", "experiment_id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    experiment_id: Mapped[str] = mapped_column(String(36), ForeignKey("experiments.id"), nullable=False)
-    provider: Mapped[ProviderType] = mapped_column(
-        Enum(ProviderType, values_callable=enum_values, name="providertype"), nullable=False
+    experiment_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False
     )
+    # A registered provider name (see app.providers.registry), not a database enum, so
+    # plugin providers need no migration.
+    provider: Mapped[str] = mapped_column(String(64), nullable=False)
     model_name: Mapped[str] = mapped_column(String(255), nullable=False)
     display_name: Mapped[str] = mapped_column(String(255), nullable=False)
     config: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
@@ -100,9 +112,15 @@ class ModelArm(Base):
 
 class Run(Base):
     __tablename__ = "runs"
+    __table_args__ = (
+        Index("ix_runs_experiment_id", "experiment_id"),
+        Index("ix_runs_reuse_key", "reuse_key"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    experiment_id: Mapped[str] = mapped_column(String(36), ForeignKey("experiments.id"), nullable=False)
+    experiment_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False
+    )
     status: Mapped[RunStatus] = mapped_column(
         Enum(RunStatus, values_callable=enum_values, name="runstatus"),
         nullable=False,
@@ -112,6 +130,8 @@ class Run(Base):
     failure_threshold: Mapped[float] = mapped_column(Float, nullable=False, default=0.5)
     correlation_id: Mapped[str] = mapped_column(String(36), nullable=False, default=lambda: str(uuid.uuid4()))
     summary_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    reuse_key: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    arm_fingerprints: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -119,46 +139,94 @@ class Run(Base):
 
     experiment: Mapped[Experiment] = relationship(back_populates="runs")
     task_instances: Mapped[list[TaskInstance]] = relationship(
-        back_populates="run", cascade="all, delete-orphan"
+        back_populates="run", cascade="all, delete-orphan", passive_deletes=True
+    )
+    attempts: Mapped[list[Attempt]] = relationship(
+        back_populates="run", cascade="all, delete-orphan", passive_deletes=True
+    )
+    scores: Mapped[list[Score]] = relationship(
+        back_populates="run", cascade="all, delete-orphan", passive_deletes=True
+    )
+    arm_metrics: Mapped[list[RunArmMetric]] = relationship(
+        back_populates="run", cascade="all, delete-orphan", passive_deletes=True
     )
-    attempts: Mapped[list[Attempt]] = relationship(back_populates="run", cascade="all, delete-orphan")
-    scores: Mapped[list[Score]] = relationship(back_populates="run", cascade="all, delete-orphan")
 
 
 class TaskInstance(Base):
     __tablename__ = "task_instances"
-    __table_args__ = (UniqueConstraint("run_id", "sequence_no", name="uq_run_sequence"),)
+    __table_args__ = (
+        UniqueConstraint("run_id", "sequence_no", name="uq_run_sequence"),
+        Index("ix_task_instances_experiment_id", "experiment_id"),
+        Index("ix_task_instances_dataset_item_digest", "dataset_item_digest"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    run_id: Mapped[str] = mapped_column(String(36), ForeignKey("runs.id"), nullable=False)
-    experiment_id: Mapped[str] = mapped_column(String(36), ForeignKey("experiments.id"), nullable=False)
+    run_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("runs.id", ondelete="CASCADE"), nullable=False
+    )
+    experiment_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False
+    )
     sequence_no: Mapped[int] = mapped_column(Integer, nullable=False)
     dataset_item_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    dataset_item_digest: Mapped[str] = mapped_column(
+        String(64), ForeignKey("dataset_items.digest"), nullable=False
+    )
     workload_type: Mapped[WorkloadType] = mapped_column(
         Enum(WorkloadType, values_callable=enum_values, name="workloadtype"), nullable=False
     )
-    input_payload: Mapped[dict] = mapped_column(JSON, nullable=False)
-    expected_payload: Mapped[dict] = mapped_column(JSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     run: Mapped[Run] = relationship(back_populates="task_instances")
+    dataset_item: Mapped[DatasetItem] = relationship()
+
+    @property
+    def input_payload(self) -> dict:
+        return self.dataset_item.input_payload
+
+    @property
+    def expected_payload(self) -> dict:
+        return self.dataset_item.expected_payload
+
+    @property
+    def scoring_details(self) -> Optional[dict]:
+        return self.dataset_item.scoring_details
+
+
+class DatasetItem(Base):
+    __tablename__ = "dataset_items"
+
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True)
+    input_payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    expected_payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    scoring_details: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
 class Attempt(Base):
     __tablename__ = "attempts"
     __table_args__ = (
         UniqueConstraint("run_id", "task_instance_id", "model_arm_id", name="uq_attempt_unique"),
+        Index("ix_attempts_run_id", "run_id"),
+        Index("ix_attempts_task_instance_id", "task_instance_id"),
+        Index("ix_attempts_model_arm_id", "model_arm_id"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    run_id: Mapped[str] = mapped_column(String(36), ForeignKey("runs.id"), nullable=False)
-    task_instance_id: Mapped[str] = mapped_column(String(36), ForeignKey("task_instances.id"), nullable=False)
+    run_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("runs.id", ondelete="CASCADE"), nullable=False
+    )
+    task_instance_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("task_instances.id", ondelete="CASCADE"), nullable=False
+    )
     model_arm_id: Mapped[str] = mapped_column(String(36), ForeignKey("model_arms.id"), nullable=False)
     raw_output: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    raw_response: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    raw_response_digest: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     usage_prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     usage_completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     usage_total_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    usage_cache_read_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    usage_cache_write_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     latency_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     cost_usd: Mapped[Decimal] = mapped_column(Numeric(12, 6), nullable=False, default=Decimal("0"))
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -167,16 +235,107 @@ class Attempt(Base):
     run: Mapped[Run] = relationship(back_populates="attempts")
 
 
+class AttemptArtifact(Base):
+    __tablename__ = "attempt_artifacts"
+
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    compressed_size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    content: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class Score(Base):
     __tablename__ = "scores"
+    __table_args__ = (
+        UniqueConstraint("run_id", "task_instance_id", "model_arm_id", name="uq_score_unique"),
+        Index("ix_scores_run_id", "run_id"),
+        Index("ix_scores_task_instance_id", "task_instance_id"),
+        Index("ix_scores_model_arm_id", "model_arm_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    run_id: Mapped[str] = mapped_column(String(36), ForeignKey("runs.id"), nullable=False)
-    task_instance_id: Mapped[str] = mapped_column(String(36), ForeignKey("task_instances.id"), nullable=False)
+    run_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("runs.id", ondelete="CASCADE"), nullable=False
+    )
+    task_instance_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("task_instances.id", ondelete="CASCADE"), nullable=False
+    )
     model_arm_id: Mapped[str] = mapped_column(String(36), ForeignKey("model_arms.id"), nullable=False)
-    metric_name: Mapped[str] = mapped_column(String(255), nullable=False)
-    value: Mapped[float] = mapped_column(Float, nullable=False)
-    details: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    quality: Mapped[float] = mapped_column(Float, nullable=False)
+    passed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    judge_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     run: Mapped[Run] = relationship(back_populates="scores")
+
+
+# Long-format view over the pivoted scores table for SQL consumers that still
+# expect one (metric_name, value) row per metric.
+SCORE_METRICS_VIEW = """
+CREATE VIEW score_metrics AS
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'quality' AS metric_name, quality AS value, created_at
+FROM scores
+UNION ALL
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'pass' AS metric_name, CASE WHEN passed THEN 1.0 ELSE 0.0 END AS value, created_at
+FROM scores
+UNION ALL
+SELECT id, run_id, task_instance_id, model_arm_id,
+       'judge' AS metric_name, judge_score AS value, created_at
+FROM scores
+WHERE judge_score IS NOT NULL
+"""
+
+event.listen(Score.__table__, "after_create", DDL(SCORE_METRICS_VIEW))
+event.listen(Score.__table__, "before_drop", DDL("DROP VIEW IF EXISTS score_metrics"))
+
+
+class Judgment(Base):
+    __tablename__ = "judgments"
+
+    # sha256 of (rubric version, judge fingerprint, dataset item digest, output).
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    rubric_version: Mapped[str] = mapped_column(String(64), nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    rationale: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class RunArmMetric(Base):
+    __tablename__ = "run_arm_metrics"
+    __table_args__ = (
+        UniqueConstraint("run_id", "model_arm_id", name="uq_run_arm_metric"),
+        Index("ix_run_arm_metrics_experiment_quality", "experiment_id", "quality_avg"),
+        Index("ix_run_arm_metrics_workload_quality", "workload_type", "quality_avg"),
+        Index("ix_run_arm_metrics_model", "provider", "model_name"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    run_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("runs.id", ondelete="CASCADE"), nullable=False
+    )
+    experiment_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False
+    )
+    model_arm_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    workload_type: Mapped[WorkloadType] = mapped_column(
+        Enum(WorkloadType, values_callable=enum_values, name="workloadtype"), nullable=False
+    )
+    provider: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    display_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    quality_avg: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    pass_rate: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    attempt_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_p50_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    latency_p95_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    total_cost_usd: Mapped[Decimal] = mapped_column(
+        Numeric(12, 6), nullable=False, default=Decimal("0")
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    run: Mapped[Run] = relationship(back_populates="arm_metrics")
@@ -1,67 +1,163 @@
 from __future__ import annotations
 
+import threading
 import time
-
-from anthropic import Anthropic
+from typing import Optional, Union
 
 from app.core.config import get_settings
-from app.providers.base import ModelProvider, ProviderResult, ProviderUsage
+from app.providers.base import (
+    AsyncClientCache,
+    ModelProvider,
+    ProviderCapabilities,
+    ProviderResult,
+    ProviderUsage,
+    sdk_retry_count,
+)
 from app.providers.costs import estimate_cost_usd
 
 
+def _client(api_key: str, base_url: Optional[str] = None):
+    # The SDK takes most of a second to import; only pay for it once a request needs it.
+    from anthropic import Anthropic
+
+    return Anthropic(api_key=api_key, base_url=base_url)
+
+
+def _async_client(api_key: str, base_url: Optional[str] = None):
+    from anthropic import AsyncAnthropic
+
+    return AsyncAnthropic(api_key=api_key, base_url=base_url)
+
+
+def _system_blocks(model_config: dict) -> Union[str, list[dict]]:
+    system_prompt = model_config.get("system_prompt", "")
+    if not system_prompt or not model_config.get("prompt_caching"):
+        return system_prompt
+    # Every attempt in an arm shares the system prompt; mark it as a cacheable prefix.
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+
 class AnthropicProvider(ModelProvider):
-    def __init__(self) -> None:
+    capabilities = ProviderCapabilities(
+        supports_async=True, supports_streaming=True, supports_prompt_caching=True
+    )
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> None:
         settings = get_settings()
-        self._api_key = settings.anthropic_api_key
+        self._api_key = api_key or settings.anthropic_api_key
+        self._base_url = base_url or settings.anthropic_base_url
+        self._sync_client = None
+        self._client_lock = threading.Lock()
+        self._async_clients = AsyncClientCache(
+            lambda: _async_client(self._api_key, self._base_url)
+        )
+
+    def _get_client(self):
+        if self._sync_client is None:
+            with self._client_lock:
+                if self._sync_client is None:
+                    self._sync_client = _client(self._api_key, self._base_url)
+        return self._sync_client
 
     def generate(self, task_input: str, model_config: dict) -> ProviderResult:
         started = time.perf_counter()
         if not self._api_key:
-            return ProviderResult(
-                raw_output=None,
-                usage=ProviderUsage(),
-                latency_ms=0,
-                cost_usd=0,
-                raw_response={},
-                error="ANTHROPIC_API_KEY is not configured",
+            return _missing_key_result()
+        try:
+            # The raw response reports how many retries the SDK spent on 429s and 5xxs.
+            response = self._get_client().messages.with_raw_response.create(
+                **_request(task_input, model_config)
             )
+            return _result(response.parse(), model_config, started, response.retries_taken)
+        except Exception as exc:  # noqa: BLE001
+            return _error_result(exc, started)
 
+    async def agenerate(self, task_input: str, model_config: dict) -> ProviderResult:
+        started = time.perf_counter()
+        if not self._api_key:
+            return _missing_key_result()
         try:
-            client = Anthropic(api_key=self._api_key)
-            message = client.messages.create(
-                model=model_config.get("model_name_override") or model_config.get("model_name", "claude-3-5-haiku-latest"),
-                max_tokens=int(model_config.get("max_tokens", 512)),
-                temperature=float(model_config.get("temperature", 0.0)),
-                system=model_config.get("system_prompt", ""),
-                messages=[{"role": "user", "content": task_input}],
-            )
-            text_parts = [part.text for part in message.content if getattr(part, "type", "") == "text"]
-            content = "\n".join(text_parts)
-            usage_obj = message.usage
-            prompt_tokens = int(getattr(usage_obj, "input_tokens", 0) or 0)
-            completion_tokens = int(getattr(usage_obj, "output_tokens", 0) or 0)
-            usage = ProviderUsage(
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=prompt_tokens + completion_tokens,
-            )
-            latency_ms = int((time.perf_counter() - started) * 1000)
-            cost_usd = estimate_cost_usd(prompt_tokens, completion_tokens, model_config)
-            return ProviderResult(
-                raw_output=content,
-                usage=usage,
-                latency_ms=max(latency_ms, 1),
-                cost_usd=cost_usd,
-                raw_response=message.model_dump(),
-                error=None,
+            client = await self._async_clients.get()
+            response = await client.messages.with_raw_response.create(
+                **_request(task_input, model_config)
             )
+            message = await response.parse()
+            return _result(message, model_config, started, response.retries_taken)
         except Exception as exc:  # noqa: BLE001
-            latency_ms = int((time.perf_counter() - started) * 1000)
-            return ProviderResult(
-                raw_output=None,
-                usage=ProviderUsage(),
-                latency_ms=max(latency_ms, 1),
-                cost_usd=0,
-                raw_response={},
-                error=f"anthropic_error: {exc}",
-            )
+            return _error_result(exc, started)
+
+
+def _request(task_input: str, model_config: dict) -> dict:
+    return {
+        "model": (
+            model_config.get("model_name_override")
+            or model_config.get("model_name", "claude-3-5-haiku-latest")
+        ),
+        "max_tokens": int(model_config.get("max_tokens", 512)),
+        "system": _system_blocks(model_config),
+        "messages": [{"role": "user", "content": task_input}],
+        # Recent SDKs dropped the temperature keyword; the API still takes it in the body.
+        "extra_body": {"temperature": float(model_config.get("temperature", 0.0))},
+    }
+
+
+def _result(
+    message, model_config: dict, started: float, retry_count: int = 0
+) -> ProviderResult:
+    text_parts = [part.text for part in message.content if getattr(part, "type", "") == "text"]
+    content = "\n".join(text_parts)
+    usage_obj = message.usage
+    cache_read_tokens = int(getattr(usage_obj, "cache_read_input_tokens", 0) or 0)
+    cache_write_tokens = int(getattr(usage_obj, "cache_creation_input_tokens", 0) or 0)
+    # Anthropic reports cached input separately from input_tokens.
+    uncached_tokens = int(getattr(usage_obj, "input_tokens", 0) or 0)
+    prompt_tokens = uncached_tokens + cache_read_tokens + cache_write_tokens
+    completion_tokens = int(getattr(usage_obj, "output_tokens", 0) or 0)
+    usage = ProviderUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+        cache_read_tokens=cache_read_tokens,
+        cache_write_tokens=cache_write_tokens,
+    )
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    cost_usd = estimate_cost_usd(
+        prompt_tokens,
+        completion_tokens,
+        model_config,
+        cache_read_tokens=cache_read_tokens,
+        cache_write_tokens=cache_write_tokens,
+    )
+    return ProviderResult(
+        raw_output=content,
+        usage=usage,
+        latency_ms=max(latency_ms, 1),
+        cost_usd=cost_usd,
+        raw_response=message.model_dump(),
+        error=None,
+        retry_count=retry_count,
+    )
+
+
+def _missing_key_result() -> ProviderResult:
+    return ProviderResult(
+        raw_output=None,
+        usage=ProviderUsage(),
+        latency_ms=0,
+        cost_usd=0,
+        raw_response={},
+        error="ANTHROPIC_API_KEY is not configured",
+    )
+
+
+def _error_result(exc: Exception, started: float) -> ProviderResult:
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    return ProviderResult(
+        raw_output=None,
+        usage=ProviderUsage(),
+        latency_ms=max(latency_ms, 1),
+        cost_usd=0,
+        raw_response={},
+        error=f"anthropic_error: {exc}",
+        retry_count=sdk_retry_count(exc),
+    )
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
+
+logger = logging.getLogger("modeleval.providers")
 
 
 @dataclass
 class ProviderUsage:
+    # prompt_tokens counts every input token, including the cached ones below.
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
 
 
 @dataclass
@@ -20,9 +29,75 @@ class ProviderResult:
     cost_usd: float
     raw_response: dict
     error: Optional[str] = None
+    retry_count: int = 0
+
+
+def sdk_retry_count(exc: Exception) -> int:
+    # The OpenAI and Anthropic SDKs number each retry in a header on the request; an SDK
+    # error carries the last request it sent.
+    request = getattr(exc, "request", None)
+    headers = getattr(request, "headers", None) or {}
+    try:
+        return int(headers.get("x-stainless-retry-count", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass(frozen=True)
+class ProviderCapabilities:
+    # What a provider can do beyond one blocking generate() call; the executor picks
+    # the fastest supported path per arm.
+    supports_async: bool = False
+    supports_batch: bool = False
+    supports_streaming: bool = False
+    supports_prompt_caching: bool = False
 
 
 class ModelProvider(ABC):
+    capabilities = ProviderCapabilities()
+
     @abstractmethod
     def generate(self, task_input: str, model_config: dict) -> ProviderResult:
         raise NotImplementedError
+
+    async def agenerate(self, task_input: str, model_config: dict) -> ProviderResult:
+        # Providers with supports_async override this with a native async client.
+        return await asyncio.to_thread(self.generate, task_input, model_config)
+
+    def generate_batch(
+        self, task_inputs: Sequence[str], model_config: dict
+    ) -> list[ProviderResult]:
+        # Providers with supports_batch override this with one request for many inputs.
+        return [self.generate(task_input, model_config) for task_input in task_inputs]
+
+
+class AsyncClientCache:
+    # Async SDK clients hold an httpx pool bound to the loop that created them, so one
+    # client is kept for the current loop; a client for another loop is closed, not leaked.
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Any = None
+
+    async def get(self) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop is loop:
+                return self._client
+            replaced = self._client
+            self._loop, self._client = loop, self._factory()
+            client = self._client
+        if replaced is not None:
+            try:
+                await replaced.close()
+            except Exception as exc:  # noqa: BLE001
+                # Its loop may already be closed; the client is dropped either way.
+                logger.debug("async_client_close_failed", extra={"error": str(exc)})
+        return client
+
+    async def aclose(self) -> None:
+        with self._lock:
+            client, self._loop, self._client = self._client, None, None
+        if client is not None:
+            await client.close()
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 
-def estimate_cost_usd(prompt_tokens: int, completion_tokens: int, model_config: dict) -> float:
+def estimate_cost_usd(
+    prompt_tokens: int,
+    completion_tokens: int,
+    model_config: dict,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> float:
+    # prompt_tokens includes cached tokens. Cache reads and writes are priced at
+    # their own rates when configured and at the plain input rate otherwise.
     input_cost_per_1k = float(model_config.get("input_cost_per_1k", 0.0))
     output_cost_per_1k = float(model_config.get("output_cost_per_1k", 0.0))
-    return (prompt_tokens / 1000.0 * input_cost_per_1k) + (
-        completion_tokens / 1000.0 * output_cost_per_1k
+    cache_read_cost_per_1k = float(model_config.get("cache_read_cost_per_1k", input_cost_per_1k))
+    cache_write_cost_per_1k = float(model_config.get("cache_write_cost_per_1k", input_cost_per_1k))
+    uncached_tokens = max(0, prompt_tokens - cache_read_tokens - cache_write_tokens)
+    return (
+        uncached_tokens / 1000.0 * input_cost_per_1k
+        + cache_read_tokens / 1000.0 * cache_read_cost_per_1k
+        + cache_write_tokens / 1000.0 * cache_write_cost_per_1k
+        + completion_tokens / 1000.0 * output_cost_per_1k
     )
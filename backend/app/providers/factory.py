@@ -1,13 +1,6 @@
-from app.models.entities import ProviderType
-from app.providers.anthropic_provider import AnthropicProvider
 from app.providers.base import ModelProvider
-from app.providers.mock import MockProvider
-from app.providers.openai_provider import OpenAIProvider
+from app.providers.registry import get_registry
 
 
-def get_provider(provider_type: ProviderType) -> ModelProvider:
-    if provider_type == ProviderType.OPENAI:
-        return OpenAIProvider()
-    if provider_type == ProviderType.ANTHROPIC:
-        return AnthropicProvider()
-    return MockProvider()
+def get_provider(provider: str) -> ModelProvider:
+    return get_registry().get(provider)
@@ -2,26 +2,116 @@ from __future__ import annotations
 
 import hashlib
 import json
+import random
+import threading
 import time
 
-from app.providers.base import ModelProvider, ProviderResult, ProviderUsage
+from app.providers.base import (
+    ModelProvider,
+    ProviderCapabilities,
+    ProviderResult,
+    ProviderUsage,
+)
 from app.providers.costs import estimate_cost_usd
 
+LATENCY_DISTRIBUTIONS = {"fixed", "uniform", "exponential", "lognormal"}
+
+# Prefixes the mock "provider" has already cached, shared across calls like a real one.
+_cached_prefixes: set[str] = set()
+_cached_prefixes_lock = threading.Lock()
+
+
+def _prefix_cache_usage(model_config: dict) -> tuple[int, int, int]:
+    # Returns (prefix_tokens, cache_read_tokens, cache_write_tokens) for the system prompt.
+    system_prompt = model_config.get("system_prompt", "")
+    if not system_prompt or not model_config.get("prompt_caching"):
+        return 0, 0, 0
+    prefix_tokens = len(system_prompt.split())
+    key = f"{model_config.get('model_name', '')}:{system_prompt}"
+    with _cached_prefixes_lock:
+        if key in _cached_prefixes:
+            return prefix_tokens, prefix_tokens, 0
+        _cached_prefixes.add(key)
+    return prefix_tokens, 0, prefix_tokens
+
+
+def sample_latency_ms(rng: random.Random, model_config: dict) -> float:
+    mean_ms = float(model_config.get("mock_latency_ms", 0.0))
+    if mean_ms <= 0:
+        return 0.0
+    distribution = model_config.get("mock_latency_distribution", "fixed")
+    jitter = float(model_config.get("mock_latency_jitter", 0.5))
+    if distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"Unsupported mock_latency_distribution: {distribution}")
+    if distribution == "uniform":
+        return rng.uniform(mean_ms * (1 - jitter), mean_ms * (1 + jitter))
+    if distribution == "exponential":
+        return rng.expovariate(1.0 / mean_ms)
+    if distribution == "lognormal":
+        # Keep the configured value as the median; jitter is the log-space sigma.
+        return rng.lognormvariate(0.0, jitter) * mean_ms
+    return mean_ms
+
 
 class MockProvider(ModelProvider):
+    capabilities = ProviderCapabilities(supports_prompt_caching=True)
+
     def generate(self, task_input: str, model_config: dict) -> ProviderResult:
         started = time.perf_counter()
         digest = hashlib.sha256(task_input.encode("utf-8")).hexdigest()[:8]
-        response = f"mock-response:{digest}:{task_input[:140]}"
-        prompt_tokens = max(1, len(task_input.split()))
-        completion_tokens = max(1, len(response.split()))
+        rng = random.Random(
+            f"{model_config.get('mock_seed', 0)}:{model_config.get('model_name', '')}:{digest}"
+        )
+        injected_latency_ms = sample_latency_ms(rng, model_config)
+        if injected_latency_ms > 0:
+            time.sleep(injected_latency_ms / 1000.0)
+
+        if rng.random() < float(model_config.get("mock_error_rate", 0.0)):
+            latency_ms = int((time.perf_counter() - started) * 1000)
+            return ProviderResult(
+                raw_output=None,
+                usage=ProviderUsage(),
+                latency_ms=max(latency_ms, 1),
+                cost_usd=0,
+                raw_response={},
+                error="mock_error: injected failure",
+            )
+
+        if item_ids := model_config.get("judge_item_ids"):
+            # Stand-in judge: a deterministic score per item in the batch.
+            scores = [
+                {
+                    "id": item_id,
+                    "score": round(random.Random(f"{digest}:{item_id}").random(), 4),
+                    "rationale": "mock judgment",
+                }
+                for item_id in item_ids
+            ]
+            response = json.dumps({"scores": scores})
+        else:
+            response = f"mock-response:{digest}:{task_input[:140]}"
+        prefix_tokens, cache_read_tokens, cache_write_tokens = _prefix_cache_usage(model_config)
+        prompt_tokens = prefix_tokens + int(
+            model_config.get("mock_prompt_tokens") or max(1, len(task_input.split()))
+        )
+        completion_tokens = int(
+            model_config.get("mock_completion_tokens") or max(1, len(response.split()))
+        )
         usage = ProviderUsage(
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
             total_tokens=prompt_tokens + completion_tokens,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
         )
         latency_ms = int((time.perf_counter() - started) * 1000)
-        cost_usd = estimate_cost_usd(prompt_tokens, completion_tokens, model_config)
+        cost_usd = estimate_cost_usd(
+            prompt_tokens,
+            completion_tokens,
+            model_config,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+        )
         return ProviderResult(
             raw_output=response,
             usage=usage,
@@ -1,69 +1,160 @@
 from __future__ import annotations
 
+import hashlib
+import threading
 import time
-
-from openai import OpenAI
+from typing import Optional
 
 from app.core.config import get_settings
-from app.providers.base import ModelProvider, ProviderResult, ProviderUsage
+from app.providers.base import (
+    AsyncClientCache,
+    ModelProvider,
+    ProviderCapabilities,
+    ProviderResult,
+    ProviderUsage,
+    sdk_retry_count,
+)
 from app.providers.costs import estimate_cost_usd
 
 
+def _client(api_key: str, base_url: Optional[str] = None):
+    # The SDK takes most of a second to import; only pay for it once a request needs it.
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key, base_url=base_url)
+
+
+def _async_client(api_key: str, base_url: Optional[str] = None):
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+
+def _prompt_cache_key(model_config: dict) -> str:
+    system_prompt = model_config.get("system_prompt", "")
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:32]
+
+
 class OpenAIProvider(ModelProvider):
-    def __init__(self) -> None:
+    capabilities = ProviderCapabilities(
+        supports_async=True, supports_streaming=True, supports_prompt_caching=True
+    )
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> None:
         settings = get_settings()
-        self._api_key = settings.openai_api_key
+        self._api_key = api_key or settings.openai_api_key
+        self._base_url = base_url or settings.openai_base_url
+        self._sync_client = None
+        self._client_lock = threading.Lock()
+        self._async_clients = AsyncClientCache(
+            lambda: _async_client(self._api_key, self._base_url)
+        )
+
+    def _get_client(self):
+        if self._sync_client is None:
+            with self._client_lock:
+                if self._sync_client is None:
+                    self._sync_client = _client(self._api_key, self._base_url)
+        return self._sync_client
 
     def generate(self, task_input: str, model_config: dict) -> ProviderResult:
         started = time.perf_counter()
         if not self._api_key:
-            return ProviderResult(
-                raw_output=None,
-                usage=ProviderUsage(),
-                latency_ms=0,
-                cost_usd=0,
-                raw_response={},
-                error="OPENAI_API_KEY is not configured",
+            return _missing_key_result()
+        try:
+            # The raw response reports how many retries the SDK spent on 429s and 5xxs.
+            response = self._get_client().chat.completions.with_raw_response.create(
+                **_request(task_input, model_config)
             )
+            return _result(response.parse(), model_config, started, response.retries_taken)
+        except Exception as exc:  # noqa: BLE001
+            return _error_result(exc, started)
 
+    async def agenerate(self, task_input: str, model_config: dict) -> ProviderResult:
+        started = time.perf_counter()
+        if not self._api_key:
+            return _missing_key_result()
         try:
-            client = OpenAI(api_key=self._api_key)
-            messages = [{"role": "user", "content": task_input}]
-            if system_prompt := model_config.get("system_prompt"):
-                messages.insert(0, {"role": "system", "content": system_prompt})
-
-            completion = client.chat.completions.create(
-                model=model_config.get("model_name_override") or model_config.get("model_name", "gpt-4o-mini"),
-                messages=messages,
-                temperature=float(model_config.get("temperature", 0.0)),
-            )
-            content = completion.choices[0].message.content if completion.choices else ""
-            usage_obj = completion.usage
-            prompt_tokens = int(getattr(usage_obj, "prompt_tokens", 0) or 0)
-            completion_tokens = int(getattr(usage_obj, "completion_tokens", 0) or 0)
-            total_tokens = int(getattr(usage_obj, "total_tokens", prompt_tokens + completion_tokens) or 0)
-            usage = ProviderUsage(
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-            )
-            latency_ms = int((time.perf_counter() - started) * 1000)
-            cost_usd = estimate_cost_usd(prompt_tokens, completion_tokens, model_config)
-            return ProviderResult(
-                raw_output=content,
-                usage=usage,
-                latency_ms=max(latency_ms, 1),
-                cost_usd=cost_usd,
-                raw_response=completion.model_dump(),
-                error=None,
+            client = await self._async_clients.get()
+            response = await client.chat.completions.with_raw_response.create(
+                **_request(task_input, model_config)
             )
+            return _result(response.parse(), model_config, started, response.retries_taken)
         except Exception as exc:  # noqa: BLE001
-            latency_ms = int((time.perf_counter() - started) * 1000)
-            return ProviderResult(
-                raw_output=None,
-                usage=ProviderUsage(),
-                latency_ms=max(latency_ms, 1),
-                cost_usd=0,
-                raw_response={},
-                error=f"openai_error: {exc}",
-            )
+            return _error_result(exc, started)
+
+
+def _request(task_input: str, model_config: dict) -> dict:
+    messages = [{"role": "user", "content": task_input}]
+    if system_prompt := model_config.get("system_prompt"):
+        messages.insert(0, {"role": "system", "content": system_prompt})
+
+    options = {}
+    if model_config.get("prompt_caching") and system_prompt:
+        # OpenAI caches long shared prefixes automatically; a stable cache key
+        # routes an arm's requests to the same cache.
+        options["extra_body"] = {"prompt_cache_key": _prompt_cache_key(model_config)}
+    return {
+        "model": (
+            model_config.get("model_name_override")
+            or model_config.get("model_name", "gpt-4o-mini")
+        ),
+        "messages": messages,
+        "temperature": float(model_config.get("temperature", 0.0)),
+        **options,
+    }
+
+
+def _result(
+    completion, model_config: dict, started: float, retry_count: int = 0
+) -> ProviderResult:
+    content = completion.choices[0].message.content if completion.choices else ""
+    usage_obj = completion.usage
+    prompt_tokens = int(getattr(usage_obj, "prompt_tokens", 0) or 0)
+    completion_tokens = int(getattr(usage_obj, "completion_tokens", 0) or 0)
+    total_tokens = int(getattr(usage_obj, "total_tokens", prompt_tokens + completion_tokens) or 0)
+    details = getattr(usage_obj, "prompt_tokens_details", None)
+    cache_read_tokens = int(getattr(details, "cached_tokens", 0) or 0)
+    usage = ProviderUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=total_tokens,
+        cache_read_tokens=cache_read_tokens,
+    )
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    cost_usd = estimate_cost_usd(
+        prompt_tokens, completion_tokens, model_config, cache_read_tokens=cache_read_tokens
+    )
+    return ProviderResult(
+        raw_output=content,
+        usage=usage,
+        latency_ms=max(latency_ms, 1),
+        cost_usd=cost_usd,
+        raw_response=completion.model_dump(),
+        error=None,
+        retry_count=retry_count,
+    )
+
+
+def _missing_key_result() -> ProviderResult:
+    return ProviderResult(
+        raw_output=None,
+        usage=ProviderUsage(),
+        latency_ms=0,
+        cost_usd=0,
+        raw_response={},
+        error="OPENAI_API_KEY is not configured",
+    )
+
+
+def _error_result(exc: Exception, started: float) -> ProviderResult:
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    return ProviderResult(
+        raw_output=None,
+        usage=ProviderUsage(),
+        latency_ms=max(latency_ms, 1),
+        cost_usd=0,
+        raw_response={},
+        error=f"openai_error: {exc}",
+        retry_count=sdk_retry_count(exc),
+    )
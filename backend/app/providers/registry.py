@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from collections.abc import Callable
+from functools import lru_cache, partial
+from importlib.metadata import entry_points
+
+from app.providers.base import ModelProvider, ProviderCapabilities
+
+logger = logging.getLogger("modeleval.providers")
+
+# Packages register extra adapters under this group, e.g. in pyproject.toml:
+#   [project.entry-points."modeleval.providers"]
+#   azure_openai = "modeleval_azure:AzureOpenAIProvider"
+ENTRY_POINT_GROUP = "modeleval.providers"
+# Built-in adapters are resolved like entry points, so none is imported before it is used.
+BUILTIN_PROVIDERS = {
+    "openai": "app.providers.openai_provider:OpenAIProvider",
+    "anthropic": "app.providers.anthropic_provider:AnthropicProvider",
+    "mock": "app.providers.mock:MockProvider",
+}
+
+ProviderFactory = Callable[[], ModelProvider]
+
+
+def _load_reference(reference: str) -> ProviderFactory:
+    module_name, _, attribute = reference.partition(":")
+    target = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def _provider_entry_points() -> list:
+    discovered = entry_points()
+    if hasattr(discovered, "select"):
+        return list(discovered.select(group=ENTRY_POINT_GROUP))
+    # Python 3.9 returns a dict of groups.
+    return list(discovered.get(ENTRY_POINT_GROUP, ()))
+
+
+class ProviderRegistry:
+    # One shared instance per provider name, so SDK clients and their connection pools
+    # are reused across attempts and runs.
+    def __init__(self, loaders: dict[str, Callable[[], ProviderFactory]]) -> None:
+        self._loaders = dict(loaders)
+        self._instances: dict[str, ModelProvider] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def discover(cls) -> ProviderRegistry:
+        loaders = {name: partial(_load_reference, ref) for name, ref in BUILTIN_PROVIDERS.items()}
+        for entry_point in _provider_entry_points():
+            if entry_point.name in loaders:
+                logger.warning(
+                    "provider_entry_point_ignored",
+                    extra={"provider": entry_point.name, "entry_point": entry_point.value},
+                )
+                continue
+            loaders[entry_point.name] = entry_point.load
+        return cls(loaders)
+
+    def names(self) -> list[str]:
+        return sorted(self._loaders)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._loaders
+
+    def validate(self, name: str) -> str:
+        if name not in self._loaders:
+            raise ValueError(f"provider must be one of {self.names()}")
+        return name
+
+    def register(self, name: str, factory: ProviderFactory) -> None:
+        with self._lock:
+            self._loaders[name] = lambda: factory
+            self._instances.pop(name, None)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._loaders.pop(name, None)
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> ModelProvider:
+        provider = self._instances.get(name)
+        if provider is not None:
+            return provider
+        with self._lock:
+            if name not in self._instances:
+                self.validate(name)
+                provider = self._loaders[name]()()
+                if not isinstance(provider, ModelProvider):
+                    raise TypeError(f"Provider {name!r} does not implement ModelProvider")
+                self._instances[name] = provider
+            return self._instances[name]
+
+    def capabilities(self, name: str) -> ProviderCapabilities:
+        return self.get(name).capabilities
+
+
+@lru_cache
+def get_registry() -> ProviderRegistry:
+    return ProviderRegistry.discover()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import base64
+import logging
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import get_settings
+from app.models.entities import ProviderType
+
+logger = logging.getLogger("modeleval.tokenizers")
+
+# Model name prefixes mapped to the BPE encoding their family uses, longest prefix first.
+OPENAI_ENCODINGS = (
+    ("gpt-4.1", "o200k_base"),
+    ("gpt-4o", "o200k_base"),
+    ("gpt-5", "o200k_base"),
+    ("o1", "o200k_base"),
+    ("o3", "o200k_base"),
+    ("o4", "o200k_base"),
+    ("gpt-4", "cl100k_base"),
+    ("gpt-3.5", "cl100k_base"),
+)
+DEFAULT_OPENAI_ENCODING = "o200k_base"
+# Anthropic does not publish its tokenizer; cl100k_base is a close stand-in for estimates.
+ANTHROPIC_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN = 4
+BATCH_THREADS = 8
+VOCAB_SUFFIX = ".tiktoken"
+
+# Split patterns and special tokens of the published encodings, so an encoding can be
+# built from a local vocab file without tiktoken's registry (which downloads on a miss).
+_CL100K_PAT_STR = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+"""
+    r"""|\s++$|\s*[\r\n]|\s+(?!\S)|\s"""
+)
+_O200K_PATTERNS = (
+    (
+        r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+"""
+        r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)?"""
+    ),
+    (
+        r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*"""
+        r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)?"""
+    ),
+    r"""\p{N}{1,3}""",
+    r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+    r"""\s*[\r\n]+""",
+    r"""\s+(?!\S)""",
+    r"""\s+""",
+)
+_O200K_PAT_STR = "|".join(_O200K_PATTERNS)
+ENCODING_SPECS = {
+    "cl100k_base": (
+        _CL100K_PAT_STR,
+        {
+            "<|endoftext|>": 100257,
+            "<|fim_prefix|>": 100258,
+            "<|fim_middle|>": 100259,
+            "<|fim_suffix|>": 100260,
+            "<|endofprompt|>": 100276,
+        },
+    ),
+    "o200k_base": (_O200K_PAT_STR, {"<|endoftext|>": 199999, "<|endofprompt|>": 200018}),
+}
+
+
+class Tokenizer:
+    name = "approximate"
+    exact = False
+
+    def count(self, text: str) -> int:
+        return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+    def count_batch(self, texts: Sequence[str]) -> list[int]:
+        return [self.count(text) for text in texts]
+
+
+class WhitespaceTokenizer(Tokenizer):
+    # Matches how MockProvider counts prompt tokens.
+    name = "whitespace"
+    exact = True
+
+    def count(self, text: str) -> int:
+        return max(1, len(text.split()))
+
+
+class BpeTokenizer(Tokenizer):
+    def __init__(self, encoding, exact: bool) -> None:
+        self._encoding = encoding
+        self.name = encoding.name
+        self.exact = exact
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode_ordinary(text))
+
+    def count_batch(self, texts: Sequence[str]) -> list[int]:
+        # tiktoken releases the GIL while encoding, so batches spread over threads.
+        encoded = self._encoding.encode_ordinary_batch(list(texts), num_threads=BATCH_THREADS)
+        return [len(tokens) for tokens in encoded]
+
+
+def model_family(provider: str, model_name: str) -> str:
+    if provider == ProviderType.OPENAI:
+        for prefix, encoding in OPENAI_ENCODINGS:
+            if model_name.startswith(prefix):
+                return encoding
+        return DEFAULT_OPENAI_ENCODING
+    if provider == ProviderType.ANTHROPIC:
+        return ANTHROPIC_ENCODING
+    return "whitespace"
+
+
+def get_tokenizer(provider: str, model_name: str) -> Tokenizer:
+    family = model_family(provider, model_name)
+    return _tokenizer_for_family(family, provider, get_settings().tokenizer_vocab_dir)
+
+
+def load_vocab(path: Path) -> dict[bytes, int]:
+    # The .tiktoken format: one "<base64 token> <rank>" pair per line.
+    ranks: dict[bytes, int] = {}
+    for line in path.read_bytes().splitlines():
+        if line:
+            token, rank = line.split()
+            ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+@lru_cache(maxsize=None)
+def _tokenizer_for_family(family: str, provider: str, vocab_dir: Optional[str]) -> Tokenizer:
+    if family == "whitespace":
+        return WhitespaceTokenizer()
+    # Vocab files are read from TOKENIZER_VOCAB_DIR only; estimates never go to the
+    # network, and fall back to the character approximation when a file is missing.
+    if not vocab_dir or family not in ENCODING_SPECS:
+        return Tokenizer()
+    path = Path(vocab_dir) / f"{family}{VOCAB_SUFFIX}"
+    if not path.is_file():
+        logger.warning("tokenizer_vocab_missing", extra={"encoding": family, "path": str(path)})
+        return Tokenizer()
+    try:
+        # Optional, and imported on first estimate rather than with the app.
+        import tiktoken
+    except ImportError:  # pragma: no cover - optional dependency
+        return Tokenizer()
+    pat_str, special_tokens = ENCODING_SPECS[family]
+    try:
+        encoding = tiktoken.Encoding(
+            name=family,
+            pat_str=pat_str,
+            mergeable_ranks=load_vocab(path),
+            special_tokens=special_tokens,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("tokenizer_unavailable", extra={"encoding": family, "error": str(exc)})
+        return Tokenizer()
+    return BpeTokenizer(encoding, exact=provider == ProviderType.OPENAI)
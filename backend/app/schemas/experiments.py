@@ -6,19 +6,53 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from app.schemas.common import ProviderType, WorkloadType
+from app.providers.registry import get_registry
+from app.schemas.common import WorkloadType
+from app.services.adaptive import AdaptiveConfig, is_adaptive
+from app.services.evaluator import EvaluatorConfig
+from app.services.planner import SAMPLING_STRATEGIES
+
+SAMPLING_MODES = {"fixed", "adaptive"}
+
+
+def validate_sampling_config(value: dict) -> dict:
+    max_tasks = value.get("max_tasks", 1)
+    if not isinstance(max_tasks, int) or max_tasks <= 0:
+        raise ValueError("sampling.max_tasks must be a positive integer")
+    mode = value.get("mode", "fixed")
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"sampling.mode must be one of {sorted(SAMPLING_MODES)}")
+    strategy = value.get("strategy", "uniform")
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(f"sampling.strategy must be one of {sorted(SAMPLING_STRATEGIES)}")
+    if strategy == "stratified" and not value.get("stratify_by"):
+        raise ValueError("sampling.stratify_by is required for stratified sampling")
+    if is_adaptive(value):
+        AdaptiveConfig.from_sampling(value)
+    return value
+
+
+def validate_evaluator_config(value: Optional[dict]) -> Optional[dict]:
+    if value is not None:
+        EvaluatorConfig.from_dict(value)
+    return value
 
 
 class ModelArmCreate(BaseModel):
-    provider: ProviderType
+    provider: str
     model_name: str = Field(min_length=1)
     display_name: Optional[str] = None
     config: dict = Field(default_factory=dict)
 
+    @field_validator("provider")
+    @classmethod
+    def validate_provider(cls, value: str) -> str:
+        return get_registry().validate(value)
+
 
 class ModelArmResponse(BaseModel):
     id: str
-    provider: ProviderType
+    provider: str
     model_name: str
     display_name: str
     config: dict
@@ -34,14 +68,17 @@ class ExperimentCreate(BaseModel):
     budget_usd: Decimal = Field(gt=0)
     seed: int = 42
     model_arms: list[ModelArmCreate] = Field(min_length=1)
+    evaluator: Optional[dict] = None
 
     @field_validator("sampling")
     @classmethod
     def validate_sampling(cls, value: dict) -> dict:
-        max_tasks = value.get("max_tasks", 1)
-        if not isinstance(max_tasks, int) or max_tasks <= 0:
-            raise ValueError("sampling.max_tasks must be a positive integer")
-        return value
+        return validate_sampling_config(value)
+
+    @field_validator("evaluator")
+    @classmethod
+    def validate_evaluator(cls, value: Optional[dict]) -> Optional[dict]:
+        return validate_evaluator_config(value)
 
 
 class ExperimentUpdate(BaseModel):
@@ -52,6 +89,19 @@ class ExperimentUpdate(BaseModel):
     budget_usd: Optional[Decimal] = Field(default=None, gt=0)
     seed: Optional[int] = None
     model_arms: Optional[list[ModelArmCreate]] = None
+    evaluator: Optional[dict] = None
+
+    @field_validator("sampling")
+    @classmethod
+    def validate_sampling(cls, value: Optional[dict]) -> Optional[dict]:
+        if value is None:
+            return value
+        return validate_sampling_config(value)
+
+    @field_validator("evaluator")
+    @classmethod
+    def validate_evaluator(cls, value: Optional[dict]) -> Optional[dict]:
+        return validate_evaluator_config(value)
 
 
 class ExperimentResponse(BaseModel):
@@ -62,6 +112,7 @@ class ExperimentResponse(BaseModel):
     dataset_ref: str
     dataset_hash: Optional[str]
     sampling: dict
+    evaluator: Optional[dict] = None
     budget_usd: Decimal
     seed: int
     model_arms: list[ModelArmResponse]
@@ -69,3 +120,17 @@ class ExperimentResponse(BaseModel):
     updated_at: Optional[datetime]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DeletionJobResponse(BaseModel):
+    id: str
+    experiment_id: str
+    status: str
+    runs_total: int
+    runs_deleted: int
+    rows_deleted: int
+    error: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
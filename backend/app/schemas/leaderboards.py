@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    provider: str
+    model_name: str
+    display_name: str
+    run_count: int
+    attempt_count: int
+    error_count: int
+    quality_avg: float
+    pass_rate: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    total_cost_usd: float
+    cost_per_attempt_usd: float
+
+
+class LeaderboardsResponse(BaseModel):
+    quality: list[LeaderboardEntry]
+    speed: list[LeaderboardEntry]
+    cost: list[LeaderboardEntry]
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class ProviderResponse(BaseModel):
+    name: str
+    supports_async: bool
+    supports_batch: bool
+    supports_streaming: bool
+    supports_prompt_caching: bool
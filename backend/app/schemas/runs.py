@@ -12,6 +12,37 @@ from app.schemas.common import RunStatus
 class RunCreate(BaseModel):
     seed: Optional[int] = None
     failure_threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+    profile: bool = False
+    reuse_attempts: bool = True
+    incremental: bool = False
+    enforce_budget: bool = True
+
+
+class RunEstimateRequest(BaseModel):
+    seed: Optional[int] = None
+
+
+class ArmEstimateResponse(BaseModel):
+    model_arm_id: str
+    display_name: str
+    tokenizer: str
+    exact_prompt_tokens: bool
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: float
+    duration_s: float
+
+
+class RunEstimateResponse(BaseModel):
+    experiment_id: str
+    dataset_hash: str
+    task_count: int
+    attempt_count: int
+    budget_usd: float
+    projected_cost_usd: float
+    projected_duration_s: float
+    within_budget: bool
+    arms: list[ArmEstimateResponse]
 
 
 class RunResponse(BaseModel):
@@ -38,15 +69,44 @@ class AttemptResponse(BaseModel):
     usage_prompt_tokens: int
     usage_completion_tokens: int
     usage_total_tokens: int
+    usage_cache_read_tokens: int = 0
+    usage_cache_write_tokens: int = 0
     latency_ms: int
     cost_usd: Decimal
     error_message: Optional[str]
+    raw_response_digest: Optional[str] = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProfileArtifactResponse(BaseModel):
+    name: str
+    media_type: str
+    size_bytes: int
+
+
 class RunSummaryResponse(BaseModel):
     run_id: str
     status: RunStatus
     summary: Optional[dict]
+
+
+class PairedComparisonResponse(BaseModel):
+    run_id: str
+    metric: str
+    arm_a_id: str
+    arm_b_id: str
+    task_count: int
+    mean_a: float
+    mean_b: float
+    mean_delta: float
+    ci_low: float
+    ci_high: float
+    confidence: float
+    wins_a: int
+    wins_b: int
+    ties: int
+    sign_test_p_value: float
+    permutation_p_value: float
+    n_resamples: int
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.services.scorer import SCORE_METRICS
+
+ADAPTIVE_MODE = "adaptive"
+
+
+def is_adaptive(sampling: dict) -> bool:
+    return sampling.get("mode") == ADAPTIVE_MODE
+
+
+@dataclass
+class AdaptiveConfig:
+    batch_size: int = 10
+    min_tasks: int = 20
+    confidence: float = 0.95
+    drop_losing_arms: bool = True
+    metric: str = "quality"
+
+    @classmethod
+    def from_sampling(cls, sampling: dict) -> AdaptiveConfig:
+        options = sampling.get("adaptive") or {}
+        config = cls(
+            batch_size=int(options.get("batch_size", cls.batch_size)),
+            min_tasks=int(options.get("min_tasks", cls.min_tasks)),
+            confidence=float(options.get("confidence", cls.confidence)),
+            drop_losing_arms=bool(options.get("drop_losing_arms", cls.drop_losing_arms)),
+            metric=str(options.get("metric", cls.metric)),
+        )
+        config.validate()
+        return config
+
+    def validate(self) -> None:
+        if self.batch_size <= 0:
+            raise ValueError("sampling.adaptive.batch_size must be a positive integer")
+        if self.min_tasks < 0:
+            raise ValueError("sampling.adaptive.min_tasks must not be negative")
+        if not 0.0 < self.confidence < 1.0:
+            raise ValueError("sampling.adaptive.confidence must be between 0 and 1")
+        if self.metric not in SCORE_METRICS:
+            raise ValueError(f"sampling.adaptive.metric must be one of {list(SCORE_METRICS)}")
+
+
+@dataclass
+class ArmInterval:
+    mean: float
+    low: float
+    high: float
+    count: int
+
+
+@dataclass
+class _ArmStats:
+    total: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class AdaptiveSampler:
+    config: AdaptiveConfig
+    arm_ids: list[str]
+    planned_tasks: int
+    tasks_executed: int = 0
+    stop_reason: Optional[str] = None
+    dropped: dict[str, int] = field(default_factory=dict)
+    _stats: dict[str, _ArmStats] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._stats = {arm_id: _ArmStats() for arm_id in self.arm_ids}
+
+    @property
+    def active_arm_ids(self) -> list[str]:
+        return [arm_id for arm_id in self.arm_ids if arm_id not in self.dropped]
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_reason is not None
+
+    @property
+    def max_looks(self) -> int:
+        # Intervals are compared after every batch once min_tasks have run.
+        batches = math.ceil(self.planned_tasks / self.config.batch_size)
+        looks = sum(
+            1
+            for batch in range(1, batches + 1)
+            if min(batch * self.config.batch_size, self.planned_tasks) >= self.config.min_tasks
+        )
+        return max(1, looks)
+
+    def record(self, arm_id: str, value: float) -> None:
+        stats = self._stats[arm_id]
+        stats.total += value
+        stats.count += 1
+
+    def interval(self, arm_id: str) -> ArmInterval:
+        stats = self._stats[arm_id]
+        if stats.count == 0:
+            return ArmInterval(mean=0.0, low=0.0, high=1.0, count=0)
+        mean = stats.total / stats.count
+        # Hoeffding bound for metrics in [0, 1], union-bounded over the compared arms and
+        # over every look the run may take, so stopping at the first separation still
+        # holds the configured confidence.
+        delta = (1.0 - self.config.confidence) / (max(1, len(self.arm_ids)) * self.max_looks)
+        half_width = math.sqrt(math.log(2.0 / delta) / (2.0 * stats.count))
+        return ArmInterval(
+            mean=mean,
+            low=max(0.0, mean - half_width),
+            high=min(1.0, mean + half_width),
+            count=stats.count,
+        )
+
+    def finish_batch(self, batch_task_count: int) -> None:
+        self.tasks_executed += batch_task_count
+        if self.tasks_executed < self.config.min_tasks:
+            return
+
+        intervals = {arm_id: self.interval(arm_id) for arm_id in self.active_arm_ids}
+        ranked = sorted(intervals, key=lambda arm_id: (-intervals[arm_id].mean, arm_id))
+        if self.config.drop_losing_arms and ranked:
+            leader_low = intervals[ranked[0]].low
+            for arm_id in ranked[1:]:
+                if intervals[arm_id].high < leader_low:
+                    self.dropped[arm_id] = self.tasks_executed
+            ranked = [arm_id for arm_id in ranked if arm_id not in self.dropped]
+
+        if len(ranked) <= 1:
+            self.stop_reason = "single_arm_remaining"
+        elif all(
+            intervals[upper].low > intervals[lower].high for upper, lower in zip(ranked, ranked[1:])
+        ):
+            self.stop_reason = "ranking_stable"
+
+    def summary(self) -> dict:
+        return {
+            "mode": ADAPTIVE_MODE,
+            "planned_tasks": self.planned_tasks,
+            "tasks_executed": self.tasks_executed,
+            "stopped_early": self.stopped and self.tasks_executed < self.planned_tasks,
+            "stop_reason": self.stop_reason or "max_tasks_reached",
+            "confidence": self.config.confidence,
+            "dropped_arms": [
+                {"model_arm_id": arm_id, "dropped_after_tasks": tasks}
+                for arm_id, tasks in self.dropped.items()
+            ],
+            "intervals": {
+                arm_id: {
+                    "mean": interval.mean,
+                    "low": interval.low,
+                    "high": interval.high,
+                    "count": interval.count,
+                }
+                for arm_id, interval in ((arm_id, self.interval(arm_id)) for arm_id in self.arm_ids)
+            },
+        }
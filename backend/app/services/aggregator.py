@@ -6,7 +6,11 @@ from statistics import mean
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.metrics import AGGREGATION_SECONDS
 from app.models.entities import Attempt, Experiment, ModelArm, Run, RunStatus, Score
+from app.services.leaderboards import materialize_run_metrics
+from app.services.partitions import run_partition_floor
+from app.services.summary_cache import get_summary_cache
 
 
 def _percentile(values: list[int], pct: float) -> float:
@@ -18,19 +22,34 @@ def _percentile(values: list[int], pct: float) -> float:
 
 
 def aggregate_run(db: Session, run: Run, experiment: Experiment) -> dict:
+    with AGGREGATION_SECONDS.time():
+        return _aggregate_run(db, run, experiment)
+
+
+def _aggregate_run(db: Session, run: Run, experiment: Experiment) -> dict:
     model_arms = db.scalars(
         select(ModelArm).where(ModelArm.experiment_id == experiment.id).order_by(ModelArm.display_name)
     ).all()
-    attempts = db.scalars(select(Attempt).where(Attempt.run_id == run.id)).all()
-    scores = db.scalars(select(Score).where(Score.run_id == run.id)).all()
+    attempt_stmt = select(Attempt).where(Attempt.run_id == run.id)
+    score_stmt = select(
+        Score.model_arm_id, Score.quality, Score.passed, Score.judge_score
+    ).where(Score.run_id == run.id)
+    if (floor := run_partition_floor(run)) is not None:
+        attempt_stmt = attempt_stmt.where(Attempt.created_at >= floor)
+        score_stmt = score_stmt.where(Score.created_at >= floor)
+    attempts = db.scalars(attempt_stmt).all()
+    scores = db.execute(score_stmt).all()
 
     by_model_attempts: dict[str, list[Attempt]] = defaultdict(list)
     by_model_scores: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
 
     for attempt in attempts:
         by_model_attempts[attempt.model_arm_id].append(attempt)
-    for score in scores:
-        by_model_scores[score.model_arm_id][score.metric_name].append(score.value)
+    for model_arm_id, quality, passed, judge_score in scores:
+        by_model_scores[model_arm_id]["quality"].append(quality)
+        by_model_scores[model_arm_id]["pass"].append(1.0 if passed else 0.0)
+        if judge_score is not None:
+            by_model_scores[model_arm_id]["judge"].append(judge_score)
 
     model_summaries: list[dict] = []
     total_errors = 0
@@ -47,7 +66,7 @@ def aggregate_run(db: Session, run: Run, experiment: Experiment) -> dict:
         summary = {
             "model_arm_id": arm.id,
             "display_name": arm.display_name,
-            "provider": arm.provider.value,
+            "provider": arm.provider,
             "model_name": arm.model_name,
             "quality_avg": float(mean(arm_scores.get("quality", [0.0]))),
             "pass_rate": float(mean(arm_scores.get("pass", [0.0]))),
@@ -57,6 +76,13 @@ def aggregate_run(db: Session, run: Run, experiment: Experiment) -> dict:
             "latency_p95_ms": _percentile(latencies, 0.95),
             "total_cost_usd": round(sum(costs), 6),
         }
+        cache_read_tokens = sum(attempt.usage_cache_read_tokens or 0 for attempt in arm_attempts)
+        cache_write_tokens = sum(attempt.usage_cache_write_tokens or 0 for attempt in arm_attempts)
+        if cache_read_tokens or cache_write_tokens:
+            summary["cache_read_tokens"] = cache_read_tokens
+            summary["cache_write_tokens"] = cache_write_tokens
+        if judge_scores := arm_scores.get("judge"):
+            summary["judge_avg"] = float(mean(judge_scores))
         model_summaries.append(summary)
 
     model_summaries.sort(key=lambda row: (-row["quality_avg"], row["total_cost_usd"]))
@@ -72,4 +98,6 @@ def aggregate_run(db: Session, run: Run, experiment: Experiment) -> dict:
         "total_errors": total_errors,
     }
     run.summary_json = payload
+    materialize_run_metrics(db, run, experiment, model_summaries)
+    get_summary_cache().invalidate(run.id)
     return payload
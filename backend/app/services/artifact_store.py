@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.upsert import insert_ignoring_conflicts
+from app.models.entities import AttemptArtifact
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ZSTD_CODEC = "zstd"
+ZLIB_CODEC = "zlib"
+COMPRESSION_LEVEL = 6
+
+
+def canonical_bytes(payload: dict) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def compress(content: bytes) -> tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(content), ZSTD_CODEC
+    return zlib.compress(content, COMPRESSION_LEVEL), ZLIB_CODEC
+
+
+def decompress(content: bytes, codec: str) -> bytes:
+    if codec == ZSTD_CODEC:
+        if zstandard is None:
+            raise RuntimeError("Reading zstd artifacts requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(content)
+    if codec == ZLIB_CODEC:
+        return zlib.decompress(content)
+    raise ValueError(f"Unsupported artifact codec: {codec}")
+
+
+class ArtifactStore(ABC):
+    def put(self, db: Session, payload: Optional[dict]) -> Optional[str]:
+        if not payload:
+            return None
+        raw = canonical_bytes(payload)
+        digest = hashlib.sha256(raw).hexdigest()
+        if not self._exists(db, digest):
+            compressed, codec = compress(raw)
+            self._write(db, digest, compressed, codec, len(raw))
+        return digest
+
+    def get(self, db: Session, digest: Optional[str]) -> Optional[dict]:
+        if not digest:
+            return None
+        stored = self._read(db, digest)
+        if stored is None:
+            return None
+        content, codec = stored
+        return json.loads(decompress(content, codec))
+
+    @abstractmethod
+    def _exists(self, db: Session, digest: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _write(self, db: Session, digest: str, content: bytes, codec: str, size_bytes: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _read(self, db: Session, digest: str) -> Optional[tuple[bytes, str]]:
+        raise NotImplementedError
+
+
+class DatabaseArtifactStore(ArtifactStore):
+    def _exists(self, db: Session, digest: str) -> bool:
+        # The insert skips digests that are already stored, so no lookup is needed; a
+        # lookup would also let two runs storing the same payload race to the insert.
+        return False
+
+    def _write(self, db: Session, digest: str, content: bytes, codec: str, size_bytes: int) -> None:
+        db.execute(
+            insert_ignoring_conflicts(db, AttemptArtifact, ["digest"]).values(
+                digest=digest,
+                codec=codec,
+                size_bytes=size_bytes,
+                compressed_size_bytes=len(content),
+                content=content,
+            )
+        )
+
+    def _read(self, db: Session, digest: str) -> Optional[tuple[bytes, str]]:
+        artifact = db.get(AttemptArtifact, digest)
+        if artifact is None:
+            return None
+        return artifact.content, artifact.codec
+
+
+class FilesystemArtifactStore(ArtifactStore):
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    def _path(self, digest: str) -> Path:
+        return self._root / digest[:2] / digest[2:4] / digest
+
+    def _exists(self, db: Session, digest: str) -> bool:
+        directory = self._path(digest).parent
+        return directory.exists() and any(directory.glob(f"{digest}.*"))
+
+    def _write(self, db: Session, digest: str, content: bytes, codec: str, size_bytes: int) -> None:
+        path = self._path(digest).with_suffix(f".{codec}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{codec}.tmp")
+        temporary.write_bytes(content)
+        temporary.replace(path)
+
+    def _read(self, db: Session, digest: str) -> Optional[tuple[bytes, str]]:
+        base = self._path(digest)
+        for codec in (ZSTD_CODEC, ZLIB_CODEC):
+            path = base.with_suffix(f".{codec}")
+            if path.exists():
+                return path.read_bytes(), codec
+        return None
+
+
+@lru_cache
+def get_artifact_store() -> ArtifactStore:
+    settings = get_settings()
+    if settings.artifact_store == "filesystem":
+        return FilesystemArtifactStore(Path(settings.artifact_root))
+    if settings.artifact_store != "database":
+        raise ValueError("ARTIFACT_STORE must be 'database' or 'filesystem'")
+    return DatabaseArtifactStore()
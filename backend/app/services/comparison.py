@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.entities import Run, Score
+from app.services.partitions import run_partition_floor
+from app.services.scorer import metric_column
+
+# Resampling runs over at most this many value groups, however many tasks were paired.
+MAX_COLLAPSED_VALUES = 256
+RESAMPLE_CHUNK_CELLS = 1 << 22
+
+
+@dataclass
+class PairedComparison:
+    run_id: str
+    metric: str
+    arm_a_id: str
+    arm_b_id: str
+    task_count: int
+    mean_a: float
+    mean_b: float
+    mean_delta: float
+    ci_low: float
+    ci_high: float
+    confidence: float
+    wins_a: int
+    wins_b: int
+    ties: int
+    sign_test_p_value: float
+    permutation_p_value: float
+    n_resamples: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def load_paired_values(
+    db: Session,
+    run_id: str,
+    arm_a_id: str,
+    arm_b_id: str,
+    metric: str = "quality",
+    since: Optional[datetime] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    stmt = select(Score.task_instance_id, Score.model_arm_id, metric_column(metric)).where(
+        Score.run_id == run_id,
+        Score.model_arm_id.in_([arm_a_id, arm_b_id]),
+    )
+    if since is not None:
+        stmt = stmt.where(Score.created_at >= since)
+    rows = db.execute(stmt)
+    by_task: dict[str, list[Optional[float]]] = {}
+    for task_instance_id, model_arm_id, value in rows:
+        slot = by_task.setdefault(task_instance_id, [None, None])
+        slot[0 if model_arm_id == arm_a_id else 1] = None if value is None else float(value)
+
+    paired = sorted(
+        (task_id, values) for task_id, values in by_task.items() if None not in values
+    )
+    a_values = np.fromiter((values[0] for _, values in paired), dtype=np.float64, count=len(paired))
+    b_values = np.fromiter((values[1] for _, values in paired), dtype=np.float64, count=len(paired))
+    return a_values, b_values
+
+
+def _value_groups(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # (sizes, means, within-group sums of squared deviations). Discrete metrics collapse
+    # to their distinct values exactly; continuous ones are cut into equal-count groups
+    # of neighbouring sorted values, so resampling cost no longer grows with the task count.
+    distinct, counts = np.unique(values, return_counts=True)
+    if distinct.size <= MAX_COLLAPSED_VALUES:
+        return counts, distinct, np.zeros(distinct.size)
+    ordered = np.sort(values)
+    edges = np.linspace(0, ordered.size, MAX_COLLAPSED_VALUES, endpoint=False)
+    bounds = np.unique(edges.astype(np.int64))
+    sizes = np.diff(np.append(bounds, ordered.size))
+    means = np.add.reduceat(ordered, bounds) / sizes
+    squares = np.add.reduceat((ordered - np.repeat(means, sizes)) ** 2, bounds)
+    return sizes, means, squares
+
+
+def bootstrap_mean_ci(
+    deltas: np.ndarray,
+    rng: np.random.Generator,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+) -> tuple[float, float]:
+    n = deltas.size
+    if n == 0:
+        return 0.0, 0.0
+
+    sizes, group_means, squares = _value_groups(deltas)
+    variances = squares / sizes
+    means = np.empty(n_resamples, dtype=np.float64)
+    chunk = max(1, RESAMPLE_CHUNK_CELLS // sizes.size)
+    for start in range(0, n_resamples, chunk):
+        stop = min(n_resamples, start + chunk)
+        # Resampling n rows with replacement is a multinomial draw over the groups.
+        counts = rng.multinomial(n, sizes / n, size=stop - start)
+        totals = counts @ group_means
+        if squares.any():
+            # c draws from a group add c * variance of spread around its mean; the sum
+            # over groups is normal to within the (tiny) within-group spread.
+            totals += np.sqrt(counts @ variances) * rng.standard_normal(stop - start)
+        means[start:stop] = totals / n
+
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(means, [alpha, 1.0 - alpha])
+    return float(low), float(high)
+
+
+def sign_test_p_value(deltas: np.ndarray) -> float:
+    positives = int(np.count_nonzero(deltas > 0))
+    negatives = int(np.count_nonzero(deltas < 0))
+    n = positives + negatives
+    if n == 0:
+        return 1.0
+    k = min(positives, negatives)
+    steps = np.arange(1, k + 1, dtype=np.float64)
+    log_binom = np.concatenate(([0.0], np.cumsum(np.log((n - steps + 1) / steps))))
+    tail = float(np.exp(log_binom - n * np.log(2.0)).sum())
+    return min(1.0, 2.0 * tail)
+
+
+def permutation_p_value(
+    deltas: np.ndarray, rng: np.random.Generator, n_permutations: int = 10_000
+) -> float:
+    nonzero = deltas[deltas != 0]
+    if nonzero.size == 0:
+        return 1.0
+    observed = abs(float(nonzero.sum()))
+    sizes, magnitudes, squares = _value_groups(np.abs(nonzero))
+    statistics = np.empty(n_permutations, dtype=np.float64)
+    chunk = max(1, RESAMPLE_CHUNK_CELLS // sizes.size)
+    for start in range(0, n_permutations, chunk):
+        stop = min(n_permutations, start + chunk)
+        # Random sign flips per group reduce to a binomial count of positive signs.
+        positives = rng.binomial(sizes, 0.5, size=(stop - start, sizes.size))
+        totals = (2 * positives - sizes) @ magnitudes
+        if squares.any():
+            # Which k of a group's c values turn positive adds spread with variance
+            # 4 k (c - k) / (c (c - 1)) times the group's squared deviations.
+            pairs = sizes * np.maximum(sizes - 1, 1)
+            spread = (4.0 * positives * (sizes - positives) / pairs) @ squares
+            totals += np.sqrt(spread) * rng.standard_normal(stop - start)
+        statistics[start:stop] = totals
+    extreme = int(np.count_nonzero(np.abs(statistics) >= observed - 1e-12))
+    return (extreme + 1) / (n_permutations + 1)
+
+
+def compare_arms(
+    db: Session,
+    run: Run,
+    arm_a_id: str,
+    arm_b_id: str,
+    metric: str = "quality",
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+) -> PairedComparison:
+    a_values, b_values = load_paired_values(
+        db, run.id, arm_a_id, arm_b_id, metric, since=run_partition_floor(run)
+    )
+    if a_values.size == 0:
+        raise ValueError(f"No paired '{metric}' scores for arms {arm_a_id} and {arm_b_id}")
+
+    deltas = a_values - b_values
+    rng = np.random.default_rng(run.seed if seed is None else seed)
+    ci_low, ci_high = bootstrap_mean_ci(deltas, rng, n_resamples=n_resamples, confidence=confidence)
+    return PairedComparison(
+        run_id=run.id,
+        metric=metric,
+        arm_a_id=arm_a_id,
+        arm_b_id=arm_b_id,
+        task_count=int(deltas.size),
+        mean_a=float(a_values.mean()),
+        mean_b=float(b_values.mean()),
+        mean_delta=float(deltas.mean()),
+        ci_low=ci_low,
+        ci_high=ci_high,
+        confidence=confidence,
+        wins_a=int(np.count_nonzero(deltas > 0)),
+        wins_b=int(np.count_nonzero(deltas < 0)),
+        ties=int(np.count_nonzero(deltas == 0)),
+        sign_test_p_value=sign_test_p_value(deltas),
+        permutation_p_value=permutation_p_value(deltas, rng, n_permutations=n_resamples),
+        n_resamples=n_resamples,
+    )
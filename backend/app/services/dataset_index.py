@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+MISSING_STRATUM = "__missing__"
+
+
+def resolve_field(row: dict, field_path: str) -> Any:
+    value: Any = row
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def sampling_weight(value: Any, field_path: str) -> float:
+    if value is None:
+        return 1.0
+    # bool is an int subclass, and numeric strings would slip through float().
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Non-numeric sampling weight in field '{field_path}': {value!r}")
+    weight = float(value)
+    # NaN compares false against everything and would corrupt the weighted selection.
+    if not math.isfinite(weight):
+        raise ValueError(f"Non-finite sampling weight in field '{field_path}': {value!r}")
+    if weight < 0:
+        raise ValueError(f"Negative sampling weight in field '{field_path}'")
+    return weight
+
+
+class DatasetIndex:
+    # Built over the rows the bundle has already parsed (tasks need full rows anyway);
+    # each field is scanned once, on first use, and the result is cached with the bundle.
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+        self._strata: dict[str, dict[str, list[int]]] = {}
+        self._weights: dict[str, list[float]] = {}
+        self._positive_weight_rows: dict[str, int] = {}
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def strata(self, field_path: str) -> dict[str, list[int]]:
+        buckets = self._strata.get(field_path)
+        if buckets is None:
+            buckets = {}
+            for row_index, row in enumerate(self._rows):
+                value = resolve_field(row, field_path)
+                key = MISSING_STRATUM if value is None else str(value)
+                buckets.setdefault(key, []).append(row_index)
+            self._strata[field_path] = buckets
+        return buckets
+
+    def weights(self, field_path: str) -> list[float]:
+        weights = self._weights.get(field_path)
+        if weights is None:
+            weights = []
+            for row in self._rows:
+                weights.append(sampling_weight(resolve_field(row, field_path), field_path))
+            self._weights[field_path] = weights
+            self._positive_weight_rows[field_path] = sum(1 for weight in weights if weight > 0)
+        return weights
+
+    def positive_weight_rows(self, field_path: str) -> int:
+        self.weights(field_path)
+        return self._positive_weight_rows[field_path]
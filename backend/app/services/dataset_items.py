@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_ignoring_conflicts
+from app.models.entities import DatasetItem, TaskInstance
+
+LOOKUP_CHUNK_SIZE = 500
+
+
+def persist_dataset_items(db: Session, tasks: list[TaskInstance]) -> int:
+    # Items are content-addressed, so rows already stored by an earlier run (of this
+    # or any other dataset version) are reused and only unseen rows are inserted. The
+    # insert skips existing digests itself, so runs launched together over the same new
+    # rows cannot collide on the key.
+    planned: dict[str, DatasetItem] = {}
+    for task in tasks:
+        planned.setdefault(task.dataset_item_digest, task.dataset_item)
+    digests = list(planned)
+
+    inserted = 0
+    items: dict[str, DatasetItem] = {}
+    for start in range(0, len(digests), LOOKUP_CHUNK_SIZE):
+        chunk = digests[start : start + LOOKUP_CHUNK_SIZE]
+        rows = [
+            {
+                "digest": digest,
+                "input_payload": planned[digest].input_payload,
+                "expected_payload": planned[digest].expected_payload,
+                "scoring_details": planned[digest].scoring_details,
+            }
+            for digest in chunk
+        ]
+        statement = insert_ignoring_conflicts(db, DatasetItem, ["digest"])
+        inserted += len(db.scalars(statement.returning(DatasetItem.digest), rows).all())
+        for item in db.scalars(select(DatasetItem).where(DatasetItem.digest.in_(chunk))):
+            items[item.digest] = item
+
+    for task in tasks:
+        task.dataset_item = items[task.dataset_item_digest]
+    return inserted
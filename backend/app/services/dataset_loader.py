@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
 
+from app.core.config import get_settings
+from app.core.metrics import record_cache_lookup
+from app.services.dataset_index import DatasetIndex
 from app.utils.dataset_hash import sha256_bytes
 
 DATASET_ROOT = Path(__file__).resolve().parents[3] / "datasets"
+MAX_CACHED_DATASETS = 8
+
+_bundle_cache: OrderedDict[tuple[str, str], DatasetBundle] = OrderedDict()
+_bundle_cache_lock = threading.Lock()
 
 
 @dataclass
@@ -14,16 +25,96 @@ class DatasetBundle:
     dataset_ref: str
     dataset_hash: str
     rows: list[dict]
+    size_bytes: int = 0
+    _index: Optional[DatasetIndex] = field(default=None, repr=False, compare=False)
+    _row_digests: Optional[list[str]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def index(self) -> DatasetIndex:
+        if self._index is None:
+            self._index = DatasetIndex(self.rows)
+        return self._index
+
+    @property
+    def row_digests(self) -> list[str]:
+        if self._row_digests is None:
+            self._row_digests = [row_digest(row) for row in self.rows]
+        return self._row_digests
+
+
+def row_payloads(row: dict) -> tuple[dict, dict]:
+    return row.get("input", {}), row.get("expected", {})
+
+
+def row_digest(row: dict) -> str:
+    input_payload, expected_payload = row_payloads(row)
+    content = {"input": input_payload, "expected": expected_payload}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def dataset_root() -> Path:
+    configured = get_settings().dataset_root
+    return Path(configured) if configured else DATASET_ROOT
+
+
+def _parse_rows(content: bytes) -> list[dict]:
+    lines = content.decode("utf-8").strip().splitlines()
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def _appended_to(dataset_ref: str, content: bytes) -> Optional[DatasetBundle]:
+    # Datasets grow by appending JSONL rows: when a cached version of this file is a
+    # line-aligned prefix of the new content, only the appended tail needs parsing.
+    with _bundle_cache_lock:
+        candidates = [
+            bundle
+            for (ref, _), bundle in reversed(_bundle_cache.items())
+            if ref == dataset_ref and 0 < bundle.size_bytes < len(content)
+        ]
+    for bundle in candidates:
+        size = bundle.size_bytes
+        on_line_boundary = content[size - 1 : size] == b"\n" or content[size : size + 1] == b"\n"
+        if on_line_boundary and sha256_bytes(content[:size]) == bundle.dataset_hash:
+            return bundle
+    return None
 
 
 def load_dataset(dataset_ref: str) -> DatasetBundle:
-    dataset_path = DATASET_ROOT / dataset_ref
+    dataset_path = dataset_root() / dataset_ref
     if not dataset_path.exists():
         raise FileNotFoundError(f"Dataset does not exist: {dataset_ref}")
 
     content = dataset_path.read_bytes()
-    lines = content.decode("utf-8").strip().splitlines()
-    rows = [json.loads(line) for line in lines if line.strip()]
+    cache_key = (dataset_ref, sha256_bytes(content))
+    with _bundle_cache_lock:
+        cached = _bundle_cache.get(cache_key)
+        record_cache_lookup("dataset", hit=cached is not None)
+        if cached is not None:
+            _bundle_cache.move_to_end(cache_key)
+            return cached
+
+    row_digests = None
+    previous = _appended_to(dataset_ref, content)
+    if previous is not None:
+        appended = _parse_rows(content[previous.size_bytes :])
+        rows = previous.rows + appended
+        if previous._row_digests is not None:
+            row_digests = previous._row_digests + [row_digest(row) for row in appended]
+    else:
+        rows = _parse_rows(content)
     if not rows:
         raise ValueError(f"Dataset is empty: {dataset_ref}")
-    return DatasetBundle(dataset_ref=dataset_ref, dataset_hash=sha256_bytes(content), rows=rows)
+    bundle = DatasetBundle(
+        dataset_ref=dataset_ref,
+        dataset_hash=cache_key[1],
+        rows=rows,
+        size_bytes=len(content),
+        _row_digests=row_digests,
+    )
+
+    with _bundle_cache_lock:
+        _bundle_cache[cache_key] = bundle
+        while len(_bundle_cache) > MAX_CACHED_DATASETS:
+            _bundle_cache.popitem(last=False)
+    return bundle
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Delete, Engine, delete, select
+from sqlalchemy.orm import Session
+
+from app.models.entities import (
+    Attempt,
+    Experiment,
+    ModelArm,
+    Run,
+    RunArmMetric,
+    Score,
+    TaskInstance,
+)
+from app.services.summary_cache import get_summary_cache
+
+logger = logging.getLogger("modeleval.deletion")
+
+# Children first, so every statement is a single indexed set-based DELETE and
+# no foreign key check ever has to look at rows that are about to go anyway.
+RUN_CHILD_TABLES = (Score, Attempt, RunArmMetric, TaskInstance)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class DeletionJob:
+    experiment_id: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = PENDING
+    runs_total: int = 0
+    runs_deleted: int = 0
+    rows_deleted: int = 0
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    completed_at: Optional[datetime] = None
+
+
+def _execute_delete(db: Session, stmt: Delete) -> int:
+    # Skip ORM session synchronisation: on PostgreSQL it would RETURNING every deleted id.
+    result = db.execute(stmt.execution_options(synchronize_session=False))
+    return result.rowcount or 0
+
+
+def delete_run_rows(db: Session, run_id: str) -> int:
+    deleted = 0
+    for model in RUN_CHILD_TABLES:
+        deleted += _execute_delete(db, delete(model).where(model.run_id == run_id))
+    deleted += _execute_delete(db, delete(Run).where(Run.id == run_id))
+    get_summary_cache().invalidate(run_id)
+    return deleted
+
+
+def delete_experiment_rows(
+    db: Session, experiment_id: str, progress: Optional[Callable[[int, int, int], None]] = None
+) -> int:
+    run_ids = list(db.scalars(select(Run.id).where(Run.experiment_id == experiment_id)))
+    deleted = 0
+    for index, run_id in enumerate(run_ids, start=1):
+        deleted += delete_run_rows(db, run_id)
+        # One transaction per run keeps locks and WAL bounded for huge experiments.
+        db.commit()
+        if progress is not None:
+            progress(index, len(run_ids), deleted)
+    for stmt in (
+        delete(ModelArm).where(ModelArm.experiment_id == experiment_id),
+        delete(Experiment).where(Experiment.id == experiment_id),
+    ):
+        deleted += _execute_delete(db, stmt)
+    db.commit()
+    db.expunge_all()
+    return deleted
+
+
+class DeletionJobRegistry:
+    def __init__(self, max_jobs: int = 256) -> None:
+        self._jobs: dict[str, DeletionJob] = {}
+        self._lock = threading.Lock()
+        self._max_jobs = max_jobs
+
+    def create(self, experiment_id: str) -> DeletionJob:
+        job = DeletionJob(experiment_id=experiment_id)
+        with self._lock:
+            if len(self._jobs) >= self._max_jobs:
+                finished = [key for key, value in self._jobs.items() if value.completed_at]
+                for key in finished[: len(self._jobs) - self._max_jobs + 1]:
+                    del self._jobs[key]
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[DeletionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_for(self, experiment_id: str) -> Optional[DeletionJob]:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.experiment_id == experiment_id and job.status in {PENDING, RUNNING}:
+                    return job
+        return None
+
+
+deletion_jobs = DeletionJobRegistry()
+
+
+def run_deletion_job(job: DeletionJob, bind: Engine) -> None:
+    def _progress(runs_deleted: int, runs_total: int, rows_deleted: int) -> None:
+        job.runs_deleted, job.runs_total, job.rows_deleted = runs_deleted, runs_total, rows_deleted
+
+    job.status = RUNNING
+    with Session(bind=bind, autoflush=False) as db:
+        job.runs_total = len(
+            db.scalars(select(Run.id).where(Run.experiment_id == job.experiment_id)).all()
+        )
+        try:
+            job.rows_deleted = delete_experiment_rows(db, job.experiment_id, progress=_progress)
+            job.status = SUCCEEDED
+        except Exception as exc:
+            db.rollback()
+            job.status = FAILED
+            job.error = str(exc)
+            logger.exception("experiment_deletion_failed")
+        finally:
+            job.completed_at = datetime.now(timezone.utc)
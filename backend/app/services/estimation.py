@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.entities import Attempt, Experiment, ModelArm, ProviderType
+from app.providers.costs import estimate_cost_usd
+from app.providers.tokenizers import get_tokenizer
+from app.services.dataset_loader import load_dataset, row_payloads
+from app.services.execution import task_prompt
+from app.services.planner import select_row_indexes
+
+TOKENIZE_BATCH_SIZE = 4096
+HISTORY_SAMPLE_SIZE = 200
+DEFAULT_COMPLETION_TOKENS = 512
+DEFAULT_LATENCY_MS = 2000.0
+
+
+def _arm_history(db: Session, arm: ModelArm) -> tuple[Optional[float], Optional[float]]:
+    # Mean completion tokens and latency over the arm's most recent successful attempts.
+    recent = (
+        select(Attempt.usage_completion_tokens, Attempt.latency_ms)
+        .where(Attempt.model_arm_id == arm.id, Attempt.error_message.is_(None))
+        .order_by(Attempt.created_at.desc())
+        .limit(HISTORY_SAMPLE_SIZE)
+        .subquery()
+    )
+    completion_avg, latency_avg = db.execute(
+        select(func.avg(recent.c.usage_completion_tokens), func.avg(recent.c.latency_ms))
+    ).one()
+    return (
+        float(completion_avg) if completion_avg is not None else None,
+        float(latency_avg) if latency_avg is not None else None,
+    )
+
+
+def _count_tokens(tokenizer, prompts: list[str]) -> int:
+    total = 0
+    for start in range(0, len(prompts), TOKENIZE_BATCH_SIZE):
+        total += sum(tokenizer.count_batch(prompts[start : start + TOKENIZE_BATCH_SIZE]))
+    return total
+
+
+def estimate_run(
+    db: Session, experiment: Experiment, model_arms: list[ModelArm], seed: Optional[int] = None
+) -> dict:
+    # Projects a run that generates every planned attempt; reused, incremental or
+    # adaptively skipped attempts can only make the real run cheaper.
+    dataset = load_dataset(experiment.dataset_ref)
+    indexes = select_row_indexes(
+        dataset, experiment.sampling, seed if seed is not None else experiment.seed
+    )
+    prompts = [task_prompt(row_payloads(dataset.rows[index])[0]) for index in indexes]
+    task_count = len(prompts)
+
+    prompt_tokens_by_tokenizer: dict[str, int] = {}
+    arms: list[dict] = []
+    for arm in sorted(model_arms, key=lambda item: item.display_name):
+        config = {**arm.config, "model_name": arm.model_name}
+        tokenizer = get_tokenizer(arm.provider, arm.model_name)
+        if tokenizer.name not in prompt_tokens_by_tokenizer:
+            prompt_tokens_by_tokenizer[tokenizer.name] = _count_tokens(tokenizer, prompts)
+        prompt_tokens = prompt_tokens_by_tokenizer[tokenizer.name]
+        if system_prompt := config.get("system_prompt"):
+            prompt_tokens += tokenizer.count(system_prompt) * task_count
+
+        completion_avg, latency_avg = _arm_history(db, arm)
+        if completion_avg is None:
+            completion_avg = float(config.get("max_tokens", DEFAULT_COMPLETION_TOKENS))
+        if latency_avg is None:
+            if arm.provider == ProviderType.MOCK:
+                latency_avg = float(config.get("mock_latency_ms", 0.0))
+            else:
+                latency_avg = DEFAULT_LATENCY_MS
+        completion_tokens = int(round(completion_avg * task_count))
+
+        arms.append(
+            {
+                "model_arm_id": arm.id,
+                "display_name": arm.display_name,
+                "tokenizer": tokenizer.name,
+                "exact_prompt_tokens": tokenizer.exact,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost_usd": round(estimate_cost_usd(prompt_tokens, completion_tokens, config), 6),
+                "duration_s": round(latency_avg * task_count / 1000.0, 3),
+            }
+        )
+
+    projected_cost = round(sum(arm["cost_usd"] for arm in arms), 6)
+    return {
+        "experiment_id": experiment.id,
+        "dataset_hash": dataset.dataset_hash,
+        "task_count": task_count,
+        "attempt_count": task_count * len(arms),
+        "budget_usd": float(experiment.budget_usd),
+        "projected_cost_usd": projected_cost,
+        # Attempts are generated one after another, so arm durations add up.
+        "projected_duration_s": round(sum(arm["duration_s"] for arm in arms), 3),
+        "within_budget": projected_cost <= float(experiment.budget_usd),
+        "arms": arms,
+    }
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_ignoring_conflicts
+from app.models.entities import (
+    Attempt,
+    DatasetItem,
+    Judgment,
+    ProviderType,
+    Run,
+    Score,
+    TaskInstance,
+)
+from app.providers.factory import get_provider
+from app.providers.registry import get_registry
+from app.services.artifact_store import canonical_bytes
+from app.services.partitions import run_partition_floor
+from app.services.profiling import profile_worker
+from app.services.reuse import fingerprint
+
+logger = logging.getLogger("modeleval.evaluator")
+
+RUBRICS = {
+    "v1": (
+        "You are grading model responses to software engineering review and triage tasks. "
+        "For each item, compare the response with the task and the reference answer and give "
+        "a score from 0.0 (wrong, unsafe or unhelpful) to 1.0 (correct, specific and actionable)."
+    ),
+}
+RESPONSE_INSTRUCTIONS = (
+    'Reply with JSON only, in the form {"scores": [{"id": "<item id>", "score": <0.0-1.0>, '
+    '"rationale": "<one sentence>"}]}, with exactly one entry per item.'
+)
+LOOKUP_CHUNK_SIZE = 500
+
+
+@dataclass
+class EvaluatorConfig:
+    provider: str
+    model_name: str
+    config: dict = field(default_factory=dict)
+    rubric_version: str = "v1"
+    batch_size: int = 8
+    concurrency: int = 4
+
+    @classmethod
+    def from_dict(cls, options: dict) -> EvaluatorConfig:
+        provider = str(options.get("provider", ProviderType.MOCK.value))
+        if provider not in get_registry():
+            raise ValueError(f"evaluator.provider must be one of {get_registry().names()}")
+        config = cls(
+            provider=provider,
+            model_name=str(options.get("model_name") or ""),
+            config=options.get("config") or {},
+            rubric_version=str(options.get("rubric_version", cls.rubric_version)),
+            batch_size=int(options.get("batch_size", cls.batch_size)),
+            concurrency=int(options.get("concurrency", cls.concurrency)),
+        )
+        config.validate()
+        return config
+
+    def validate(self) -> None:
+        if not self.model_name:
+            raise ValueError("evaluator.model_name is required")
+        if not isinstance(self.config, dict):
+            raise ValueError("evaluator.config must be an object")
+        if self.rubric_version not in RUBRICS:
+            raise ValueError(f"evaluator.rubric_version must be one of {sorted(RUBRICS)}")
+        if self.batch_size <= 0:
+            raise ValueError("evaluator.batch_size must be a positive integer")
+        if self.concurrency <= 0:
+            raise ValueError("evaluator.concurrency must be a positive integer")
+
+    @property
+    def judge_fingerprint(self) -> str:
+        return fingerprint(self.provider, self.model_name, self.config)
+
+
+@dataclass
+class JudgeItem:
+    key: str
+    task_input: Any
+    expected: Any
+    output: str
+
+
+@dataclass
+class BatchResult:
+    judgments: dict[str, tuple[float, Optional[str]]]
+    cost_usd: float = 0.0
+    error: Optional[str] = None
+
+
+def judgment_key(config: EvaluatorConfig, item_digest: str, output: str) -> str:
+    payload = {
+        "rubric_version": config.rubric_version,
+        "judge": config.judge_fingerprint,
+        "item": item_digest,
+        "output": hashlib.sha256(output.encode("utf-8")).hexdigest(),
+    }
+    return hashlib.sha256(canonical_bytes(payload)).hexdigest()
+
+
+def build_judge_prompt(rubric_version: str, items: list[JudgeItem]) -> str:
+    payload = [
+        {
+            "id": str(index),
+            "task": item.task_input,
+            "reference": item.expected,
+            "response": item.output,
+        }
+        for index, item in enumerate(items, start=1)
+    ]
+    items_json = json.dumps({"items": payload}, default=str)
+    return "\n\n".join([RUBRICS[rubric_version], RESPONSE_INSTRUCTIONS, items_json])
+
+
+def parse_judgments(
+    raw_output: str, item_ids: list[str]
+) -> dict[str, tuple[float, Optional[str]]]:
+    # Judges like to wrap JSON in prose or code fences; only the outermost object matters.
+    start, end = raw_output.find("{"), raw_output.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("judge response contained no JSON object")
+    entries = json.loads(raw_output[start : end + 1]).get("scores")
+    if not isinstance(entries, list):
+        raise ValueError("judge response is missing a scores list")
+    wanted = set(item_ids)
+    judgments: dict[str, tuple[float, Optional[str]]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or str(entry.get("id")) not in wanted:
+            continue
+        score = min(1.0, max(0.0, float(entry["score"])))
+        rationale = entry.get("rationale")
+        judgments[str(entry["id"])] = (score, str(rationale) if rationale is not None else None)
+    return judgments
+
+
+def judge_batch(config: EvaluatorConfig, items: list[JudgeItem]) -> BatchResult:
+    item_ids = [str(index) for index in range(1, len(items) + 1)]
+    model_config = {**config.config, "model_name": config.model_name, "judge_item_ids": item_ids}
+    result = get_provider(config.provider).generate(
+        task_input=build_judge_prompt(config.rubric_version, items), model_config=model_config
+    )
+    if result.error:
+        return BatchResult(judgments={}, cost_usd=result.cost_usd, error=result.error)
+    try:
+        parsed = parse_judgments(result.raw_output or "", item_ids)
+    except (ValueError, KeyError, TypeError) as exc:
+        error = f"judge_parse_error: {exc}"
+        return BatchResult(judgments={}, cost_usd=result.cost_usd, error=error)
+    judgments = {items[int(item_id) - 1].key: judgment for item_id, judgment in parsed.items()}
+    return BatchResult(judgments=judgments, cost_usd=result.cost_usd)
+
+
+def _cached_judgments(db: Session, keys: list[str]) -> dict[str, float]:
+    cached: dict[str, float] = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start : start + LOOKUP_CHUNK_SIZE]
+        stmt = select(Judgment.key, Judgment.score).where(Judgment.key.in_(chunk))
+        cached.update(db.execute(stmt).all())
+    return cached
+
+
+def _judge_items(db: Session, pending: dict[str, tuple[str, str]]) -> list[JudgeItem]:
+    digests = list({digest for digest, _ in pending.values()})
+    payloads: dict[str, tuple[Any, Any]] = {}
+    for start in range(0, len(digests), LOOKUP_CHUNK_SIZE):
+        chunk = digests[start : start + LOOKUP_CHUNK_SIZE]
+        stmt = select(
+            DatasetItem.digest, DatasetItem.input_payload, DatasetItem.expected_payload
+        ).where(DatasetItem.digest.in_(chunk))
+        for digest, input_payload, expected_payload in db.execute(stmt):
+            payloads[digest] = (input_payload, expected_payload)
+    return [
+        JudgeItem(
+            key=key, task_input=payloads[digest][0], expected=payloads[digest][1], output=output
+        )
+        for key, (digest, output) in pending.items()
+    ]
+
+
+def evaluate_run(db: Session, run: Run, config: EvaluatorConfig) -> dict:
+    stmt = (
+        select(Score.id, Attempt.raw_output, TaskInstance.dataset_item_digest)
+        .join(
+            Attempt,
+            and_(
+                Attempt.run_id == Score.run_id,
+                Attempt.task_instance_id == Score.task_instance_id,
+                Attempt.model_arm_id == Score.model_arm_id,
+            ),
+        )
+        .join(TaskInstance, TaskInstance.id == Score.task_instance_id)
+        .where(
+            Score.run_id == run.id,
+            Score.judge_score.is_(None),
+            Attempt.error_message.is_(None),
+            Attempt.raw_output.is_not(None),
+        )
+    )
+    if (floor := run_partition_floor(run)) is not None:
+        stmt = stmt.where(Score.created_at >= floor, Attempt.created_at >= floor)
+
+    keys_by_score: dict[str, str] = {}
+    pending: dict[str, tuple[str, str]] = {}
+    for score_id, output, item_digest in db.execute(stmt):
+        key = judgment_key(config, item_digest, output)
+        keys_by_score[score_id] = key
+        pending.setdefault(key, (item_digest, output))
+
+    judged = _cached_judgments(db, list(pending))
+    cache_hits = sum(1 for key in keys_by_score.values() if key in judged)
+    items = _judge_items(db, {key: value for key, value in pending.items() if key not in judged})
+    size = config.batch_size
+    batches = [items[start : start + size] for start in range(0, len(items), size)]
+
+    def judge(batch: list[JudgeItem]) -> BatchResult:
+        with profile_worker():
+            return judge_batch(config, batch)
+
+    results: list[BatchResult] = []
+    if batches:
+        # Judge calls are network bound; the session is only touched from this thread.
+        with ThreadPoolExecutor(max_workers=min(config.concurrency, len(batches))) as pool:
+            results = list(pool.map(judge, batches))
+
+    new_judgments = []
+    for result in results:
+        if result.error:
+            logger.warning("judge_batch_failed", extra={"run_id": run.id, "error": result.error})
+        for key, (score, rationale) in result.judgments.items():
+            judged[key] = score
+            new_judgments.append(
+                {
+                    "key": key,
+                    "rubric_version": config.rubric_version,
+                    "score": score,
+                    "rationale": rationale,
+                }
+            )
+    if new_judgments:
+        # Another run may have judged the same output meanwhile; keep the stored judgment.
+        db.execute(insert_ignoring_conflicts(db, Judgment, ["key"]), new_judgments)
+
+    updates = [
+        {"id": score_id, "judge_score": judged[key]}
+        for score_id, key in keys_by_score.items()
+        if key in judged
+    ]
+    if updates:
+        db.execute(update(Score), updates)
+
+    return {
+        "judge": f"{config.provider}/{config.model_name}",
+        "rubric_version": config.rubric_version,
+        "judged": len(updates),
+        "unjudged": len(keys_by_score) - len(updates),
+        "cache_hits": cache_hits,
+        "judge_calls": len(batches),
+        "failed_calls": sum(1 for result in results if result.error),
+        "cost_usd": round(sum(result.cost_usd for result in results), 6),
+    }
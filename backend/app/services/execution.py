@@ -1,27 +1,54 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import threading
+from collections.abc import Coroutine
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 
-from app.models.entities import Attempt, Experiment, ModelArm, Run, RunStatus
+from app.core.config import get_settings
+from app.core.metrics import INFLIGHT_ATTEMPTS, PROVIDER_LATENCY_SECONDS
+from app.core.tracing import correlation_context, set_span_attributes, start_span
+from app.models.entities import Attempt, Experiment, ModelArm, Run, RunStatus, Score, TaskInstance
+from app.providers.base import ModelProvider, ProviderResult
 from app.providers.factory import get_provider
+from app.services.adaptive import AdaptiveConfig, AdaptiveSampler, is_adaptive
 from app.services.aggregator import aggregate_run
+from app.services.artifact_store import get_artifact_store
+from app.services.dataset_items import persist_dataset_items
 from app.services.dataset_loader import load_dataset
+from app.services.evaluator import EvaluatorConfig, evaluate_run
 from app.services.planner import plan_task_instances
-from app.services.scorer import score_attempt
+from app.services.profiling import profile_run, profile_worker
+from app.services.reuse import (
+    arm_fingerprint,
+    copy_covered_attempts,
+    copy_prior_attempts,
+    run_reuse_key,
+)
+from app.services.run_telemetry import RunTelemetry
+from app.services.scorer import metric_value, score_attempt
 
 logger = logging.getLogger("modeleval.execution")
 
+# Tasks generated per arm before their attempts are recorded and committed.
+GENERATION_CHUNK_SIZE = 32
+
+_generation_loop: Optional[asyncio.AbstractEventLoop] = None
+_generation_loop_lock = threading.Lock()
+
 
 class ExecutionError(RuntimeError):
     pass
 
 
-def _task_prompt(input_payload: dict) -> str:
+def task_prompt(input_payload: dict) -> str:
     if isinstance(input_payload, dict):
         if "prompt" in input_payload:
             return str(input_payload["prompt"])
@@ -29,67 +56,328 @@ def _task_prompt(input_payload: dict) -> str:
     return str(input_payload)
 
 
-def execute_run(db: Session, run: Run, experiment: Experiment, model_arms: list[ModelArm]) -> Run:
+def _generation_path(provider: ModelProvider, count: int) -> str:
+    # The fastest path the provider supports: one request for the whole chunk, many
+    # requests in flight at once, or one blocking request per task.
+    if count > 1 and provider.capabilities.supports_batch:
+        return "batch"
+    if count > 1 and provider.capabilities.supports_async and not _in_event_loop():
+        return "async"
+    return "sync"
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _run_on_generation_loop(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    # Every chunk of every run shares one long-lived loop, so the async SDK clients
+    # (bound to the loop that created them) keep their connection pools.
+    global _generation_loop
+    with _generation_loop_lock:
+        if _generation_loop is None:
+            _generation_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_generation_loop.run_forever, name="modeleval-generation", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _generation_loop).result()
+
+
+async def _generate_concurrently(
+    provider: ModelProvider, task_inputs: list[str], config: dict, concurrency: int
+) -> list[ProviderResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate_one(task_input: str) -> ProviderResult:
+        async with semaphore:
+            return await provider.agenerate(task_input=task_input, model_config=config)
+
+    with profile_worker():
+        return await asyncio.gather(*(generate_one(task_input) for task_input in task_inputs))
+
+
+def _generate(
+    arm: ModelArm, tasks: list[TaskInstance], telemetry: RunTelemetry
+) -> list[ProviderResult]:
+    provider = get_provider(arm.provider)
+    config = {**arm.config, "model_name": arm.model_name}
+    task_inputs = [task_prompt(task.input_payload) for task in tasks]
+    path = _generation_path(provider, len(tasks))
+    if path == "sync":
+        return [
+            _generate_one(provider, arm, config, task, task_input, telemetry)
+            for task, task_input in zip(tasks, task_inputs)
+        ]
+
+    INFLIGHT_ATTEMPTS.inc(len(tasks))
+    try:
+        with telemetry.stage(
+            "generation",
+            span_name=f"provider.generate_{path}",
+            attributes={
+                "modeleval.provider": arm.provider,
+                "modeleval.model": arm.model_name,
+                "modeleval.task_count": len(tasks),
+            },
+        ) as span:
+            if path == "batch":
+                results = provider.generate_batch(task_inputs, config)
+            else:
+                concurrency = int(
+                    config.get("max_concurrency") or get_settings().provider_max_concurrency
+                )
+                results = _run_on_generation_loop(
+                    _generate_concurrently(provider, task_inputs, config, concurrency)
+                )
+            if len(results) != len(tasks):
+                raise ExecutionError(
+                    f"Provider {arm.provider} returned {len(results)} results "
+                    f"for {len(tasks)} tasks"
+                )
+            set_span_attributes(
+                span,
+                **{
+                    "modeleval.usage.prompt_tokens": sum(r.usage.prompt_tokens for r in results),
+                    "modeleval.usage.completion_tokens": sum(
+                        r.usage.completion_tokens for r in results
+                    ),
+                    "modeleval.retry_count": sum(result.retry_count for result in results),
+                    "modeleval.error_count": sum(1 for result in results if result.error),
+                },
+            )
+    finally:
+        INFLIGHT_ATTEMPTS.dec(len(tasks))
+    return results
+
+
+def _generate_one(
+    provider: ModelProvider,
+    arm: ModelArm,
+    config: dict,
+    task: TaskInstance,
+    task_input: str,
+    telemetry: RunTelemetry,
+) -> ProviderResult:
+    INFLIGHT_ATTEMPTS.inc()
+    try:
+        with telemetry.stage(
+            "generation",
+            span_name="provider.generate",
+            attributes={
+                "modeleval.provider": arm.provider,
+                "modeleval.model": arm.model_name,
+                "modeleval.task_sequence_no": task.sequence_no,
+            },
+        ) as span:
+            result = provider.generate(task_input=task_input, model_config=config)
+            set_span_attributes(
+                span,
+                **{
+                    "modeleval.usage.prompt_tokens": result.usage.prompt_tokens,
+                    "modeleval.usage.completion_tokens": result.usage.completion_tokens,
+                    "modeleval.retry_count": result.retry_count,
+                    "modeleval.error": result.error,
+                },
+            )
+    finally:
+        INFLIGHT_ATTEMPTS.dec()
+    return result
+
+
+def _execute_tasks(
+    db: Session,
+    run: Run,
+    tasks: list[TaskInstance],
+    model_arms: list[ModelArm],
+    telemetry: RunTelemetry,
+    skip: frozenset[tuple[str, str]] = frozenset(),
+) -> list[Score]:
+    # Generation runs arm by arm so each arm can use its provider's fastest path;
+    # attempts are then recorded task by task, as before.
+    results: dict[tuple[str, str], ProviderResult] = {}
+    for arm in model_arms:
+        arm_tasks = [task for task in tasks if (task.id, arm.id) not in skip]
+        if arm_tasks:
+            for task, result in zip(arm_tasks, _generate(arm, arm_tasks, telemetry)):
+                results[(task.id, arm.id)] = result
+                PROVIDER_LATENCY_SECONDS.observe(
+                    result.latency_ms / 1000.0, provider=arm.provider, model=arm.model_name
+                )
+
+    scores: list[Score] = []
+    artifact_store = get_artifact_store()
+    for task in tasks:
+        for arm in model_arms:
+            result = results.get((task.id, arm.id))
+            if result is None:
+                continue
+            attempt = Attempt(
+                run_id=run.id,
+                task_instance_id=task.id,
+                model_arm_id=arm.id,
+                raw_output=result.raw_output,
+                raw_response_digest=artifact_store.put(db, result.raw_response),
+                usage_prompt_tokens=result.usage.prompt_tokens,
+                usage_completion_tokens=result.usage.completion_tokens,
+                usage_total_tokens=result.usage.total_tokens,
+                usage_cache_read_tokens=result.usage.cache_read_tokens,
+                usage_cache_write_tokens=result.usage.cache_write_tokens,
+                latency_ms=result.latency_ms,
+                cost_usd=Decimal(str(result.cost_usd)),
+                error_message=result.error,
+            )
+            db.add(attempt)
+            db.flush()
+
+            with telemetry.stage("scoring"):
+                score = score_attempt(task, attempt)
+            db.add(score)
+            scores.append(score)
+        telemetry.task_finished()
+    return scores
+
+
+def _execute_adaptive(
+    db: Session,
+    run: Run,
+    tasks: list[TaskInstance],
+    model_arms: list[ModelArm],
+    config: AdaptiveConfig,
+    telemetry: RunTelemetry,
+) -> dict:
+    sampler = AdaptiveSampler(
+        config=config, arm_ids=[arm.id for arm in model_arms], planned_tasks=len(tasks)
+    )
+    for start in range(0, len(tasks), config.batch_size):
+        batch = tasks[start : start + config.batch_size]
+        for task in batch:
+            db.add(task)
+        db.flush()
+
+        active_ids = set(sampler.active_arm_ids)
+        active_arms = [arm for arm in model_arms if arm.id in active_ids]
+        for score in _execute_tasks(db, run, batch, active_arms, telemetry):
+            sampler.record(score.model_arm_id, metric_value(score, config.metric))
+        db.commit()
+
+        sampler.finish_batch(len(batch))
+        if sampler.stopped:
+            break
+    return sampler.summary()
+
+
+def execute_run(
+    db: Session,
+    run: Run,
+    experiment: Experiment,
+    model_arms: list[ModelArm],
+    profile: bool = False,
+    reuse: bool = True,
+    incremental: bool = False,
+) -> Run:
+    with profile_run(run.id) if profile else nullcontext():
+        return _execute_run(db, run, experiment, model_arms, reuse, incremental)
+
+
+def _execute_run(
+    db: Session,
+    run: Run,
+    experiment: Experiment,
+    model_arms: list[ModelArm],
+    reuse: bool,
+    incremental: bool,
+) -> Run:
     run.status = RunStatus.RUNNING
     run.started_at = datetime.now(timezone.utc)
     db.add(run)
     db.commit()
     db.refresh(run)
     logger.info("run_started", extra={"correlation_id": run.correlation_id})
+    telemetry = RunTelemetry(run.correlation_id)
 
-    try:
-        dataset = load_dataset(experiment.dataset_ref)
-        experiment.dataset_hash = dataset.dataset_hash
-        db.add(experiment)
-        db.commit()
-
-        tasks = plan_task_instances(experiment, run, dataset)
-        for task in tasks:
-            db.add(task)
-        db.commit()
+    with start_span(
+        "execute_run",
+        context=correlation_context(run.correlation_id),
+        attributes={
+            "modeleval.correlation_id": run.correlation_id,
+            "modeleval.run_id": run.id,
+            "modeleval.experiment_id": experiment.id,
+        },
+    ):
+        try:
+            with telemetry.stage("dataset_load"):
+                dataset = load_dataset(experiment.dataset_ref)
+            experiment.dataset_hash = dataset.dataset_hash
+            run.reuse_key = run_reuse_key(experiment, dataset.dataset_hash, run.seed)
+            run.arm_fingerprints = {arm.id: arm_fingerprint(arm) for arm in model_arms}
+            db.add(experiment)
+            db.commit()
 
-        for task in tasks:
-            task_input = _task_prompt(task.input_payload)
-            for arm in model_arms:
-                provider = get_provider(arm.provider)
-                config = {**arm.config, "model_name": arm.model_name}
-                result = provider.generate(task_input=task_input, model_config=config)
-
-                attempt = Attempt(
-                    run_id=run.id,
-                    task_instance_id=task.id,
-                    model_arm_id=arm.id,
-                    raw_output=result.raw_output,
-                    raw_response=result.raw_response,
-                    usage_prompt_tokens=result.usage.prompt_tokens,
-                    usage_completion_tokens=result.usage.completion_tokens,
-                    usage_total_tokens=result.usage.total_tokens,
-                    latency_ms=result.latency_ms,
-                    cost_usd=Decimal(str(result.cost_usd)),
-                    error_message=result.error,
+            with telemetry.stage("planning"):
+                tasks = plan_task_instances(experiment, run, dataset)
+                persist_dataset_items(db, tasks)
+            telemetry.tasks_planned(len(tasks))
+            summary_extras: dict = {}
+            if is_adaptive(experiment.sampling):
+                if incremental:
+                    raise ValueError("Incremental runs do not support adaptive sampling")
+                adaptive_config = AdaptiveConfig.from_sampling(experiment.sampling)
+                summary_extras["adaptive"] = _execute_adaptive(
+                    db, run, tasks, model_arms, adaptive_config, telemetry
                 )
-                db.add(attempt)
-                db.flush()
+            else:
+                for task in tasks:
+                    db.add(task)
+                db.commit()
 
-                scores = score_attempt(task, attempt)
-                for score in scores:
-                    db.add(score)
+                reused: set[tuple[str, str]] = set()
+                if incremental:
+                    with telemetry.stage("reuse"):
+                        reused, summary_extras["incremental"] = copy_covered_attempts(
+                            db, run, tasks, model_arms
+                        )
+                    db.commit()
+                elif reuse:
+                    with telemetry.stage("reuse"):
+                        reused, reuse_summary = copy_prior_attempts(db, run, tasks, model_arms)
+                    db.commit()
+                    if reuse_summary is not None:
+                        summary_extras["reuse"] = reuse_summary
 
-            db.commit()
+                for start in range(0, len(tasks), GENERATION_CHUNK_SIZE):
+                    chunk = tasks[start : start + GENERATION_CHUNK_SIZE]
+                    _execute_tasks(db, run, chunk, model_arms, telemetry, skip=frozenset(reused))
+                    db.commit()
 
-        aggregate_run(db, run, experiment)
-        run.completed_at = datetime.now(timezone.utc)
-        db.add(run)
-        db.commit()
-        db.refresh(run)
-        logger.info("run_completed", extra={"correlation_id": run.correlation_id})
-        return run
-    except Exception as exc:  # noqa: BLE001
-        run.status = RunStatus.FAILED
-        run.error_message = str(exc)
-        run.completed_at = datetime.now(timezone.utc)
-        db.add(run)
-        db.commit()
-        db.refresh(run)
-        logger.error("run_failed", extra={"correlation_id": run.correlation_id})
-        raise ExecutionError(str(exc)) from exc
+            if experiment.evaluator:
+                with telemetry.stage("evaluation"):
+                    summary_extras["evaluation"] = evaluate_run(
+                        db, run, EvaluatorConfig.from_dict(experiment.evaluator)
+                    )
+                db.commit()
+
+            with telemetry.stage("aggregation"):
+                summary = aggregate_run(db, run, experiment)
+            if summary_extras:
+                run.summary_json = {**summary, **summary_extras}
+            run.completed_at = datetime.now(timezone.utc)
+            db.add(run)
+            db.commit()
+            db.refresh(run)
+            telemetry.finish()
+            logger.info("run_completed", extra={"correlation_id": run.correlation_id})
+            return run
+        except Exception as exc:  # noqa: BLE001
+            run.status = RunStatus.FAILED
+            run.error_message = str(exc)
+            run.completed_at = datetime.now(timezone.utc)
+            db.add(run)
+            db.commit()
+            db.refresh(run)
+            telemetry.finish()
+            logger.error("run_failed", extra={"correlation_id": run.correlation_id})
+            raise ExecutionError(str(exc)) from exc
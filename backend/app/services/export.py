@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import enum
+import io
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import Select, and_, select
+from sqlalchemy.orm import Session
+
+from app.models.entities import Attempt, ModelArm, Score, TaskInstance
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+ARROW_FORMAT = "arrow"
+PARQUET_FORMAT = "parquet"
+EXPORT_MEDIA_TYPES = {
+    ARROW_FORMAT: "application/vnd.apache.arrow.stream",
+    PARQUET_FORMAT: "application/vnd.apache.parquet",
+}
+DEFAULT_CHUNK_SIZE = 10_000
+ENUM_COLUMNS = {"workload_type"}
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Columnar export requires the 'pyarrow' package")
+
+
+def export_schema() -> pa.Schema:
+    require_pyarrow()
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("run_id", dictionary),
+            ("experiment_id", dictionary),
+            ("attempt_id", pa.string()),
+            ("task_instance_id", pa.string()),
+            ("sequence_no", pa.int32()),
+            ("dataset_item_id", pa.string()),
+            ("workload_type", dictionary),
+            ("model_arm_id", dictionary),
+            ("provider", dictionary),
+            ("model_name", dictionary),
+            ("display_name", dictionary),
+            ("usage_prompt_tokens", pa.int64()),
+            ("usage_completion_tokens", pa.int64()),
+            ("usage_total_tokens", pa.int64()),
+            ("usage_cache_read_tokens", pa.int64()),
+            ("usage_cache_write_tokens", pa.int64()),
+            ("latency_ms", pa.int64()),
+            ("cost_usd", pa.decimal128(12, 6)),
+            ("error_message", pa.string()),
+            ("score_quality", pa.float64()),
+            ("score_passed", pa.bool_()),
+            ("score_judge", pa.float64()),
+            ("raw_output", pa.string()),
+            ("created_at", timestamp),
+        ]
+    )
+
+
+def export_statement(run_ids: Sequence[str], since: Optional[datetime] = None) -> Select:
+    score_conditions = [
+        Score.run_id == Attempt.run_id,
+        Score.task_instance_id == Attempt.task_instance_id,
+        Score.model_arm_id == Attempt.model_arm_id,
+    ]
+    if since is not None:
+        score_conditions.append(Score.created_at >= since)
+    stmt = (
+        select(
+            Attempt.run_id,
+            TaskInstance.experiment_id,
+            Attempt.id.label("attempt_id"),
+            Attempt.task_instance_id,
+            TaskInstance.sequence_no,
+            TaskInstance.dataset_item_id,
+            TaskInstance.workload_type,
+            Attempt.model_arm_id,
+            ModelArm.provider,
+            ModelArm.model_name,
+            ModelArm.display_name,
+            Attempt.usage_prompt_tokens,
+            Attempt.usage_completion_tokens,
+            Attempt.usage_total_tokens,
+            Attempt.usage_cache_read_tokens,
+            Attempt.usage_cache_write_tokens,
+            Attempt.latency_ms,
+            Attempt.cost_usd,
+            Attempt.error_message,
+            Score.quality.label("score_quality"),
+            Score.passed.label("score_passed"),
+            Score.judge_score.label("score_judge"),
+            Attempt.raw_output,
+            Attempt.created_at,
+        )
+        .join(TaskInstance, TaskInstance.id == Attempt.task_instance_id)
+        .join(ModelArm, ModelArm.id == Attempt.model_arm_id)
+        .outerjoin(Score, and_(*score_conditions))
+        .where(Attempt.run_id.in_(run_ids))
+        .order_by(Attempt.run_id, TaskInstance.sequence_no, Attempt.model_arm_id)
+    )
+    if since is not None:
+        stmt = stmt.where(Attempt.created_at >= since)
+    return stmt
+
+
+def _normalise(name: str, values: tuple) -> Sequence[Any]:
+    if name in ENUM_COLUMNS:
+        return [value.value if isinstance(value, enum.Enum) else value for value in values]
+    if name == "created_at":
+        # SQLite hands back naive datetimes; they are stored as UTC.
+        return [
+            value.replace(tzinfo=timezone.utc)
+            if isinstance(value, datetime) and value.tzinfo is None
+            else value
+            for value in values
+        ]
+    return values
+
+
+def iter_record_batches(
+    db: Session,
+    run_ids: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    since: Optional[datetime] = None,
+) -> Iterator[pa.RecordBatch]:
+    schema = export_schema()
+    # yield_per streams through a server-side cursor on PostgreSQL, so only one
+    # chunk of rows is ever materialised in Python.
+    stmt = export_statement(run_ids, since).execution_options(yield_per=chunk_size)
+    result = db.execute(stmt)
+    for rows in result.partitions():
+        arrays = [
+            pa.array(_normalise(field.name, values), type=field.type)
+            for values, field in zip(zip(*rows), schema)
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        content = b"".join(self._chunks)
+        self._chunks.clear()
+        return content
+
+
+def stream_export(
+    db: Session,
+    run_ids: Sequence[str],
+    fmt: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    since: Optional[datetime] = None,
+) -> Iterator[bytes]:
+    require_pyarrow()
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    schema = export_schema()
+    sink = _ChunkSink()
+    if fmt == ARROW_FORMAT:
+        writer = pa_ipc.new_stream(sink, schema)
+    else:
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in iter_record_batches(db, run_ids, chunk_size, since):
+            # One row group / IPC message per chunk keeps memory bounded by chunk_size.
+            writer.write_batch(batch)
+            if content := sink.drain():
+                yield content
+    finally:
+        writer.close()
+    if content := sink.drain():
+        yield content
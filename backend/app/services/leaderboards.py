@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models.entities import (
+    Experiment,
+    Run,
+    RunArmMetric,
+    RunStatus,
+    WorkloadType,
+)
+
+LEADERBOARD_METRICS = ("quality", "speed", "cost")
+
+
+def materialize_run_metrics(
+    db: Session, run: Run, experiment: Experiment, model_summaries: list[dict]
+) -> list[RunArmMetric]:
+    db.execute(delete(RunArmMetric).where(RunArmMetric.run_id == run.id))
+    rows = [
+        RunArmMetric(
+            run_id=run.id,
+            experiment_id=experiment.id,
+            model_arm_id=summary["model_arm_id"],
+            workload_type=experiment.workload_type,
+            provider=summary["provider"],
+            model_name=summary["model_name"],
+            display_name=summary["display_name"],
+            quality_avg=summary["quality_avg"],
+            pass_rate=summary["pass_rate"],
+            attempt_count=summary["attempt_count"],
+            error_count=summary["error_count"],
+            latency_p50_ms=summary["latency_p50_ms"],
+            latency_p95_ms=summary["latency_p95_ms"],
+            total_cost_usd=Decimal(str(summary["total_cost_usd"])),
+        )
+        for summary in model_summaries
+    ]
+    db.add_all(rows)
+    return rows
+
+
+def build_leaderboards(
+    db: Session,
+    experiment_id: Optional[str] = None,
+    workload_type: Optional[WorkloadType] = None,
+    run_ids: Optional[list[str]] = None,
+    include_failed: bool = False,
+    limit: int = 20,
+) -> dict[str, list[dict]]:
+    attempts = func.sum(RunArmMetric.attempt_count)
+    weighted_attempts = func.nullif(attempts, 0)
+    stmt = (
+        select(
+            RunArmMetric.provider,
+            RunArmMetric.model_name,
+            RunArmMetric.display_name,
+            func.count(RunArmMetric.run_id).label("run_count"),
+            attempts.label("attempt_count"),
+            func.sum(RunArmMetric.error_count).label("error_count"),
+            (
+                func.sum(RunArmMetric.quality_avg * RunArmMetric.attempt_count) / weighted_attempts
+            ).label("quality_avg"),
+            (
+                func.sum(RunArmMetric.pass_rate * RunArmMetric.attempt_count) / weighted_attempts
+            ).label("pass_rate"),
+            func.avg(RunArmMetric.latency_p50_ms).label("latency_p50_ms"),
+            func.avg(RunArmMetric.latency_p95_ms).label("latency_p95_ms"),
+            func.sum(RunArmMetric.total_cost_usd).label("total_cost_usd"),
+        )
+        .join(Run, Run.id == RunArmMetric.run_id)
+        .group_by(RunArmMetric.provider, RunArmMetric.model_name, RunArmMetric.display_name)
+    )
+    if experiment_id:
+        stmt = stmt.where(RunArmMetric.experiment_id == experiment_id)
+    if workload_type:
+        stmt = stmt.where(RunArmMetric.workload_type == workload_type)
+    if run_ids:
+        stmt = stmt.where(RunArmMetric.run_id.in_(run_ids))
+    if not include_failed:
+        stmt = stmt.where(Run.status == RunStatus.SUCCEEDED)
+
+    entries: list[dict] = []
+    for row in db.execute(stmt):
+        attempt_count = int(row.attempt_count or 0)
+        total_cost = float(row.total_cost_usd or 0)
+        entries.append(
+            {
+                "provider": row.provider,
+                "model_name": row.model_name,
+                "display_name": row.display_name,
+                "run_count": int(row.run_count),
+                "attempt_count": attempt_count,
+                "error_count": int(row.error_count or 0),
+                "quality_avg": float(row.quality_avg or 0.0),
+                "pass_rate": float(row.pass_rate or 0.0),
+                "latency_p50_ms": float(row.latency_p50_ms or 0.0),
+                "latency_p95_ms": float(row.latency_p95_ms or 0.0),
+                "total_cost_usd": round(total_cost, 6),
+                "cost_per_attempt_usd": (
+                    round(total_cost / attempt_count, 8) if attempt_count else 0.0
+                ),
+            }
+        )
+
+    orderings = {
+        "quality": lambda entry: (-entry["quality_avg"], entry["cost_per_attempt_usd"]),
+        "speed": lambda entry: (entry["latency_p50_ms"], -entry["quality_avg"]),
+        "cost": lambda entry: (entry["cost_per_attempt_usd"], -entry["quality_avg"]),
+    }
+    leaderboards: dict[str, list[dict]] = {}
+    for metric in LEADERBOARD_METRICS:
+        ranked = sorted(entries, key=orderings[metric])[:limit]
+        leaderboards[metric] = [
+            {**entry, "rank": rank} for rank, entry in enumerate(ranked, start=1)
+        ]
+    return leaderboards
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import argparse
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.entities import Run
+
+PARTITIONED_TABLES = ("attempts", "scores")
+ARCHIVE_SCHEMA = "archive"
+_PARTITION_RE = re.compile(r"^(?P<table>[a-z_]+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+@dataclass(frozen=True)
+class Partition:
+    table: str
+    name: str
+    month: datetime
+
+    @property
+    def upper_bound(self) -> datetime:
+        return add_months(self.month, 1)
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def parse_partition(name: str) -> Optional[Partition]:
+    match = _PARTITION_RE.match(name)
+    if match is None or match["table"] not in PARTITIONED_TABLES:
+        return None
+    month = datetime(int(match["year"]), int(match["month"]), 1, tzinfo=timezone.utc)
+    return Partition(table=match["table"], name=name, month=month)
+
+
+def run_partition_floor(run: Run) -> Optional[datetime]:
+    # Attempts and scores are always written after their run, so bounding
+    # created_at from below lets PostgreSQL prune every older monthly partition.
+    if run.created_at is None:
+        return None
+    return month_start(run.created_at)
+
+
+def is_partitioned(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _relation_exists(db: Session, name: str) -> bool:
+    return bool(db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar())
+
+
+def _range_clause(month: datetime) -> str:
+    return (
+        f"created_at >= '{month.date().isoformat()}' "
+        f"AND created_at < '{add_months(month, 1).date().isoformat()}'"
+    )
+
+
+def _stranded_months(db: Session, table: str) -> set[datetime]:
+    # Rows land in the DEFAULT partition whenever their month was not created in time.
+    default = f"{table}_default"
+    if not _relation_exists(db, default):
+        return set()
+    rows = db.execute(
+        text(
+            f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') FROM {default}"
+        )
+    ).scalars()
+    return {month_start(row.replace(tzinfo=timezone.utc)) for row in rows}
+
+
+def _create_partition(db: Session, table: str, month: datetime, stranded: bool) -> None:
+    name = partition_name(table, month)
+    default = f"{table}_default"
+    if stranded:
+        # PostgreSQL refuses to create a partition while DEFAULT holds rows in its range,
+        # so detach DEFAULT, create the month, move its rows across and re-attach it.
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    db.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.date().isoformat()}') "
+            f"TO ('{add_months(month, 1).date().isoformat()}')"
+        )
+    )
+    if stranded:
+        db.execute(
+            text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {_range_clause(month)}")
+        )
+        db.execute(text(f"DELETE FROM {default} WHERE {_range_clause(month)}"))
+        db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+
+def ensure_partitions(
+    db: Session, months_ahead: int = 3, now: Optional[datetime] = None
+) -> list[str]:
+    if not is_partitioned(db):
+        return []
+    current = month_start(now or datetime.now(timezone.utc))
+    ahead = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    created = []
+    for table in PARTITIONED_TABLES:
+        stranded = _stranded_months(db, table)
+        for month in sorted(ahead | stranded):
+            name = partition_name(table, month)
+            if month in stranded or not _relation_exists(db, name):
+                _create_partition(db, table, month, stranded=month in stranded)
+            created.append(name)
+    db.commit()
+    return created
+
+
+def list_partitions(db: Session) -> list[Partition]:
+    if not is_partitioned(db):
+        return []
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = ANY(:tables)"
+        ),
+        {"tables": list(PARTITIONED_TABLES)},
+    ).scalars()
+    partitions = [parse_partition(name) for name in rows]
+    partitions = [partition for partition in partitions if partition is not None]
+    return sorted(partitions, key=lambda partition: (partition.table, partition.month))
+
+
+def expired_partitions(
+    partitions: list[Partition], retain_months: int, now: Optional[datetime] = None
+) -> list[Partition]:
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retain_months)
+    return [partition for partition in partitions if partition.upper_bound <= cutoff]
+
+
+def apply_retention(
+    db: Session, retain_months: int, archive: bool = False, now: Optional[datetime] = None
+) -> list[str]:
+    if retain_months < 1:
+        raise ValueError("retain_months must be at least 1")
+    expired = expired_partitions(list_partitions(db), retain_months, now)
+    if archive and expired:
+        db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    for partition in expired:
+        # Detaching and dropping a partition is a catalog change, not a row-by-row DELETE.
+        db.execute(text(f"ALTER TABLE {partition.table} DETACH PARTITION {partition.name}"))
+        if archive:
+            db.execute(text(f"ALTER TABLE {partition.name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        else:
+            db.execute(text(f"DROP TABLE {partition.name}"))
+    db.commit()
+    return [partition.name for partition in expired]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from app.db.session import SessionLocal, get_engine
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Maintain attempts/scores monthly partitions.")
+    parser.add_argument("--retain-months", type=int, default=settings.retention_months)
+    parser.add_argument("--months-ahead", type=int, default=settings.partition_months_ahead)
+    parser.add_argument(
+        "--archive", action="store_true", help=f"Move expired partitions to '{ARCHIVE_SCHEMA}'."
+    )
+    args = parser.parse_args(argv)
+
+    get_engine()
+    with SessionLocal() as db:
+        for name in ensure_partitions(db, args.months_ahead):
+            print(f"ensured {name}")
+        if args.retain_months:
+            action = "archived" if args.archive else "dropped"
+            for name in apply_retention(db, args.retain_months, archive=args.archive):
+                print(f"{action} {name}")
+
+
+if __name__ == "__main__":
+    main()
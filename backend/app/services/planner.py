@@ -1,38 +1,124 @@
 from __future__ import annotations
 
+import heapq
+import math
 import random
 
-from app.models.entities import Experiment, Run, TaskInstance
-from app.services.dataset_loader import DatasetBundle
+from app.models.entities import DatasetItem, Experiment, Run, TaskInstance
+from app.services.dataset_loader import DatasetBundle, row_payloads
 
 
 SUPPORTED_WORKLOADS = {"pr_review", "ci_triage"}
+SAMPLING_STRATEGIES = {"uniform", "stratified", "weighted"}
+STRATA_ALLOCATIONS = {"proportional", "equal"}
+
+
+def _allocate_strata(buckets: dict[str, list[int]], k: int, allocation: str) -> dict[str, int]:
+    keys = sorted(buckets)
+    total = sum(len(buckets[key]) for key in keys)
+    if allocation == "equal":
+        targets = {key: k / len(keys) for key in keys}
+    else:
+        targets = {key: k * len(buckets[key]) / total for key in keys}
+
+    counts = {key: min(int(targets[key]), len(buckets[key])) for key in keys}
+    remaining = k - sum(counts.values())
+    # Largest remainder first, then spill into strata that still have rows.
+    order = sorted(keys, key=lambda key: (-(targets[key] - int(targets[key])), key))
+    while remaining > 0:
+        progressed = False
+        for key in order:
+            if remaining == 0:
+                break
+            if counts[key] < len(buckets[key]):
+                counts[key] += 1
+                remaining -= 1
+                progressed = True
+        if not progressed:
+            break
+    return counts
+
+
+def _select_stratified(
+    dataset: DatasetBundle, sampling: dict, k: int, rng: random.Random
+) -> list[int]:
+    field_path = sampling.get("stratify_by")
+    if not field_path:
+        raise ValueError("sampling.stratify_by is required for stratified sampling")
+    allocation = sampling.get("allocation", "proportional")
+    if allocation not in STRATA_ALLOCATIONS:
+        raise ValueError(f"Unsupported sampling.allocation: {allocation}")
+
+    buckets = dataset.index.strata(field_path)
+    selected: list[int] = []
+    for key, count in _allocate_strata(buckets, k, allocation).items():
+        if count:
+            selected.extend(rng.sample(buckets[key], k=count))
+    # Interleave strata so any prefix of the plan (e.g. an adaptive batch) stays representative.
+    rng.shuffle(selected)
+    return selected
+
+
+def _select_weighted(
+    dataset: DatasetBundle, sampling: dict, k: int, rng: random.Random
+) -> list[int]:
+    field_path = sampling.get("weight_by", "weight")
+    index = dataset.index
+    positive_rows = index.positive_weight_rows(field_path)
+    if positive_rows == 0:
+        raise ValueError(f"sampling.weight_by '{field_path}' has no positive weights")
+    k = min(k, positive_rows)
+
+    # Weighted sampling without replacement (Efraimidis-Spirakis): the k largest keys
+    # u ** (1 / weight) win. Keys are compared as log(u) / weight, which keeps tiny
+    # weights from underflowing to 0, and one pass costs the same however skewed the
+    # weights are.
+    keyed = (
+        (math.log(1.0 - rng.random()) / weight, row_index)
+        for row_index, weight in enumerate(index.weights(field_path))
+        if weight > 0
+    )
+    return [row_index for _, row_index in heapq.nlargest(k, keyed)]
+
+
+def select_row_indexes(dataset: DatasetBundle, sampling: dict, seed: int) -> list[int]:
+    row_count = dataset.index.row_count
+    max_tasks = min(int(sampling.get("max_tasks", row_count)), row_count)
+    strategy = sampling.get("strategy", "uniform")
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Unsupported sampling.strategy: {strategy}")
+
+    rng = random.Random(seed)
+    if strategy == "stratified":
+        return _select_stratified(dataset, sampling, max_tasks, rng)
+    if strategy == "weighted":
+        return _select_weighted(dataset, sampling, max_tasks, rng)
+    if max_tasks < row_count:
+        return rng.sample(range(row_count), k=max_tasks)
+    return list(range(row_count))
 
 
 def plan_task_instances(experiment: Experiment, run: Run, dataset: DatasetBundle) -> list[TaskInstance]:
     if experiment.workload_type.value not in SUPPORTED_WORKLOADS:
         raise ValueError(f"Unsupported workload_type: {experiment.workload_type.value}")
 
-    max_tasks = int(experiment.sampling.get("max_tasks", len(dataset.rows)))
-    max_tasks = min(max_tasks, len(dataset.rows))
-    rng = random.Random(run.seed)
-    candidate_indexes = list(range(len(dataset.rows)))
-    if max_tasks < len(candidate_indexes):
-        selected_indexes = rng.sample(candidate_indexes, k=max_tasks)
-    else:
-        selected_indexes = candidate_indexes
+    selected_indexes = select_row_indexes(dataset, experiment.sampling, run.seed)
 
     tasks: list[TaskInstance] = []
     for sequence_no, row_index in enumerate(selected_indexes, start=1):
         row = dataset.rows[row_index]
+        input_payload, expected_payload = row_payloads(row)
+        digest = dataset.row_digests[row_index]
         task = TaskInstance(
             run_id=run.id,
             experiment_id=experiment.id,
             sequence_no=sequence_no,
             dataset_item_id=str(row.get("id", f"row-{row_index}")),
+            dataset_item_digest=digest,
             workload_type=experiment.workload_type,
-            input_payload=row.get("input", {}),
-            expected_payload=row.get("expected", {}),
+            dataset_item=DatasetItem(
+                digest=digest, input_payload=input_payload, expected_payload=expected_payload
+            ),
         )
         tasks.append(task)
 
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import get_settings
+
+CPU_STATS_ARTIFACT = "cpu.pstats"
+CPU_REPORT_ARTIFACT = "cpu.txt"
+ALLOCATION_SNAPSHOT_ARTIFACT = "allocations.snapshot"
+ALLOCATION_REPORT_ARTIFACT = "allocations.txt"
+METADATA_ARTIFACT = "profile.json"
+
+PROFILE_ARTIFACTS = {
+    CPU_STATS_ARTIFACT: "application/octet-stream",
+    CPU_REPORT_ARTIFACT: "text/plain",
+    ALLOCATION_SNAPSHOT_ARTIFACT: "application/octet-stream",
+    ALLOCATION_REPORT_ARTIFACT: "text/plain",
+    METADATA_ARTIFACT: "application/json",
+}
+
+# tracemalloc and the CPU profiler are process-wide, so only one run is profiled at a time.
+_profiling_lock = threading.Lock()
+
+# cProfile only instruments the thread that enables it. Work a profiled run hands to other
+# threads (the async generation loop, judge workers) records its own profile here, and the
+# profiles are merged into the run's CPU report.
+_worker_profilers: Optional[list[cProfile.Profile]] = None
+_worker_profilers_lock = threading.Lock()
+
+
+class ProfilingBusyError(RuntimeError):
+    pass
+
+
+def profiling_active() -> bool:
+    return _profiling_lock.locked()
+
+
+@contextmanager
+def profile_worker() -> Iterator[None]:
+    # A thread that already has a profiler (the run's own thread) is counted once.
+    if _worker_profilers is None or sys.getprofile() is not None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with _worker_profilers_lock:
+            if _worker_profilers is not None:
+                _worker_profilers.append(profiler)
+
+
+def run_profile_dir(run_id: str) -> Path:
+    return Path(get_settings().profile_root) / run_id
+
+
+def _write_cpu_report(
+    profiler: cProfile.Profile, workers: list[cProfile.Profile], directory: Path, top_n: int
+) -> None:
+    buffer = io.StringIO()
+    buffer.write(
+        f"CPU profile merged from {len(workers) + 1} thread profiles "
+        f"(run thread + {len(workers)} generation/judge worker profiles)\n"
+    )
+    stats = pstats.Stats(profiler, *workers, stream=buffer)
+    stats.dump_stats(str(directory / CPU_STATS_ARTIFACT))
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top_n)
+    (directory / CPU_REPORT_ARTIFACT).write_text(buffer.getvalue(), encoding="utf-8")
+
+
+def _write_allocation_report(
+    baseline: tracemalloc.Snapshot, snapshot: tracemalloc.Snapshot, directory: Path, top_n: int
+) -> None:
+    snapshot.dump(str(directory / ALLOCATION_SNAPSHOT_ARTIFACT))
+    lines = [f"Top {top_n} allocation sites retained during the run (by size delta):"]
+    for stat in snapshot.compare_to(baseline, "lineno")[:top_n]:
+        lines.append(str(stat))
+    lines.append("")
+    lines.append(f"Top {top_n} allocation sites by total size:")
+    for stat in snapshot.statistics("lineno")[:top_n]:
+        lines.append(str(stat))
+    (directory / ALLOCATION_REPORT_ARTIFACT).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@contextmanager
+def profile_run(run_id: str, top_n: int = 50) -> Iterator[None]:
+    if not _profiling_lock.acquire(blocking=False):
+        raise ProfilingBusyError("Another profiled run is in progress; retry when it finishes")
+    try:
+        with _profile(run_id, top_n):
+            yield
+    finally:
+        _profiling_lock.release()
+
+
+@contextmanager
+def _profile(run_id: str, top_n: int) -> Iterator[None]:
+    directory = run_profile_dir(run_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(get_settings().profile_traceback_frames)
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.take_snapshot()
+    global _worker_profilers
+    workers: list[cProfile.Profile] = []
+    _worker_profilers = workers
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with _worker_profilers_lock:
+            _worker_profilers = None
+        wall_seconds = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot()
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+
+        _write_cpu_report(profiler, workers, directory, top_n)
+        _write_allocation_report(baseline, snapshot, directory, top_n)
+        metadata = {
+            "run_id": run_id,
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "wall_seconds": round(wall_seconds, 4),
+            "traced_current_bytes": current_bytes,
+            "traced_peak_bytes": peak_bytes,
+            "worker_profiles": len(workers),
+        }
+        (directory / METADATA_ARTIFACT).write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+
+def list_profile_artifacts(run_id: str) -> list[dict]:
+    directory = run_profile_dir(run_id)
+    artifacts = []
+    for name, media_type in PROFILE_ARTIFACTS.items():
+        path = directory / name
+        if path.exists():
+            artifacts.append(
+                {"name": name, "media_type": media_type, "size_bytes": path.stat().st_size}
+            )
+    return artifacts
+
+
+def profile_artifact_path(run_id: str, name: str) -> Optional[Path]:
+    if name not in PROFILE_ARTIFACTS:
+        return None
+    path = run_profile_dir(run_id) / name
+    return path if path.exists() else None
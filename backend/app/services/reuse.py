@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.entities import (
+    Attempt,
+    Experiment,
+    ModelArm,
+    Run,
+    RunStatus,
+    Score,
+    TaskInstance,
+)
+from app.services.artifact_store import canonical_bytes
+from app.services.partitions import run_partition_floor
+
+# Only the most recent matching runs are considered as sources.
+MAX_SOURCE_RUNS = 5
+MAX_INCREMENTAL_SOURCE_RUNS = 20
+LOOKUP_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class ReuseSource:
+    run: Run
+    model_arm_id: str
+
+
+def fingerprint(provider: str, model_name: str, config: dict) -> str:
+    payload = {"provider": provider, "model_name": model_name, "config": config}
+    return hashlib.sha256(canonical_bytes(payload)).hexdigest()
+
+
+def arm_fingerprint(arm: ModelArm) -> str:
+    return fingerprint(arm.provider, arm.model_name, arm.config or {})
+
+
+def run_reuse_key(experiment: Experiment, dataset_hash: str, seed: int) -> str:
+    # Everything the planner depends on: equal keys mean identical task plans.
+    payload = {
+        "dataset_hash": dataset_hash,
+        "seed": seed,
+        "sampling": experiment.sampling,
+        "workload_type": experiment.workload_type.value,
+    }
+    return hashlib.sha256(canonical_bytes(payload)).hexdigest()
+
+
+def find_reuse_sources(db: Session, run: Run, model_arms: list[ModelArm]) -> dict[str, ReuseSource]:
+    if run.reuse_key is None:
+        return {}
+    candidates = db.scalars(
+        select(Run)
+        .where(
+            Run.reuse_key == run.reuse_key,
+            Run.status == RunStatus.SUCCEEDED,
+            Run.id != run.id,
+        )
+        .order_by(Run.completed_at.desc())
+        .limit(MAX_SOURCE_RUNS)
+    ).all()
+
+    sources: dict[str, ReuseSource] = {}
+    for arm in model_arms:
+        wanted = arm_fingerprint(arm)
+        for candidate in candidates:
+            recorded = candidate.arm_fingerprints or {}
+            by_fingerprint = {value: key for key, value in recorded.items()}
+            if wanted in by_fingerprint:
+                sources[arm.id] = ReuseSource(run=candidate, model_arm_id=by_fingerprint[wanted])
+                break
+    return sources
+
+
+def _copyable_attempts(*criteria):
+    # Attempts joined to their task and score; failed attempts are retried, never copied.
+    return (
+        select(
+            Attempt.run_id,
+            Attempt.model_arm_id,
+            Attempt.raw_output,
+            Attempt.raw_response_digest,
+            Attempt.usage_prompt_tokens,
+            Attempt.usage_completion_tokens,
+            Attempt.usage_total_tokens,
+            Attempt.usage_cache_read_tokens,
+            Attempt.usage_cache_write_tokens,
+            Attempt.latency_ms,
+            Attempt.cost_usd,
+            TaskInstance.sequence_no,
+            TaskInstance.dataset_item_digest,
+            Score.quality,
+            Score.passed,
+        )
+        .join(TaskInstance, TaskInstance.id == Attempt.task_instance_id)
+        .join(
+            Score,
+            and_(
+                Score.run_id == Attempt.run_id,
+                Score.task_instance_id == Attempt.task_instance_id,
+                Score.model_arm_id == Attempt.model_arm_id,
+            ),
+        )
+        .where(Attempt.error_message.is_(None), *criteria)
+    )
+
+
+def _since(stmt, floor: Optional[datetime]):
+    if floor is None:
+        return stmt
+    return stmt.where(Attempt.created_at >= floor, Score.created_at >= floor)
+
+
+def _copied_rows(run: Run, task: TaskInstance, arm_id: str, row) -> tuple[dict, dict]:
+    attempt = {
+        "id": str(uuid.uuid4()),
+        "run_id": run.id,
+        "task_instance_id": task.id,
+        "model_arm_id": arm_id,
+        "raw_output": row.raw_output,
+        "raw_response_digest": row.raw_response_digest,
+        "usage_prompt_tokens": row.usage_prompt_tokens,
+        "usage_completion_tokens": row.usage_completion_tokens,
+        "usage_total_tokens": row.usage_total_tokens,
+        "usage_cache_read_tokens": row.usage_cache_read_tokens,
+        "usage_cache_write_tokens": row.usage_cache_write_tokens,
+        "latency_ms": row.latency_ms,
+        "cost_usd": row.cost_usd,
+    }
+    score = {
+        "id": str(uuid.uuid4()),
+        "run_id": run.id,
+        "task_instance_id": task.id,
+        "model_arm_id": arm_id,
+        "quality": row.quality,
+        "passed": row.passed,
+    }
+    return attempt, score
+
+
+def _insert_copies(db: Session, attempts: list[dict], scores: list[dict]) -> None:
+    if attempts:
+        db.execute(insert(Attempt), attempts)
+        db.execute(insert(Score), scores)
+
+
+def copy_prior_attempts(
+    db: Session, run: Run, tasks: list[TaskInstance], model_arms: list[ModelArm]
+) -> tuple[set[tuple[str, str]], Optional[dict]]:
+    # Returns the reused (task_instance_id, model_arm_id) pairs plus a run summary
+    # entry, or None when no arm had a matching earlier run.
+    sources = find_reuse_sources(db, run, model_arms)
+    tasks_by_sequence = {task.sequence_no: task for task in tasks}
+    reused: set[tuple[str, str]] = set()
+    arms: dict[str, dict] = {}
+
+    for arm_id, source in sources.items():
+        attempts: list[dict] = []
+        scores: list[dict] = []
+        stmt = _copyable_attempts(
+            Attempt.run_id == source.run.id, Attempt.model_arm_id == source.model_arm_id
+        )
+        for row in db.execute(_since(stmt, run_partition_floor(source.run))):
+            task = tasks_by_sequence.get(row.sequence_no)
+            if task is None or task.dataset_item_digest != row.dataset_item_digest:
+                continue
+            attempt, score = _copied_rows(run, task, arm_id, row)
+            attempts.append(attempt)
+            scores.append(score)
+            reused.add((task.id, arm_id))
+        if not attempts:
+            continue
+        _insert_copies(db, attempts, scores)
+        arms[arm_id] = {"source_run_id": source.run.id, "attempts": len(attempts)}
+
+    if not arms:
+        return reused, None
+    return reused, {"reused_attempts": len(reused), "arms": arms}
+
+
+def copy_covered_attempts(
+    db: Session, run: Run, tasks: list[TaskInstance], model_arms: list[ModelArm]
+) -> tuple[set[tuple[str, str]], dict]:
+    # Incremental runs: any row an earlier run of this experiment already evaluated
+    # with the same arm fingerprint is copied, whatever its position in that run's
+    # plan, so a grown dataset only costs provider calls for its new rows.
+    candidates = db.scalars(
+        select(Run)
+        .where(
+            Run.experiment_id == run.experiment_id,
+            Run.status == RunStatus.SUCCEEDED,
+            Run.id != run.id,
+            Run.arm_fingerprints.is_not(None),
+        )
+        .order_by(Run.completed_at.desc())
+        .limit(MAX_INCREMENTAL_SOURCE_RUNS)
+    ).all()
+    arms_by_fingerprint: dict[str, list[ModelArm]] = {}
+    for arm in model_arms:
+        arms_by_fingerprint.setdefault(arm_fingerprint(arm), []).append(arm)
+    source_arms: dict[tuple[str, str], str] = {}
+    for candidate in candidates:
+        for arm_id, value in (candidate.arm_fingerprints or {}).items():
+            if value in arms_by_fingerprint:
+                source_arms[(candidate.id, arm_id)] = value
+
+    tasks_by_digest: dict[str, list[TaskInstance]] = {}
+    for task in tasks:
+        tasks_by_digest.setdefault(task.dataset_item_digest, []).append(task)
+
+    # Newest run wins when several earlier runs covered the same row.
+    rank = {candidate.id: index for index, candidate in enumerate(candidates)}
+    covered: dict[tuple[str, str], tuple[int, object]] = {}
+    if source_arms:
+        floors = [floor for item in candidates if (floor := run_partition_floor(item)) is not None]
+        run_ids = list({key[0] for key in source_arms})
+        arm_ids = list({key[1] for key in source_arms})
+        digests = list(tasks_by_digest)
+        for start in range(0, len(digests), LOOKUP_CHUNK_SIZE):
+            stmt = _copyable_attempts(
+                Attempt.run_id.in_(run_ids),
+                Attempt.model_arm_id.in_(arm_ids),
+                TaskInstance.dataset_item_digest.in_(digests[start : start + LOOKUP_CHUNK_SIZE]),
+            )
+            for row in db.execute(_since(stmt, min(floors, default=None))):
+                value = source_arms.get((row.run_id, row.model_arm_id))
+                if value is None:
+                    continue
+                key = (row.dataset_item_digest, value)
+                if key not in covered or rank[row.run_id] < covered[key][0]:
+                    covered[key] = (rank[row.run_id], row)
+
+    attempts: list[dict] = []
+    scores: list[dict] = []
+    source_run_ids: set[str] = set()
+    reused: set[tuple[str, str]] = set()
+    for (digest, value), (_, row) in covered.items():
+        for arm in arms_by_fingerprint[value]:
+            for task in tasks_by_digest[digest]:
+                attempt, score = _copied_rows(run, task, arm.id, row)
+                attempts.append(attempt)
+                scores.append(score)
+                reused.add((task.id, arm.id))
+        source_run_ids.add(row.run_id)
+    _insert_copies(db, attempts, scores)
+
+    return reused, {
+        "covered_attempts": len(reused),
+        "new_attempts": len(tasks) * len(model_arms) - len(reused),
+        "source_run_ids": [item.id for item in candidates if item.id in source_run_ids],
+    }
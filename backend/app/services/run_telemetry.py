@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from app.core.metrics import PENDING_TASKS, RUN_STAGE_SECONDS
+from app.core.tracing import start_span
+
+logger = logging.getLogger("modeleval.execution")
+
+RUN_STAGES = (
+    "dataset_load",
+    "planning",
+    "reuse",
+    "generation",
+    "scoring",
+    "evaluation",
+    "aggregation",
+)
+
+
+class RunTelemetry:
+    def __init__(self, correlation_id: str) -> None:
+        self.correlation_id = correlation_id
+        self.durations: dict[str, float] = defaultdict(float)
+        self._pending_tasks = 0
+
+    @contextmanager
+    def stage(
+        self, name: str, span_name: Optional[str] = None, attributes: Optional[dict] = None
+    ) -> Iterator[Any]:
+        started = time.perf_counter()
+        span_attributes = {"modeleval.correlation_id": self.correlation_id, "modeleval.stage": name}
+        if attributes:
+            span_attributes.update(attributes)
+        try:
+            with start_span(span_name or f"run.{name}", attributes=span_attributes) as span:
+                yield span
+        finally:
+            self.durations[name] += time.perf_counter() - started
+
+    def tasks_planned(self, count: int) -> None:
+        self._pending_tasks += count
+        PENDING_TASKS.inc(count)
+
+    def task_finished(self) -> None:
+        if self._pending_tasks > 0:
+            self._pending_tasks -= 1
+            PENDING_TASKS.dec()
+
+    def finish(self) -> dict[str, float]:
+        if self._pending_tasks:
+            PENDING_TASKS.dec(self._pending_tasks)
+            self._pending_tasks = 0
+        for stage in RUN_STAGES:
+            if stage not in self.durations:
+                continue
+            duration = self.durations[stage]
+            RUN_STAGE_SECONDS.observe(duration, stage=stage)
+            logger.info(
+                "run_stage_completed",
+                extra={
+                    "correlation_id": self.correlation_id,
+                    "stage": stage,
+                    "duration_ms": round(duration * 1000, 3),
+                },
+            )
+        return dict(self.durations)
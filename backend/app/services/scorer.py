@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 import re
+from typing import Optional
 
+from sqlalchemy import ColumnElement, case
+
+from app.core.metrics import SCORING_SECONDS
 from app.models.entities import Attempt, Score, TaskInstance
 
 
 WORD_RE = re.compile(r"\w+")
+PASS_THRESHOLD = 0.6
+# Metrics computed inline by score_attempt; the judge metric is filled in later
+# by the evaluator stage and may be missing.
+SCORE_METRICS = ("quality", "pass")
+JUDGE_METRIC = "judge"
+COMPARISON_METRICS = (*SCORE_METRICS, JUDGE_METRIC)
 
 
 def _as_string(payload: dict | str | list) -> str:
@@ -33,10 +43,28 @@ def _token_overlap(output: str, expected_terms: list[str]) -> float:
     return hits / len(expected_tokens)
 
 
-def score_attempt(task: TaskInstance, attempt: Attempt) -> list[Score]:
-    output_text = attempt.raw_output or ""
-    expected_payload = task.expected_payload
+def metric_value(score: Score, metric: str) -> Optional[float]:
+    if metric == "quality":
+        return score.quality
+    if metric == "pass":
+        return 1.0 if score.passed else 0.0
+    if metric == JUDGE_METRIC:
+        return score.judge_score
+    raise ValueError(f"Unknown score metric: {metric}")
+
+
+def metric_column(metric: str) -> ColumnElement[float]:
+    if metric == "quality":
+        return Score.quality
+    if metric == "pass":
+        return case((Score.passed, 1.0), else_=0.0)
+    if metric == JUDGE_METRIC:
+        return Score.judge_score
+    raise ValueError(f"Unknown score metric: {metric}")
 
+
+def expected_terms_for(task: TaskInstance) -> list[str]:
+    expected_payload = task.expected_payload
     expected_terms: list[str] = []
     if isinstance(expected_payload, dict):
         keywords = expected_payload.get("keywords")
@@ -48,24 +76,29 @@ def score_attempt(task: TaskInstance, attempt: Attempt) -> list[Score]:
             expected_terms.append(str(expected_label))
     else:
         expected_terms.append(_as_string(expected_payload))
+    return expected_terms
 
-    quality = _token_overlap(output_text, expected_terms)
-    pass_value = 1.0 if quality >= 0.6 and attempt.error_message is None else 0.0
 
-    quality_score = Score(
-        run_id=attempt.run_id,
-        task_instance_id=attempt.task_instance_id,
-        model_arm_id=attempt.model_arm_id,
-        metric_name="quality",
-        value=quality,
-        details={"expected_terms": expected_terms},
-    )
-    pass_score = Score(
+def score_attempt(task: TaskInstance, attempt: Attempt) -> Score:
+    with SCORING_SECONDS.time():
+        return _score_attempt(task, attempt)
+
+
+def _score_attempt(task: TaskInstance, attempt: Attempt) -> Score:
+    # Scoring inputs depend only on the dataset row, so they are recorded once per item.
+    item = task.dataset_item
+    if item.scoring_details is None:
+        item.scoring_details = {
+            "expected_terms": expected_terms_for(task),
+            "pass_threshold": PASS_THRESHOLD,
+        }
+    expected_terms = item.scoring_details["expected_terms"]
+
+    quality = _token_overlap(attempt.raw_output or "", expected_terms)
+    return Score(
         run_id=attempt.run_id,
         task_instance_id=attempt.task_instance_id,
         model_arm_id=attempt.model_arm_id,
-        metric_name="pass",
-        value=pass_value,
-        details={"threshold": 0.6},
+        quality=quality,
+        passed=quality >= PASS_THRESHOLD and attempt.error_message is None,
     )
-    return [quality_score, pass_score]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import get_settings
+
+RUN_VIEW = "run"
+SUMMARY_VIEW = "summary"
+CACHED_VIEWS = (RUN_VIEW, SUMMARY_VIEW)
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes
+    etag: str
+
+
+def compute_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class SummaryCache(ABC):
+    @abstractmethod
+    def get(self, run_id: str, view: str) -> Optional[CachedPayload]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, run_id: str, view: str, payload: CachedPayload) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self, run_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemorySummaryCache(SummaryCache):
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple[str, str], CachedPayload] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, run_id: str, view: str) -> Optional[CachedPayload]:
+        key = (run_id, view)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, run_id: str, view: str, payload: CachedPayload) -> None:
+        key = (run_id, view)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, run_id: str) -> None:
+        with self._lock:
+            for view in CACHED_VIEWS:
+                self._entries.pop((run_id, view), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisSummaryCache(SummaryCache):
+    def __init__(
+        self, url: str, ttl_seconds: int = 3600, key_prefix: str = "modeleval:summary"
+    ) -> None:
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("summary_cache_redis_url requires the 'redis' package") from exc
+        self._client = redis.Redis.from_url(url)
+        self._ttl_seconds = ttl_seconds
+        self._key_prefix = key_prefix
+
+    def _key(self, run_id: str, view: str) -> str:
+        return f"{self._key_prefix}:{run_id}:{view}"
+
+    def get(self, run_id: str, view: str) -> Optional[CachedPayload]:
+        raw = self._client.get(self._key(run_id, view))
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b"\n")
+        return CachedPayload(body=body, etag=etag.decode("ascii"))
+
+    def set(self, run_id: str, view: str, payload: CachedPayload) -> None:
+        raw = payload.etag.encode("ascii") + b"\n" + payload.body
+        self._client.set(self._key(run_id, view), raw, ex=self._ttl_seconds)
+
+    def invalidate(self, run_id: str) -> None:
+        self._client.delete(*(self._key(run_id, view) for view in CACHED_VIEWS))
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=f"{self._key_prefix}:*"):
+            self._client.delete(key)
+
+
+@lru_cache
+def get_summary_cache() -> SummaryCache:
+    settings = get_settings()
+    if settings.summary_cache_redis_url:
+        return RedisSummaryCache(
+            settings.summary_cache_redis_url, ttl_seconds=settings.summary_cache_ttl_seconds
+        )
+    return InMemorySummaryCache(max_entries=settings.summary_cache_max_entries)
@@ -0,0 +1,92 @@
+"""API cold-start benchmark: import time of app.main.
+
+Imports the module in fresh interpreters with ``python -X importtime`` and
+reports, as JSON, the best cumulative import time, the slowest top-level
+packages and whether any deferred module (provider SDKs, DB drivers) was
+loaded eagerly.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module app.main --repeats 5 --output imports.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+# Loaded on first provider call or in the app lifespan, never by importing the app.
+DEFERRED_MODULES = ("openai", "anthropic", "psycopg", "tiktoken")
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    # Cumulative microseconds per module, as printed by -X importtime.
+    cumulative: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def measure(module: str = "app.main") -> tuple[dict[str, int], list[str]]:
+    env = {**os.environ, "MODELEVAL_SKIP_STARTUP_DB_CHECK": "1"}
+    # importtime also lists failed optional imports, so loaded modules come from sys.modules.
+    code = (
+        f"import json, sys, {module}; "
+        f"print(json.dumps([name for name in {DEFERRED_MODULES!r} if name in sys.modules]))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr), json.loads(completed.stdout)
+
+
+def run_benchmark(module: str = "app.main", repeats: int = 3, top: int = 10) -> dict:
+    runs = [measure(module) for _ in range(repeats)]
+    best, eager = min(runs, key=lambda run: run[0][module])
+    packages: dict[str, int] = defaultdict(int)
+    for name, cumulative_us in best.items():
+        if "." not in name:
+            packages[name] = max(packages[name], cumulative_us)
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "python": sys.version.split()[0],
+        "import_seconds": round(best[module] / 1_000_000, 4),
+        "slowest_packages": {name: round(us / 1_000_000, 4) for name, us in slowest},
+        "eager_deferred_modules": sorted(eager),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.module, args.repeats)
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
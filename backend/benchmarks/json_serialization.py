@@ -0,0 +1,224 @@
+"""JSON serialization benchmark: stdlib json and Pydantic vs orjson.
+
+Loads synthetic attempts for one run into SQLite and reports, as JSON, the time
+to build the GET /runs/{id}/attempts body three ways: stdlib json over
+jsonable_encoder, the previous ORM + AttemptResponse path, and the current
+row + orjson path. Log line formatting and JSON column round trips are timed
+with both encoders as well.
+
+    python -m benchmarks.json_serialization --attempts 10000
+    python -m benchmarks.json_serialization --attempts 10000 --output json.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.api.runs import list_attempts
+from app.core.logging import JsonLogFormatter
+from app.core.serialization import dumps_str, loads
+from app.db.base import Base
+from app.db.session import JSON_ENGINE_OPTIONS
+from app.models.entities import Attempt, Run
+from app.schemas.runs import AttemptResponse
+
+ATTEMPT_LIST = TypeAdapter(list[AttemptResponse])
+
+
+def _best_of(repeats: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _load(session: Session, attempts: int, seed: int) -> str:
+    rng = random.Random(seed)
+    run = Run(experiment_id=str(uuid.uuid4()), seed=seed, failure_threshold=0.5)
+    session.add(run)
+    session.flush()
+    arm_ids = [str(uuid.uuid4()) for _ in range(2)]
+    started = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "run_id": run.id,
+            "task_instance_id": str(uuid.uuid4()),
+            "model_arm_id": arm_ids[index % 2],
+            "raw_output": f"mock-response:{rng.getrandbits(32):08x}: " + "review " * 30,
+            "raw_response_digest": f"{rng.getrandbits(256):064x}",
+            "usage_prompt_tokens": rng.randint(50, 500),
+            "usage_completion_tokens": rng.randint(20, 300),
+            "usage_total_tokens": rng.randint(70, 800),
+            "latency_ms": rng.randint(100, 3000),
+            "cost_usd": Decimal(f"{rng.random() / 100:.6f}"),
+            "created_at": started + timedelta(milliseconds=index),
+        }
+        for index in range(attempts)
+    ]
+    session.execute(insert(Attempt), rows)
+    session.commit()
+    return run.id
+
+
+def _stdlib_body(session: Session, run_id: str) -> bytes:
+    attempts = session.scalars(select(Attempt).where(Attempt.run_id == run_id)).all()
+    models = [AttemptResponse.model_validate(attempt) for attempt in attempts]
+    return json.dumps(jsonable_encoder(models)).encode("utf-8")
+
+
+def _pydantic_body(session: Session, run_id: str) -> bytes:
+    # The route before orjson: ORM objects validated into AttemptResponse, then
+    # FastAPI's response_model validation and pydantic-core dump.
+    attempts = session.scalars(select(Attempt).where(Attempt.run_id == run_id)).all()
+    models = [AttemptResponse.model_validate(attempt) for attempt in attempts]
+    return ATTEMPT_LIST.dump_json(ATTEMPT_LIST.validate_python(models))
+
+
+def _orjson_body(session: Session, run_id: str) -> bytes:
+    return list_attempts(run_id, model_arm_id=None, fields=None, db=session).body
+
+
+def _log_records(count: int) -> list[logging.LogRecord]:
+    records = []
+    for index in range(count):
+        record = logging.LogRecord(
+            "modeleval.execution", logging.INFO, __file__, 0, "run_completed", None, None
+        )
+        record.correlation_id = str(uuid.uuid4())
+        record.stage = "generation"
+        record.duration_ms = index * 0.5
+        records.append(record)
+    return records
+
+
+def _format_stdlib(records: list[logging.LogRecord]) -> None:
+    for record in records:
+        payload = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": record.correlation_id,
+            "stage": record.stage,
+            "duration_ms": record.duration_ms,
+        }
+        json.dumps(payload)
+
+
+def _format_orjson(records: list[logging.LogRecord]) -> None:
+    formatter = JsonLogFormatter()
+    for record in records:
+        formatter.format(record)
+
+
+def _summary_payload(arms: int) -> dict:
+    return {
+        "run_id": str(uuid.uuid4()),
+        "models": [
+            {
+                "model_arm_id": str(uuid.uuid4()),
+                "display_name": f"arm-{index}",
+                "quality_avg": 0.5 + index / 100,
+                "pass_rate": 0.75,
+                "latency_p50_ms": 812.0,
+                "latency_p95_ms": 2410.0,
+                "total_cost_usd": 1.234567,
+            }
+            for index in range(arms)
+        ],
+        "failure_ratio": 0.01,
+        "total_attempts": 10_000,
+    }
+
+
+def run_benchmark(
+    attempts: int, seed: int = 42, repeats: int = 5, workdir: Optional[Path] = None
+) -> dict:
+    database_path = (workdir or Path(tempfile.mkdtemp())) / "json-serialization.db"
+    database_path.unlink(missing_ok=True)
+    engine = create_engine(
+        f"sqlite+pysqlite:///{database_path}", future=True, **JSON_ENGINE_OPTIONS
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        run_id = _load(session, attempts, seed)
+        # The three bodies must agree before their timings mean anything.
+        bodies = [fn(session, run_id) for fn in (_stdlib_body, _pydantic_body, _orjson_body)]
+        if len({json.dumps(json.loads(body), sort_keys=True) for body in bodies}) != 1:
+            raise RuntimeError("serializers disagree on the list_attempts body")
+        response = {
+            name: round(_best_of(repeats, fn, session, run_id), 5)
+            for name, fn in (
+                ("stdlib_seconds", _stdlib_body),
+                ("pydantic_seconds", _pydantic_body),
+                ("orjson_seconds", _orjson_body),
+            )
+        }
+    engine.dispose()
+
+    records = _log_records(attempts)
+    summaries = [_summary_payload(8) for _ in range(1_000)]
+    logs = {
+        "stdlib_seconds": round(_best_of(repeats, _format_stdlib, records), 5),
+        "orjson_seconds": round(_best_of(repeats, _format_orjson, records), 5),
+    }
+    columns = {
+        "stdlib_seconds": round(
+            _best_of(repeats, lambda: [json.loads(json.dumps(item)) for item in summaries]), 5
+        ),
+        "orjson_seconds": round(
+            _best_of(repeats, lambda: [loads(dumps_str(item)) for item in summaries]), 5
+        ),
+    }
+    return {
+        "attempts": attempts,
+        "response_bytes": len(bodies[-1]),
+        "list_attempts": {
+            **response,
+            "speedup_vs_pydantic": round(
+                response["pydantic_seconds"] / response["orjson_seconds"], 2
+            ),
+        },
+        "log_lines": logs,
+        "json_columns": {**columns, "payloads": len(summaries)},
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--attempts", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.attempts, args.seed, repeats=args.repeats)
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
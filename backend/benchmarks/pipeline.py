@@ -0,0 +1,254 @@
+"""End-to-end pipeline throughput benchmark.
+
+Runs execute_run against synthetic datasets on a real database and reports
+attempts/second, statements per attempt, aggregation time and peak RSS as JSON.
+
+    python -m benchmarks.pipeline --sizes 100,1000,10000 --output bench.json
+    python -m benchmarks.pipeline --database-url postgresql+psycopg://... --latency-ms 20
+
+Each scenario drops and recreates the schema, so point --database-url at a
+scratch database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.session import JSON_ENGINE_OPTIONS
+from app.models.entities import (
+    Experiment,
+    ModelArm,
+    Organization,
+    ProviderType,
+    Run,
+    WorkloadType,
+)
+from app.services.aggregator import aggregate_run
+from app.services.execution import execute_run
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+
+
+@dataclass
+class Scenario:
+    database_url: str
+    attempts: int
+    arms: int = 2
+    latency_ms: float = 0.0
+    latency_distribution: str = "lognormal"
+    error_rate: float = 0.0
+    completion_tokens: int = 0
+    seed: int = 42
+
+
+def _write_dataset(root: Path, task_count: int) -> str:
+    dataset_ref = f"bench/{task_count}.jsonl"
+    path = root / dataset_ref
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        labels = ("test_failure", "type_failure", "lint_failure", "infra_failure")
+        with path.open("w", encoding="utf-8") as handle:
+            for index in range(task_count):
+                label = labels[index % len(labels)]
+                prompt = f"CI failed in job {index}: classify {label} and suggest a fix."
+                row = {
+                    "id": f"bench-{index}",
+                    "input": {"prompt": prompt},
+                    "expected": {"label": label, "keywords": [label, "fix"]},
+                }
+                handle.write(json.dumps(row) + "\n")
+    return dataset_ref
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(scenario: Scenario, dataset_dir: Path) -> dict:
+    task_count = math.ceil(scenario.attempts / scenario.arms)
+    get_settings().dataset_root = str(dataset_dir)
+    dataset_ref = _write_dataset(dataset_dir, task_count)
+
+    engine = create_engine(scenario.database_url, future=True, **JSON_ENGINE_OPTIONS)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(*_args, **_kwargs) -> None:
+        statements["count"] += 1
+
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    with session_factory() as db:
+        organization = Organization(name="bench")
+        db.add(organization)
+        db.flush()
+        experiment = Experiment(
+            organization_id=organization.id,
+            name=f"bench-{scenario.attempts}",
+            workload_type=WorkloadType.CI_TRIAGE,
+            dataset_ref=dataset_ref,
+            sampling={"max_tasks": task_count},
+            budget_usd=Decimal("1000"),
+            seed=scenario.seed,
+        )
+        db.add(experiment)
+        db.flush()
+        arms = []
+        for arm_index in range(scenario.arms):
+            config = {
+                "input_cost_per_1k": 0.001,
+                "output_cost_per_1k": 0.002,
+                "mock_latency_ms": scenario.latency_ms,
+                "mock_latency_distribution": scenario.latency_distribution,
+                "mock_error_rate": scenario.error_rate,
+                "mock_seed": scenario.seed,
+            }
+            if scenario.completion_tokens:
+                config["mock_completion_tokens"] = scenario.completion_tokens
+            arm = ModelArm(
+                experiment_id=experiment.id,
+                provider=ProviderType.MOCK,
+                model_name=f"mock-{arm_index}",
+                display_name=f"Mock {arm_index}",
+                config=config,
+            )
+            db.add(arm)
+            arms.append(arm)
+        run = Run(experiment_id=experiment.id, seed=scenario.seed, failure_threshold=1.0)
+        db.add(run)
+        db.commit()
+
+        statements["count"] = 0
+        started = time.perf_counter()
+        run = execute_run(db, run, experiment, arms)
+        wall_seconds = time.perf_counter() - started
+        run_statements = statements["count"]
+
+        started = time.perf_counter()
+        summary = aggregate_run(db, run, experiment)
+        aggregation_seconds = time.perf_counter() - started
+        db.rollback()
+
+    engine.dispose()
+    attempts = summary["total_attempts"]
+    return {
+        **asdict(scenario),
+        "backend": engine.dialect.name,
+        "tasks": task_count,
+        "executed_attempts": attempts,
+        "errors": summary["total_errors"],
+        "wall_seconds": round(wall_seconds, 4),
+        "attempts_per_second": round(attempts / wall_seconds, 2) if wall_seconds else None,
+        "statements": run_statements,
+        "statements_per_attempt": round(run_statements / attempts, 3) if attempts else None,
+        "aggregation_seconds": round(aggregation_seconds, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _run_isolated(scenario: Scenario, dataset_dir: Path) -> dict:
+    # A fresh interpreter per scenario keeps peak RSS attributable to one run size.
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.pipeline",
+            "--single",
+            json.dumps(asdict(scenario)),
+            "--dataset-dir",
+            str(dataset_dir),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _default_database_url(dataset_dir: Path) -> str:
+    return f"sqlite+pysqlite:///{dataset_dir / 'bench.db'}"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument("--database-url", action="append", dest="database_urls")
+    parser.add_argument("--arms", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-distribution", default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--completion-tokens", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dataset-dir", type=Path)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--no-isolate", action="store_true")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    dataset_dir = args.dataset_dir or Path(tempfile.mkdtemp(prefix="modeleval-bench-"))
+    if args.single:
+        scenario = Scenario(**json.loads(args.single))
+        print(json.dumps(run_scenario(scenario, dataset_dir)))
+        return 0
+
+    database_urls = args.database_urls or [_default_database_url(dataset_dir)]
+    results = []
+    for database_url in database_urls:
+        for size in (int(value) for value in args.sizes.split(",") if value.strip()):
+            scenario = Scenario(
+                database_url=database_url,
+                attempts=size,
+                arms=args.arms,
+                latency_ms=args.latency_ms,
+                latency_distribution=args.latency_distribution,
+                error_rate=args.error_rate,
+                completion_tokens=args.completion_tokens,
+                seed=args.seed,
+            )
+            result = (
+                run_scenario(scenario, dataset_dir)
+                if args.no_isolate
+                else _run_isolated(scenario, dataset_dir)
+            )
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
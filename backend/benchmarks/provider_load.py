@@ -0,0 +1,178 @@
+"""Provider load benchmark against the local stand-in server.
+
+Starts benchmarks.standin_server on a free port, points OpenAIProvider and
+AnthropicProvider at it and sends the same prompts through each provider's
+blocking path (a thread pool) and its async path. Reports, as JSON,
+requests/second, client-observed latency percentiles, errors, the 429s the
+server returned and the retries the providers reported spending on them.
+
+    python -m benchmarks.provider_load --requests 500 --concurrency 64 --latency-ms 200
+    python -m benchmarks.provider_load --max-concurrency 32 --rate-limit-error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from app.providers.anthropic_provider import AnthropicProvider
+from app.providers.base import ModelProvider, ProviderResult
+from app.providers.openai_provider import OpenAIProvider
+from benchmarks.standin_server import StandinConfig, running_server
+
+PROVIDERS = ("openai", "anthropic")
+PATHS = ("sync", "async")
+MODEL_CONFIGS = {
+    "openai": {"model_name": "gpt-4o-mini", "system_prompt": "You review pull requests."},
+    "anthropic": {"model_name": "claude-haiku-4-5", "system_prompt": "You review pull requests."},
+}
+PROMPT = "Review change #{index}: guard the retry loop against a None response"
+
+
+def _provider(name: str, base_url: str) -> ModelProvider:
+    if name == "openai":
+        return OpenAIProvider(api_key="standin", base_url=f"{base_url}/v1")
+    return AnthropicProvider(api_key="standin", base_url=base_url)
+
+
+def _prompts(count: int) -> list[str]:
+    return [PROMPT.format(index=index) for index in range(count)]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _sync_results(
+    provider: ModelProvider, prompts: list[str], config: dict, concurrency: int
+) -> list[ProviderResult]:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda prompt: provider.generate(prompt, config), prompts))
+
+
+async def _async_results(
+    provider: ModelProvider, prompts: list[str], config: dict, concurrency: int
+) -> list[ProviderResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(prompt: str) -> ProviderResult:
+        async with semaphore:
+            return await provider.agenerate(prompt, config)
+
+    return await asyncio.gather(*(generate(prompt) for prompt in prompts))
+
+
+def _measure(name: str, path: str, base_url: str, requests: int, concurrency: int) -> dict:
+    provider = _provider(name, base_url)
+    config = MODEL_CONFIGS[name]
+    prompts = _prompts(requests)
+    # The first call pays for the SDK import and client construction; keep it out of timings.
+    provider.generate("warm-up", config)
+    before = httpx.get(f"{base_url}/stats").json()
+    started = time.perf_counter()
+    if path == "sync":
+        results = _sync_results(provider, prompts, config, concurrency)
+    else:
+        results = asyncio.run(_async_results(provider, prompts, config, concurrency))
+    elapsed = time.perf_counter() - started
+    after = httpx.get(f"{base_url}/stats").json()
+
+    latencies = [result.latency_ms for result in results if result.error is None]
+    errors = [result.error for result in results if result.error is not None]
+    return {
+        "provider": name,
+        "path": path,
+        "requests": requests,
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": _percentile(latencies, 0.50),
+        "latency_p95_ms": _percentile(latencies, 0.95),
+        "latency_p99_ms": _percentile(latencies, 0.99),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "retries": sum(result.retry_count for result in results),
+        "server_requests": after["requests"] - before["requests"],
+        "server_rate_limited": after["rate_limited"] - before["rate_limited"],
+        "server_max_in_flight": after["max_in_flight"],
+    }
+
+
+def run_benchmark(
+    requests: int = 200,
+    concurrency: int = 32,
+    config: Optional[StandinConfig] = None,
+    providers: tuple[str, ...] = PROVIDERS,
+    paths: tuple[str, ...] = PATHS,
+) -> dict:
+    config = config or StandinConfig()
+    with running_server(config) as base_url:
+        scenarios = [
+            _measure(name, path, base_url, requests, concurrency)
+            for name in providers
+            for path in paths
+        ]
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "server": {
+            "latency_ms": config.latency_ms,
+            "latency_distribution": config.latency_distribution,
+            "max_concurrency": config.max_concurrency,
+            "requests_per_second": config.requests_per_second,
+            "rate_limit_error_rate": config.rate_limit_error_rate,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--providers", default=",".join(PROVIDERS))
+    parser.add_argument("--paths", default=",".join(PATHS))
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--latency-distribution", default="lognormal")
+    parser.add_argument("--max-concurrency", type=int)
+    parser.add_argument("--requests-per-second", type=float)
+    parser.add_argument("--rate-limit-error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after-s", type=float, default=0.1)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        max_concurrency=args.max_concurrency,
+        requests_per_second=args.requests_per_second,
+        rate_limit_error_rate=args.rate_limit_error_rate,
+        retry_after_s=args.retry_after_s,
+    )
+    result = run_benchmark(
+        args.requests,
+        args.concurrency,
+        config,
+        providers=tuple(args.providers.split(",")),
+        paths=tuple(args.paths.split(",")),
+    )
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,251 @@
+"""Score storage benchmark: long (one row per metric) vs pivoted layout.
+
+Loads the same synthetic scores into both layouts and reports rows, on-disk
+size and the time of the aggregator's per-run score query as JSON.
+
+    python -m benchmarks.score_storage --attempts 100000
+    python -m benchmarks.score_storage --database-url postgresql+psycopg://... --output scores.json
+
+The benchmark creates and drops its own bench_* tables; point --database-url
+at a scratch database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Engine,
+    Float,
+    Index,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    select,
+    text,
+)
+
+from app.services.scorer import PASS_THRESHOLD
+
+metadata = MetaData()
+
+LONG_TABLE = Table(
+    "bench_scores_long",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("run_id", String(36), nullable=False),
+    Column("task_instance_id", String(36), nullable=False),
+    Column("model_arm_id", String(36), nullable=False),
+    Column("metric_name", String(255), nullable=False),
+    Column("value", Float, nullable=False),
+    Column("details", JSON, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Index("ix_bench_scores_long_run_id", "run_id"),
+)
+PIVOTED_TABLE = Table(
+    "bench_scores_pivoted",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("run_id", String(36), nullable=False),
+    Column("task_instance_id", String(36), nullable=False),
+    Column("model_arm_id", String(36), nullable=False),
+    Column("quality", Float, nullable=False),
+    Column("passed", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Index("ix_bench_scores_pivoted_run_id", "run_id"),
+)
+TERMS = ("test_failure", "type_failure", "lint_failure", "infra_failure", "fix", "guard", "retry")
+BATCH_SIZE = 5_000
+
+
+def _synthetic_scores(attempts: int, arms: int, seed: int) -> tuple[str, list[dict]]:
+    rng = random.Random(seed)
+    run_id = str(uuid.uuid4())
+    arm_ids = [str(uuid.uuid4()) for _ in range(arms)]
+    created_at = datetime.now(timezone.utc)
+    rows = []
+    for index in range(attempts):
+        quality = rng.random()
+        rows.append(
+            {
+                "run_id": run_id,
+                "task_instance_id": str(uuid.UUID(int=index // arms)),
+                "model_arm_id": arm_ids[index % arms],
+                "quality": quality,
+                "passed": quality >= PASS_THRESHOLD,
+                "expected_terms": rng.sample(TERMS, k=4),
+                "created_at": created_at,
+            }
+        )
+    return run_id, rows
+
+
+def _long_rows(rows: list[dict]) -> list[dict]:
+    long_rows = []
+    for row in rows:
+        keys = ("run_id", "task_instance_id", "model_arm_id", "created_at")
+        shared = {key: row[key] for key in keys}
+        long_rows.append(
+            {
+                **shared,
+                "id": str(uuid.uuid4()),
+                "metric_name": "quality",
+                "value": row["quality"],
+                "details": {"expected_terms": row["expected_terms"]},
+            }
+        )
+        long_rows.append(
+            {
+                **shared,
+                "id": str(uuid.uuid4()),
+                "metric_name": "pass",
+                "value": 1.0 if row["passed"] else 0.0,
+                "details": {"threshold": PASS_THRESHOLD},
+            }
+        )
+    return long_rows
+
+
+def _pivoted_rows(rows: list[dict]) -> list[dict]:
+    keys = ("run_id", "task_instance_id", "model_arm_id", "quality", "passed", "created_at")
+    return [{"id": str(uuid.uuid4()), **{key: row[key] for key in keys}} for row in rows]
+
+
+def _load(engine: Engine, table: Table, rows: list[dict]) -> None:
+    with engine.begin() as connection:
+        for start in range(0, len(rows), BATCH_SIZE):
+            connection.execute(table.insert(), rows[start : start + BATCH_SIZE])
+
+
+def _table_bytes(engine: Engine, table: Table, database_path: Optional[Path]) -> int:
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            size = connection.execute(
+                text("SELECT pg_total_relation_size(CAST(:name AS regclass))"), {"name": table.name}
+            )
+            return int(size.scalar())
+    with engine.connect() as connection:
+        connection.execute(text("VACUUM"))
+    return database_path.stat().st_size if database_path else 0
+
+
+def _aggregate_long(engine: Engine, run_id: str) -> dict:
+    by_arm: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    with engine.connect() as connection:
+        stmt = select(LONG_TABLE.c.model_arm_id, LONG_TABLE.c.metric_name, LONG_TABLE.c.value)
+        for model_arm_id, metric_name, value in connection.execute(
+            stmt.where(LONG_TABLE.c.run_id == run_id)
+        ):
+            by_arm[model_arm_id][metric_name].append(value)
+    return by_arm
+
+
+def _aggregate_pivoted(engine: Engine, run_id: str) -> dict:
+    by_arm: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    with engine.connect() as connection:
+        stmt = select(PIVOTED_TABLE.c.model_arm_id, PIVOTED_TABLE.c.quality, PIVOTED_TABLE.c.passed)
+        for model_arm_id, quality, passed in connection.execute(
+            stmt.where(PIVOTED_TABLE.c.run_id == run_id)
+        ):
+            by_arm[model_arm_id]["quality"].append(quality)
+            by_arm[model_arm_id]["pass"].append(1.0 if passed else 0.0)
+    return by_arm
+
+
+def _best_of(repeats: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_benchmark(
+    attempts: int,
+    arms: int = 2,
+    seed: int = 42,
+    database_url: Optional[str] = None,
+    workdir: Optional[Path] = None,
+    repeats: int = 5,
+) -> dict:
+    run_id, rows = _synthetic_scores(attempts, arms, seed)
+    layouts = {
+        "long": (LONG_TABLE, _long_rows(rows), _aggregate_long),
+        "pivoted": (PIVOTED_TABLE, _pivoted_rows(rows), _aggregate_pivoted),
+    }
+    results: dict[str, dict] = {}
+    for name, (table, layout_rows, aggregate) in layouts.items():
+        database_path = None
+        url = database_url
+        if url is None:
+            # One SQLite file per layout so the file size is the layout's size.
+            database_path = (workdir or Path(tempfile.mkdtemp())) / f"scores-{name}.db"
+            database_path.unlink(missing_ok=True)
+            url = f"sqlite+pysqlite:///{database_path}"
+        engine = create_engine(url, future=True)
+        table.drop(engine, checkfirst=True)
+        table.create(engine)
+        _load(engine, table, layout_rows)
+        results[name] = {
+            "rows": len(layout_rows),
+            "bytes": _table_bytes(engine, table, database_path),
+            "aggregation_seconds": round(_best_of(repeats, aggregate, engine, run_id), 5),
+        }
+        if database_url is not None:
+            table.drop(engine)
+        engine.dispose()
+
+    long, pivoted = results["long"], results["pivoted"]
+    return {
+        "attempts": attempts,
+        "arms": arms,
+        "backend": "postgresql" if database_url and "postgresql" in database_url else "sqlite",
+        **results,
+        "size_ratio": round(pivoted["bytes"] / long["bytes"], 3) if long["bytes"] else None,
+        "aggregation_speedup": (
+            round(long["aggregation_seconds"] / pivoted["aggregation_seconds"], 2)
+            if pivoted["aggregation_seconds"]
+            else None
+        ),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--attempts", type=int, default=100_000)
+    parser.add_argument("--arms", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--database-url")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        args.attempts, args.arms, args.seed, database_url=args.database_url, repeats=args.repeats
+    )
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,395 @@
+"""Local stand-in for the OpenAI and Anthropic HTTP APIs.
+
+Serves POST /v1/chat/completions (OpenAI) and POST /v1/messages (Anthropic),
+including streaming, with injected latency, concurrency and request-rate limits
+and random 429s. Point the real providers at it to load-test their client,
+HTTP and parsing paths:
+
+    python -m benchmarks.standin_server --port 8089 --latency-ms 400 --max-concurrency 64
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 ANTHROPIC_BASE_URL=http://127.0.0.1:8089 \\
+        OPENAI_API_KEY=standin ANTHROPIC_API_KEY=standin uvicorn app.main:app
+
+GET /stats reports request, 429 and concurrency counters since startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+import socket
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.providers.mock import LATENCY_DISTRIBUTIONS, sample_latency_ms
+
+FILLER_WORDS = ("looks", "fine", "but", "check", "the", "null", "handling", "and", "retries")
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: float = 50.0
+    latency_distribution: str = "lognormal"
+    latency_jitter: float = 0.5
+    # Requests beyond either limit are answered with a 429 instead of queueing.
+    max_concurrency: Optional[int] = None
+    requests_per_second: Optional[float] = None
+    rate_limit_error_rate: float = 0.0
+    retry_after_s: float = 1.0
+    completion_tokens: int = 64
+    stream_tokens_per_second: Optional[float] = None
+    seed: int = 0
+
+
+@dataclass
+class StandinStats:
+    requests: int = 0
+    completed: int = 0
+    rate_limited: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    by_api: dict = field(default_factory=lambda: {"openai": 0, "anthropic": 0})
+
+
+class TokenBucket:
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Standin:
+    # All state lives on the server's event loop, so no locking is needed.
+    def __init__(self, config: StandinConfig) -> None:
+        if config.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {sorted(LATENCY_DISTRIBUTIONS)}")
+        self.config = config
+        self.stats = StandinStats()
+        self._rng = random.Random(config.seed)
+        self._bucket: Optional[TokenBucket] = None
+        if config.requests_per_second:
+            self._bucket = TokenBucket(config.requests_per_second)
+        self._ids = itertools.count(1)
+
+    def _rate_limited(self) -> bool:
+        config = self.config
+        if config.max_concurrency is not None and self.stats.in_flight >= config.max_concurrency:
+            return True
+        if self._bucket is not None and not self._bucket.take():
+            return True
+        return self._rng.random() < config.rate_limit_error_rate
+
+    def _latency_s(self) -> float:
+        options = {
+            "mock_latency_ms": self.config.latency_ms,
+            "mock_latency_distribution": self.config.latency_distribution,
+            "mock_latency_jitter": self.config.latency_jitter,
+        }
+        return sample_latency_ms(self._rng, options) / 1000.0
+
+    def _completion(self, prompt: str, max_tokens: Optional[int]) -> tuple[list[str], int]:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        count = self.config.completion_tokens
+        if max_tokens:
+            count = min(count, max_tokens)
+        words = [f"standin-response:{digest}:"]
+        words.extend(itertools.islice(itertools.cycle(FILLER_WORDS), max(count - 1, 0)))
+        return words, max(1, len(prompt.split()))
+
+    def _too_many_requests(self, body: dict) -> Response:
+        self.stats.rate_limited += 1
+        retry_after = self.config.retry_after_s
+        # The SDKs honour retry-after-ms, so sub-second backoffs survive the round trip.
+        headers = {
+            "retry-after": str(max(1, round(retry_after))),
+            "retry-after-ms": str(int(retry_after * 1000)),
+        }
+        return JSONResponse(body, status_code=429, headers=headers)
+
+    async def _stream_words(self, words: list[str]) -> AsyncIterator[str]:
+        rate = self.config.stream_tokens_per_second
+        delay = 1.0 / rate if rate else 0.0
+        for index, word in enumerate(words):
+            if delay:
+                await asyncio.sleep(delay)
+            yield word if index == 0 else f" {word}"
+
+    async def _handle(self, request: Request, api: str) -> Response:
+        payload = await request.json()
+        self.stats.requests += 1
+        self.stats.by_api[api] += 1
+        if self._rate_limited():
+            if api == "openai":
+                error = {
+                    "message": "Rate limit reached for requests",
+                    "type": "requests",
+                    "param": None,
+                    "code": "rate_limit_exceeded",
+                }
+                return self._too_many_requests({"error": error})
+            error = {
+                "type": "rate_limit_error",
+                "message": "Number of requests has exceeded your rate limit",
+            }
+            return self._too_many_requests({"type": "error", "error": error})
+
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+        try:
+            await asyncio.sleep(self._latency_s())
+            prompt = _prompt_text(payload, api)
+            words, prompt_tokens = self._completion(prompt, payload.get("max_tokens"))
+            response_id = next(self._ids)
+            model = str(payload.get("model", "standin"))
+            if payload.get("stream"):
+                # The slot is held until the last event is sent, like a real stream.
+                self.stats.in_flight += 1
+                events = (_openai_events if api == "openai" else _anthropic_events)(
+                    self, payload, response_id, model, words, prompt_tokens
+                )
+                return StreamingResponse(events, media_type="text/event-stream")
+            if api == "openai":
+                return JSONResponse(_openai_body(response_id, model, words, prompt_tokens))
+            return JSONResponse(_anthropic_body(response_id, model, words, prompt_tokens))
+        finally:
+            self.stats.in_flight -= 1
+            self.stats.completed += 1
+
+    def _stream_finished(self) -> None:
+        self.stats.in_flight -= 1
+
+    def app(self) -> Starlette:
+        async def chat_completions(request: Request) -> Response:
+            return await self._handle(request, "openai")
+
+        async def messages(request: Request) -> Response:
+            return await self._handle(request, "anthropic")
+
+        async def stats(request: Request) -> Response:
+            return JSONResponse({**asdict(self.stats), "config": asdict(self.config)})
+
+        return Starlette(
+            routes=[
+                Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+                Route("/v1/messages", messages, methods=["POST"]),
+                Route("/stats", stats, methods=["GET"]),
+            ]
+        )
+
+
+def create_app(config: Optional[StandinConfig] = None) -> Starlette:
+    return Standin(config or StandinConfig()).app()
+
+
+def _prompt_text(payload: dict, api: str) -> str:
+    parts = []
+    if api == "anthropic":
+        system = payload.get("system") or ""
+        if isinstance(system, list):
+            system = " ".join(block.get("text", "") for block in system)
+        parts.append(system)
+    for message in payload.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = " ".join(block.get("text", "") for block in content)
+        parts.append(str(content))
+    return " ".join(part for part in parts if part)
+
+
+def _openai_body(response_id: int, model: str, words: list[str], prompt_tokens: int) -> dict:
+    return {
+        "id": f"chatcmpl-standin-{response_id}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": " ".join(words), "refusal": None},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(words),
+            "total_tokens": prompt_tokens + len(words),
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
+
+
+def _anthropic_body(response_id: int, model: str, words: list[str], prompt_tokens: int) -> dict:
+    return {
+        "id": f"msg_standin_{response_id}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": " ".join(words)}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": _anthropic_usage(prompt_tokens, len(words)),
+    }
+
+
+def _anthropic_usage(prompt_tokens: int, completion_tokens: int) -> dict:
+    return {
+        "input_tokens": prompt_tokens,
+        "output_tokens": completion_tokens,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 0,
+    }
+
+
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def _openai_events(
+    standin: Standin,
+    payload: dict,
+    response_id: int,
+    model: str,
+    words: list[str],
+    prompt_tokens: int,
+) -> AsyncIterator[str]:
+    try:
+        chunk = {
+            "id": f"chatcmpl-standin-{response_id}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+        }
+        first_delta = {"role": "assistant", "content": ""}
+        yield _sse({**chunk, "choices": [{"index": 0, "delta": first_delta}]})
+        async for text in standin._stream_words(words):
+            yield _sse({**chunk, "choices": [{"index": 0, "delta": {"content": text}}]})
+        yield _sse({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            usage = _openai_body(response_id, model, words, prompt_tokens)["usage"]
+            yield _sse({**chunk, "choices": [], "usage": usage})
+        yield "data: [DONE]\n\n"
+    finally:
+        standin._stream_finished()
+
+
+async def _anthropic_events(
+    standin: Standin,
+    payload: dict,
+    response_id: int,
+    model: str,
+    words: list[str],
+    prompt_tokens: int,
+) -> AsyncIterator[str]:
+    try:
+        message = _anthropic_body(response_id, model, [], prompt_tokens)
+        message.update(content=[], stop_reason=None, usage=_anthropic_usage(prompt_tokens, 1))
+        yield _sse({"type": "message_start", "message": message}, "message_start")
+        block = {"type": "text", "text": ""}
+        yield _sse(
+            {"type": "content_block_start", "index": 0, "content_block": block},
+            "content_block_start",
+        )
+        async for text in standin._stream_words(words):
+            delta = {"type": "text_delta", "text": text}
+            yield _sse(
+                {"type": "content_block_delta", "index": 0, "delta": delta}, "content_block_delta"
+            )
+        yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        message_delta = {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": len(words)},
+        }
+        yield _sse(message_delta, "message_delta")
+        yield _sse({"type": "message_stop"}, "message_stop")
+    finally:
+        standin._stream_finished()
+
+
+@contextmanager
+def running_server(
+    config: Optional[StandinConfig] = None, host: str = "127.0.0.1"
+) -> Iterator[str]:
+    # Serves the stand-in from a background thread on a free port; yields its base URL.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(config), log_level="warning", access_log=False, lifespan="off")
+    )
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("stand-in server failed to start")
+        time.sleep(0.01)
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        sock.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--latency-distribution", default="lognormal")
+    parser.add_argument("--latency-jitter", type=float, default=0.5)
+    parser.add_argument("--max-concurrency", type=int)
+    parser.add_argument("--requests-per-second", type=float)
+    parser.add_argument("--rate-limit-error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after-s", type=float, default=1.0)
+    parser.add_argument("--completion-tokens", type=int, default=64)
+    parser.add_argument("--stream-tokens-per-second", type=float)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_jitter=args.latency_jitter,
+        max_concurrency=args.max_concurrency,
+        requests_per_second=args.requests_per_second,
+        rate_limit_error_rate=args.rate_limit_error_rate,
+        retry_after_s=args.retry_after_s,
+        completion_tokens=args.completion_tokens,
+        stream_tokens_per_second=args.stream_tokens_per_second,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
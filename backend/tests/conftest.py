@@ -10,7 +10,7 @@ from sqlalchemy.pool import StaticPool
 os.environ["MODELEVAL_SKIP_STARTUP_DB_CHECK"] = "1"
 
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import JSON_ENGINE_OPTIONS, get_db
 from app.main import app
 
 
@@ -21,6 +21,7 @@ def db_session() -> Generator[Session, None, None]:
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         future=True,
+        **JSON_ENGINE_OPTIONS,
     )
     Base.metadata.create_all(bind=engine)
     testing_session_local = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
@@ -0,0 +1,102 @@
+import random
+
+from app.services.adaptive import AdaptiveConfig, AdaptiveSampler
+
+
+def _run_batches(sampler: AdaptiveSampler, values: dict[str, float], total_tasks: int) -> None:
+    for _ in range(0, total_tasks, sampler.config.batch_size):
+        for arm_id in sampler.active_arm_ids:
+            for _ in range(sampler.config.batch_size):
+                sampler.record(arm_id, values[arm_id])
+        sampler.finish_batch(sampler.config.batch_size)
+        if sampler.stopped:
+            break
+
+
+def test_adaptive_sampler_drops_losing_arm_and_stops_early():
+    config = AdaptiveConfig(batch_size=10, min_tasks=20, confidence=0.9)
+    sampler = AdaptiveSampler(config=config, arm_ids=["strong", "weak"], planned_tasks=200)
+    _run_batches(sampler, {"strong": 1.0, "weak": 0.0}, total_tasks=200)
+
+    assert sampler.stopped
+    assert sampler.tasks_executed < 200
+    assert list(sampler.dropped) == ["weak"]
+    summary = sampler.summary()
+    assert summary["stopped_early"] is True
+    assert summary["stop_reason"] == "single_arm_remaining"
+
+
+def test_adaptive_sampler_keeps_sampling_when_arms_are_tied():
+    config = AdaptiveConfig(batch_size=10, min_tasks=0, confidence=0.95)
+    sampler = AdaptiveSampler(config=config, arm_ids=["a", "b"], planned_tasks=100)
+    _run_batches(sampler, {"a": 0.5, "b": 0.5}, total_tasks=100)
+
+    assert not sampler.stopped
+    assert sampler.summary()["stop_reason"] == "max_tasks_reached"
+
+
+def test_intervals_widen_with_the_number_of_planned_looks():
+    config = AdaptiveConfig(batch_size=10, min_tasks=20, confidence=0.9)
+    short = AdaptiveSampler(config=config, arm_ids=["a", "b"], planned_tasks=30)
+    long = AdaptiveSampler(config=config, arm_ids=["a", "b"], planned_tasks=1000)
+    for sampler in (short, long):
+        for _ in range(20):
+            sampler.record("a", 0.5)
+
+    assert short.max_looks == 2
+    assert long.max_looks == 99
+    assert long.interval("a").high > short.interval("a").high
+
+
+def test_equal_arms_rarely_stop_despite_repeated_looks():
+    config = AdaptiveConfig(batch_size=5, min_tasks=0, confidence=0.5)
+    planned = 300
+    trials = 200
+    rng = random.Random(29)
+    false_stops = 0
+    for _ in range(trials):
+        sampler = AdaptiveSampler(config=config, arm_ids=["a", "b", "c"], planned_tasks=planned)
+        for _ in range(0, planned, config.batch_size):
+            for arm_id in sampler.active_arm_ids:
+                for _ in range(config.batch_size):
+                    sampler.record(arm_id, float(rng.random() < 0.5))
+            sampler.finish_batch(config.batch_size)
+            if sampler.stopped or sampler.dropped:
+                false_stops += 1
+                break
+
+    assert false_stops / trials <= 1.0 - config.confidence
+
+
+def test_adaptive_run_records_sampling_summary(client):
+    payload = {
+        "name": "Adaptive Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {
+            "max_tasks": 3,
+            "mode": "adaptive",
+            "adaptive": {"batch_size": 2, "min_tasks": 2},
+        },
+        "budget_usd": "5.00",
+        "seed": 5,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {}},
+            {"provider": "mock", "model_name": "mock-b", "config": {}},
+        ],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run_id = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+    ).json()["id"]
+
+    summary = client.get(f"/runs/{run_id}/summary").json()["summary"]
+    assert summary["adaptive"]["planned_tasks"] == 3
+    assert summary["adaptive"]["tasks_executed"] == 3
+    assert summary["total_attempts"] == 6
+
+    invalid = {
+        **payload,
+        "sampling": {"max_tasks": 3, "mode": "adaptive", "adaptive": {"confidence": 2}},
+    }
+    assert client.post("/experiments", json=invalid).status_code == 422
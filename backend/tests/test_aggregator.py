@@ -54,7 +54,6 @@ def test_aggregator_summary_ordering(db_session):
                 task_instance_id="t-1",
                 model_arm_id=arm_a.id,
                 raw_output="ok",
-                raw_response={},
                 usage_prompt_tokens=1,
                 usage_completion_tokens=1,
                 usage_total_tokens=2,
@@ -67,7 +66,6 @@ def test_aggregator_summary_ordering(db_session):
                 task_instance_id="t-2",
                 model_arm_id=arm_b.id,
                 raw_output="ok",
-                raw_response={},
                 usage_prompt_tokens=1,
                 usage_completion_tokens=1,
                 usage_total_tokens=2,
@@ -79,36 +77,16 @@ def test_aggregator_summary_ordering(db_session):
                 run_id=run.id,
                 task_instance_id="t-1",
                 model_arm_id=arm_a.id,
-                metric_name="quality",
-                value=0.9,
-                details={},
+                quality=0.9,
+                passed=True,
             ),
             Score(
                 id="s-2",
                 run_id=run.id,
-                task_instance_id="t-1",
-                model_arm_id=arm_a.id,
-                metric_name="pass",
-                value=1.0,
-                details={},
-            ),
-            Score(
-                id="s-3",
-                run_id=run.id,
-                task_instance_id="t-2",
-                model_arm_id=arm_b.id,
-                metric_name="quality",
-                value=0.2,
-                details={},
-            ),
-            Score(
-                id="s-4",
-                run_id=run.id,
                 task_instance_id="t-2",
                 model_arm_id=arm_b.id,
-                metric_name="pass",
-                value=0.0,
-                details={},
+                quality=0.2,
+                passed=False,
             ),
         ]
     )
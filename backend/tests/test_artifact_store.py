@@ -0,0 +1,101 @@
+import zlib
+
+from sqlalchemy import func, select
+
+from app.models.entities import Attempt, AttemptArtifact
+from app.services.artifact_store import (
+    ZLIB_CODEC,
+    DatabaseArtifactStore,
+    FilesystemArtifactStore,
+    canonical_bytes,
+    compress,
+    decompress,
+)
+
+
+def test_database_store_deduplicates_identical_payloads(db_session):
+    store = DatabaseArtifactStore()
+    payload = {"id": "resp-1", "choices": [{"text": "ok" * 500}]}
+
+    first = store.put(db_session, payload)
+    second = store.put(db_session, dict(reversed(list(payload.items()))))
+    db_session.commit()
+
+    assert first == second
+    assert db_session.scalar(select(func.count()).select_from(AttemptArtifact)) == 1
+    artifact = db_session.get(AttemptArtifact, first)
+    assert artifact.compressed_size_bytes < artifact.size_bytes
+    assert store.get(db_session, first) == payload
+    assert store.put(db_session, {}) is None
+    assert store.get(db_session, None) is None
+
+
+def test_database_store_skips_digests_committed_by_another_run(db_session):
+    store = DatabaseArtifactStore()
+    payload = {"id": "resp-2", "choices": [{"text": "same provider output"}]}
+    raw = canonical_bytes(payload)
+    compressed, codec = compress(raw)
+    digest = store.put(db_session, payload)
+    db_session.rollback()
+    db_session.add(
+        AttemptArtifact(
+            digest=digest,
+            codec=codec,
+            size_bytes=len(raw),
+            compressed_size_bytes=len(compressed),
+            content=compressed,
+        )
+    )
+    db_session.commit()
+
+    assert store.put(db_session, payload) == digest
+    db_session.commit()
+    assert db_session.scalar(select(func.count()).select_from(AttemptArtifact)) == 1
+    assert store.get(db_session, digest) == payload
+
+
+def test_filesystem_store_round_trips(db_session, tmp_path):
+    store = FilesystemArtifactStore(tmp_path)
+    digest = store.put(db_session, {"provider": "mock", "echo": "hello"})
+
+    assert len(list(tmp_path.rglob(f"{digest}.*"))) == 1
+    assert store.put(db_session, {"echo": "hello", "provider": "mock"}) == digest
+    assert store.get(db_session, digest) == {"provider": "mock", "echo": "hello"}
+    assert store.get(db_session, "0" * 64) is None
+
+
+def test_zlib_artifacts_stay_readable():
+    raw = canonical_bytes({"a": 1})
+    compressed, codec = compress(raw)
+    assert decompress(compressed, codec) == raw
+
+    assert decompress(zlib.compress(raw), ZLIB_CODEC) == raw
+
+
+def test_raw_response_is_fetched_lazily(client, db_session):
+    payload = {
+        "name": "Artifact Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": "5.00",
+        "seed": 4,
+        "model_arms": [{"provider": "mock", "model_name": "mock-a", "config": {}}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run_id = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+    ).json()["id"]
+
+    attempts = client.get(f"/runs/{run_id}/attempts").json()
+    assert len(attempts) == 3
+    digests = {attempt["raw_response_digest"] for attempt in attempts}
+    assert len(digests) == 1
+    assert db_session.scalar(select(func.count()).select_from(AttemptArtifact)) == 1
+
+    response = client.get(f"/runs/{run_id}/attempts/{attempts[0]['id']}/raw_response")
+    assert response.status_code == 200
+    assert response.json()["provider"] == "mock"
+
+    assert client.get(f"/runs/{run_id}/attempts/missing/raw_response").status_code == 404
+    assert db_session.scalar(select(func.count()).select_from(Attempt)) == 3
@@ -0,0 +1,127 @@
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from app.models.entities import Attempt, Run, Score
+from app.providers.mock import MockProvider
+
+
+def _count_generations(monkeypatch) -> Counter:
+    calls: Counter = Counter()
+    original = MockProvider.generate
+
+    def counting_generate(self, task_input, model_config):
+        calls[model_config["model_name"]] += 1
+        return original(self, task_input, model_config)
+
+    monkeypatch.setattr(MockProvider, "generate", counting_generate)
+    return calls
+
+
+def _arm(model_name: str) -> dict:
+    return {"provider": "mock", "model_name": model_name, "config": {}}
+
+
+def _create_experiment(client) -> str:
+    payload = {
+        "name": "Reuse Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": "5.00",
+        "seed": 9,
+        "model_arms": [_arm("mock-a"), _arm("mock-b")],
+    }
+    return client.post("/experiments", json=payload).json()["id"]
+
+
+def _launch(client, experiment_id: str, **options) -> str:
+    response = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0, **options}
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_rerun_after_swapping_one_arm_only_generates_for_the_new_arm(
+    client, db_session, monkeypatch
+):
+    calls = _count_generations(monkeypatch)
+    experiment_id = _create_experiment(client)
+    first_run_id = _launch(client, experiment_id)
+    assert calls == {"mock-a": 3, "mock-b": 3}
+
+    experiment = client.get(f"/experiments/{experiment_id}").json()
+    arms_before = {arm["model_name"]: arm["id"] for arm in experiment["model_arms"]}
+    response = client.patch(
+        f"/experiments/{experiment_id}", json={"model_arms": [_arm("mock-a"), _arm("mock-c")]}
+    )
+    arms_after = {arm["model_name"]: arm["id"] for arm in response.json()["model_arms"]}
+    assert arms_after["mock-a"] == arms_before["mock-a"]
+
+    calls.clear()
+    second_run_id = _launch(client, experiment_id)
+    assert calls == {"mock-c": 3}
+
+    for model in (Attempt, Score):
+        count = select(func.count()).select_from(model).where(model.run_id == second_run_id)
+        assert db_session.scalar(count) == 6
+    second_run = db_session.get(Run, second_run_id)
+    reuse = second_run.summary_json["reuse"]
+    assert reuse["reused_attempts"] == 3
+    assert reuse["arms"] == {
+        arms_after["mock-a"]: {"source_run_id": first_run_id, "attempts": 3}
+    }
+
+    first = client.get(f"/runs/{first_run_id}/summary").json()
+    second = client.get(f"/runs/{second_run_id}/summary").json()
+    quality = {
+        run: {arm["model_arm_id"]: arm["quality_avg"] for arm in summary["summary"]["models"]}
+        for run, summary in (("first", first), ("second", second))
+    }
+    assert quality["second"][arms_after["mock-a"]] == quality["first"][arms_after["mock-a"]]
+
+
+def test_reuse_can_be_disabled_per_run(client, monkeypatch):
+    calls = _count_generations(monkeypatch)
+    experiment_id = _create_experiment(client)
+    _launch(client, experiment_id)
+    calls.clear()
+
+    _launch(client, experiment_id, reuse_attempts=False)
+
+    assert calls == {"mock-a": 3, "mock-b": 3}
+
+
+def test_patch_keeps_or_removes_each_arm_that_shares_a_fingerprint(client):
+    payload = {
+        "name": "Duplicate Arms Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "budget_usd": "5.00",
+        "model_arms": [
+            {**_arm("mock-a"), "display_name": "mock-a (first)"},
+            {**_arm("mock-a"), "display_name": "mock-a (second)"},
+        ],
+    }
+    experiment = client.post("/experiments", json=payload).json()
+    arm_ids = [arm["id"] for arm in experiment["model_arms"]]
+
+    response = client.patch(
+        f"/experiments/{experiment['id']}", json={"model_arms": [_arm("mock-b")]}
+    )
+    assert [arm["model_name"] for arm in response.json()["model_arms"]] == ["mock-b"]
+
+    response = client.patch(
+        f"/experiments/{experiment['id']}",
+        json={"model_arms": [_arm("mock-b"), _arm("mock-a"), _arm("mock-a")]},
+    )
+    arms = response.json()["model_arms"]
+    assert sorted(arm["model_name"] for arm in arms) == ["mock-a", "mock-a", "mock-b"]
+    assert not {arm["id"] for arm in arms} & set(arm_ids)
+
+    kept = client.patch(
+        f"/experiments/{experiment['id']}", json={"model_arms": [_arm("mock-a")]}
+    ).json()["model_arms"]
+    assert len(kept) == 1
+    assert kept[0]["id"] in {arm["id"] for arm in arms}
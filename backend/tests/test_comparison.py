@@ -0,0 +1,96 @@
+import time
+
+import numpy as np
+
+from app.services.comparison import bootstrap_mean_ci, permutation_p_value, sign_test_p_value
+
+
+def test_bootstrap_ci_brackets_mean_and_is_seed_deterministic():
+    generator = np.random.default_rng(0)
+    deltas = generator.integers(0, 5, 500) / 4 - generator.integers(0, 4, 500) / 4
+
+    first = bootstrap_mean_ci(deltas, np.random.default_rng(7), n_resamples=2000)
+    second = bootstrap_mean_ci(deltas, np.random.default_rng(7), n_resamples=2000)
+    assert first == second
+    assert first[0] < deltas.mean() < first[1]
+
+
+def test_significance_tests_detect_clear_winner():
+    deltas = np.array([0.5] * 40 + [-0.25] * 5 + [0.0] * 5)
+    assert sign_test_p_value(deltas) < 0.001
+    assert permutation_p_value(deltas, np.random.default_rng(1), n_permutations=2000) < 0.01
+    assert sign_test_p_value(np.array([0.0, 0.0])) == 1.0
+    assert sign_test_p_value(np.array([1.0, -1.0])) == 1.0
+
+
+def test_bootstrap_scales_to_large_discrete_runs():
+    generator = np.random.default_rng(3)
+    deltas = generator.integers(0, 5, 50_000) / 4 - generator.integers(0, 5, 50_000) / 4
+    started = time.perf_counter()
+    bootstrap_mean_ci(deltas, np.random.default_rng(3), n_resamples=10_000)
+    permutation_p_value(deltas, np.random.default_rng(3), n_permutations=10_000)
+    assert time.perf_counter() - started < 1.0
+
+
+def test_bootstrap_scales_to_large_continuous_runs():
+    generator = np.random.default_rng(4)
+    # Judge scores and latencies: every delta is distinct.
+    deltas = generator.lognormal(size=50_000) - generator.lognormal(size=50_000) + 0.02
+    started = time.perf_counter()
+    low, high = bootstrap_mean_ci(deltas, np.random.default_rng(4), n_resamples=10_000)
+    p_value = permutation_p_value(deltas, np.random.default_rng(4), n_permutations=10_000)
+    assert time.perf_counter() - started < 1.0
+
+    # Agrees with plain index resampling to within Monte Carlo noise.
+    rng = np.random.default_rng(5)
+    means = deltas[rng.integers(0, deltas.size, size=(1000, deltas.size))].mean(axis=1)
+    reference_low, reference_high = np.quantile(means, [0.025, 0.975])
+    width = reference_high - reference_low
+    assert abs(low - reference_low) < 0.1 * width
+    assert abs(high - reference_high) < 0.1 * width
+    signs = rng.integers(0, 2, size=(1000, deltas.size)) * 2 - 1
+    reference_p = (np.count_nonzero(np.abs(signs @ deltas) >= abs(deltas.sum())) + 1) / 1001
+    assert abs(p_value - reference_p) < 0.05
+
+
+def test_compare_endpoint_pairs_arms_on_shared_tasks(client):
+    payload = {
+        "name": "Paired Eval",
+        "workload_type": "ci_triage",
+        "dataset_ref": "ci_triage/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": "5.00",
+        "seed": 4,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {}},
+            {"provider": "mock", "model_name": "mock-b", "config": {}},
+        ],
+    }
+    experiment = client.post("/experiments", json=payload).json()
+    arm_a, arm_b = (arm["id"] for arm in experiment["model_arms"])
+    run_id = client.post(
+        f"/experiments/{experiment['id']}/runs", json={"failure_threshold": 1.0}
+    ).json()["id"]
+
+    response = client.get(
+        f"/runs/{run_id}/compare", params={"arm_a": arm_a, "arm_b": arm_b, "n_resamples": 500}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["task_count"] == 3
+    assert body["wins_a"] + body["wins_b"] + body["ties"] == 3
+    assert body["ci_low"] <= body["mean_delta"] <= body["ci_high"]
+
+    missing = client.get(f"/runs/{run_id}/compare", params={"arm_a": arm_a, "arm_b": "nope"})
+    assert missing.status_code == 404
+
+    unknown = client.get(
+        f"/runs/{run_id}/compare", params={"arm_a": arm_a, "arm_b": arm_b, "metric": "latency"}
+    )
+    assert unknown.status_code == 400
+    assert "metric must be one of" in unknown.json()["detail"]
+    # No evaluator was configured, so there are no judge scores to pair.
+    unpaired = client.get(
+        f"/runs/{run_id}/compare", params={"arm_a": arm_a, "arm_b": arm_b, "metric": "judge"}
+    )
+    assert unpaired.status_code == 400
@@ -0,0 +1,73 @@
+from sqlalchemy import func, select
+
+from app.models.entities import DatasetItem, TaskInstance
+from app.services.dataset_items import persist_dataset_items
+from app.services.dataset_loader import load_dataset, row_digest
+
+
+def _create_experiment(client, max_tasks: int) -> str:
+    payload = {
+        "name": "Dedup Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": max_tasks},
+        "budget_usd": "5.00",
+        "seed": 11,
+        "model_arms": [{"provider": "mock", "model_name": "mock-a", "config": {}}],
+    }
+    return client.post("/experiments", json=payload).json()["id"]
+
+
+def test_runs_over_the_same_dataset_share_stored_items(client, db_session):
+    dataset = load_dataset("pr_review/v1.jsonl")
+    experiment_id = _create_experiment(client, max_tasks=len(dataset.rows))
+    for _ in range(3):
+        response = client.post(
+            f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+        )
+        assert response.status_code == 201
+
+    tasks = db_session.scalars(select(TaskInstance)).all()
+    assert len(tasks) == 3 * len(dataset.rows)
+    item_count = db_session.scalar(select(func.count()).select_from(DatasetItem))
+    assert item_count == len(set(dataset.row_digests))
+    assert {task.dataset_item_digest for task in tasks} == set(dataset.row_digests)
+
+    task = tasks[0]
+    row = next(row for row in dataset.rows if row_digest(row) == task.dataset_item_digest)
+    assert task.input_payload == row["input"]
+    assert task.expected_payload == row["expected"]
+    assert task.scoring_details["expected_terms"]
+
+
+def test_row_digest_ignores_row_identity_and_key_order():
+    first = {"id": "a", "input": {"x": 1, "y": 2}, "expected": {"label": "ok"}}
+    second = {"id": "b", "expected": {"label": "ok"}, "input": {"y": 2, "x": 1}}
+    assert row_digest(first) == row_digest(second)
+    assert row_digest(first) != row_digest({**first, "expected": {"label": "no"}})
+
+
+def _planned_task(row: dict) -> TaskInstance:
+    digest = row_digest(row)
+    return TaskInstance(
+        dataset_item_digest=digest,
+        dataset_item=DatasetItem(
+            digest=digest, input_payload=row["input"], expected_payload=row["expected"]
+        ),
+    )
+
+
+def test_items_stored_by_a_concurrent_run_are_reused(db_session):
+    first = {"input": {"diff": "+ retry()"}, "expected": {"label": "ok"}}
+    second = {"input": {"diff": "- retry()"}, "expected": {"label": "no"}}
+    # Another run committed this row after our tasks were planned.
+    assert persist_dataset_items(db_session, [_planned_task(first)]) == 1
+    db_session.commit()
+
+    tasks = [_planned_task(first), _planned_task(second), _planned_task(second)]
+    assert persist_dataset_items(db_session, tasks) == 1
+    db_session.commit()
+
+    assert db_session.scalar(select(func.count()).select_from(DatasetItem)) == 2
+    assert tasks[1].dataset_item is tasks[2].dataset_item
+    assert tasks[0].dataset_item.expected_payload == {"label": "ok"}
@@ -0,0 +1,75 @@
+from sqlalchemy import func, select
+
+from app.models.entities import (
+    Attempt,
+    Experiment,
+    ModelArm,
+    Run,
+    RunArmMetric,
+    Score,
+    TaskInstance,
+)
+
+
+def _create_experiment_with_runs(client, runs: int = 2) -> str:
+    payload = {
+        "name": "Delete Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": "5.00",
+        "seed": 5,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {}},
+            {"provider": "mock", "model_name": "mock-b", "config": {}},
+        ],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    for _ in range(runs):
+        client.post(f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0})
+    return experiment_id
+
+
+def _row_counts(db_session) -> dict:
+    models = (Experiment, ModelArm, Run, TaskInstance, Attempt, Score, RunArmMetric)
+    return {
+        model.__tablename__: db_session.scalar(select(func.count()).select_from(model))
+        for model in models
+    }
+
+
+def test_delete_removes_every_child_row(client, db_session):
+    experiment_id = _create_experiment_with_runs(client)
+    keep_id = _create_experiment_with_runs(client, runs=1)
+    assert _row_counts(db_session)["attempts"] == 18
+
+    response = client.delete(f"/experiments/{experiment_id}")
+
+    assert response.status_code == 204
+    counts = _row_counts(db_session)
+    assert counts == {
+        "experiments": 1,
+        "model_arms": 2,
+        "runs": 1,
+        "task_instances": 3,
+        "attempts": 6,
+        "scores": 6,
+        "run_arm_metrics": 2,
+    }
+    assert client.get(f"/experiments/{keep_id}").status_code == 200
+    assert client.delete(f"/experiments/{experiment_id}").status_code == 404
+
+
+def test_background_delete_reports_progress(client, db_session):
+    experiment_id = _create_experiment_with_runs(client, runs=3)
+
+    response = client.delete(f"/experiments/{experiment_id}", params={"background": True})
+
+    assert response.status_code == 202
+    job = client.get(response.headers["location"]).json()
+    assert job["status"] == "succeeded"
+    assert job["runs_total"] == job["runs_deleted"] == 3
+    assert job["rows_deleted"] > 0
+    assert client.get(f"/experiments/{experiment_id}").status_code == 404
+    assert _row_counts(db_session)["attempts"] == 0
+    assert client.get("/experiments/deletions/missing").status_code == 404
@@ -0,0 +1,127 @@
+import base64
+import json
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.models.entities import Attempt, ProviderType, Run
+from app.providers.tokenizers import get_tokenizer, model_family
+
+COSTS = {"input_cost_per_1k": 0.5, "output_cost_per_1k": 1.5}
+
+
+def _create_experiment(client, budget: str = "5.00", **overrides) -> str:
+    payload = {
+        "name": "Estimate Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": budget,
+        "seed": 8,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {**COSTS, "max_tokens": 64}},
+            {"provider": "mock", "model_name": "mock-b", "config": COSTS},
+        ],
+        **overrides,
+    }
+    return client.post("/experiments", json=payload).json()["id"]
+
+
+def test_estimate_matches_the_run_it_projects(client, db_session):
+    experiment_id = _create_experiment(client)
+
+    first = client.post(f"/experiments/{experiment_id}/estimate", json={}).json()
+    assert first["task_count"] == 3
+    assert first["attempt_count"] == 6
+    assert first["within_budget"] is True
+    by_name = {arm["display_name"]: arm for arm in first["arms"]}
+    # Without history the completion estimate falls back to max_tokens.
+    assert by_name["mock-a"]["completion_tokens"] == 3 * 64
+    assert by_name["mock-a"]["tokenizer"] == "whitespace"
+
+    run_id = client.post(f"/experiments/{experiment_id}/runs", json={}).json()["id"]
+    assert db_session.get(Run, run_id).status.value == "succeeded"
+
+    second = client.post(f"/experiments/{experiment_id}/estimate", json={}).json()
+    actual_prompt_tokens = db_session.scalar(
+        select(func.sum(Attempt.usage_prompt_tokens)).where(Attempt.run_id == run_id)
+    )
+    actual_completion_tokens = db_session.scalar(
+        select(func.sum(Attempt.usage_completion_tokens)).where(Attempt.run_id == run_id)
+    )
+    assert sum(arm["prompt_tokens"] for arm in second["arms"]) == actual_prompt_tokens
+    assert sum(arm["completion_tokens"] for arm in second["arms"]) == actual_completion_tokens
+
+
+def test_runs_projected_over_budget_are_refused(client, db_session):
+    experiment_id = _create_experiment(client, budget="0.0001")
+
+    refused = client.post(f"/experiments/{experiment_id}/runs", json={})
+    assert refused.status_code == 400
+    assert "exceeds the experiment budget" in refused.json()["detail"]
+    assert db_session.scalar(select(func.count()).select_from(Run)) == 0
+
+    forced = client.post(f"/experiments/{experiment_id}/runs", json={"enforce_budget": False})
+    assert forced.status_code == 201
+
+
+def test_estimate_handles_large_datasets_quickly(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "dataset_root", str(tmp_path))
+    path = tmp_path / "large" / "v1.jsonl"
+    path.parent.mkdir()
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(100_000):
+            row = {"id": f"row-{index}", "input": {"prompt": f"Review change {index} please"}}
+            handle.write(json.dumps(row) + "\n")
+    experiment_id = _create_experiment(
+        client, dataset_ref="large/v1.jsonl", sampling={}, budget="100000"
+    )
+
+    started = time.perf_counter()
+    response = client.post(f"/experiments/{experiment_id}/estimate", json={})
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    assert response.json()["attempt_count"] == 200_000
+    assert elapsed < 10
+
+
+def test_tokenizers_are_cached_per_model_family():
+    assert model_family(ProviderType.OPENAI, "gpt-4o-mini") == "o200k_base"
+    assert model_family(ProviderType.OPENAI, "gpt-4-turbo") == "cl100k_base"
+    first = get_tokenizer(ProviderType.OPENAI, "gpt-4o-mini")
+    assert get_tokenizer(ProviderType.OPENAI, "gpt-4o") is first
+    assert first.count_batch(["review this change", ""])[0] > 0
+
+
+def _write_vocab(path, merges: list[bytes]) -> None:
+    # Every single byte plus a few merges: enough for a real BPE encoding of any text.
+    tokens = [bytes([value]) for value in range(256)] + merges
+    lines = [f"{base64.b64encode(token).decode()} {rank}" for rank, token in enumerate(tokens)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_bpe_vocab_is_loaded_from_the_local_vocab_dir(tmp_path, monkeypatch):
+    tiktoken = pytest.importorskip("tiktoken")
+    tiktoken_load = pytest.importorskip("tiktoken.load")
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("tokenizers must not fetch vocab files")
+
+    monkeypatch.setattr(tiktoken, "get_encoding", no_network)
+    monkeypatch.setattr(tiktoken_load, "read_file", no_network)
+    _write_vocab(tmp_path / "cl100k_base.tiktoken", [b"re", b"ch", b" t", b" th"])
+    monkeypatch.setattr(get_settings(), "tokenizer_vocab_dir", str(tmp_path))
+
+    tokenizer = get_tokenizer(ProviderType.OPENAI, "gpt-4-turbo")
+    assert tokenizer.name == "cl100k_base"
+    assert tokenizer.exact
+    # "review" -> re v i e w, " this" -> " th" i s, " change" -> " " ch a n g e
+    assert tokenizer.count("review this change") == 14
+    assert tokenizer.count_batch(["review this change", "re"]) == [14, 1]
+    assert not get_tokenizer(ProviderType.ANTHROPIC, "claude-haiku-4-5").exact
+
+    missing = get_tokenizer(ProviderType.OPENAI, "gpt-4o-mini")
+    assert missing.name == "approximate"
@@ -0,0 +1,67 @@
+import io
+from decimal import Decimal
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pa_ipc = pytest.importorskip("pyarrow.ipc")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _launch_run(client, seed: int) -> str:
+    payload = {
+        "name": f"Export Eval {seed}",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": "5.00",
+        "seed": seed,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {}},
+            {"provider": "mock", "model_name": "mock-b", "config": {}},
+        ],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run = client.post(f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0})
+    return run.json()["id"]
+
+
+def test_parquet_export_covers_many_runs(client):
+    run_ids = [_launch_run(client, 1), _launch_run(client, 2)]
+
+    response = client.get(
+        "/runs/export", params=[("run_id", run_ids[0]), ("run_id", run_ids[1]), ("chunk_size", 100)]
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 12
+    assert set(table.column("run_id").to_pylist()) == set(run_ids)
+    assert table.schema.field("cost_usd").type == pa.decimal128(12, 6)
+    assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+    assert isinstance(table.column("cost_usd")[0].as_py(), Decimal)
+    assert set(table.column("provider").to_pylist()) == {"mock"}
+    assert all(0.0 <= value <= 1.0 for value in table.column("score_quality").to_pylist())
+    assert set(table.column("score_passed").to_pylist()) <= {True, False}
+
+
+def test_arrow_stream_export_is_chunked(client):
+    run_id = _launch_run(client, 3)
+
+    params = {"run_id": run_id, "format": "arrow", "chunk_size": 100}
+    response = client.get("/runs/export", params=params)
+    assert response.status_code == 200
+
+    reader = pa_ipc.open_stream(io.BytesIO(response.content))
+    table = reader.read_all()
+    assert table.num_rows == 6
+    sequence_nos = table.column("sequence_no").to_pylist()
+    assert sequence_nos == sorted(sequence_nos)
+
+
+def test_export_rejects_unknown_runs_and_formats(client):
+    run_id = _launch_run(client, 4)
+
+    assert client.get("/runs/export", params={"run_id": "missing"}).status_code == 404
+    assert client.get("/runs/export", params={"run_id": run_id, "format": "csv"}).status_code == 400
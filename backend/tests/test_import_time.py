@@ -0,0 +1,13 @@
+from benchmarks.import_time import run_benchmark
+
+# app.main took ~3s to import while the provider SDKs loaded eagerly and ~0.8s after.
+# The budget leaves headroom for slower CI machines but still catches an SDK sneaking back.
+IMPORT_TIME_BUDGET_SECONDS = 2.0
+
+
+def test_app_import_stays_within_budget():
+    result = run_benchmark("app.main", repeats=2)
+
+    assert result["eager_deferred_modules"] == []
+    assert result["import_seconds"] < IMPORT_TIME_BUDGET_SECONDS, result["slowest_packages"]
+
@@ -0,0 +1,130 @@
+import json
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.models.entities import Attempt, Run
+from app.providers.mock import MockProvider
+from app.services.dataset_loader import load_dataset, row_digest
+
+
+def _write_rows(path, start: int, stop: int, mode: str = "w") -> None:
+    with path.open(mode, encoding="utf-8") as handle:
+        for index in range(start, stop):
+            row = {
+                "id": f"row-{index}",
+                "input": {"prompt": f"Review change {index} for a missing null guard."},
+                "expected": {"keywords": ["null", "guard", str(index)]},
+            }
+            handle.write(json.dumps(row) + "\n")
+
+
+def _dataset(tmp_path, monkeypatch, rows: int):
+    monkeypatch.setattr(get_settings(), "dataset_root", str(tmp_path))
+    path = tmp_path / "growing" / "v1.jsonl"
+    path.parent.mkdir()
+    _write_rows(path, 0, rows)
+    return path
+
+
+def test_appended_rows_extend_the_cached_bundle(tmp_path, monkeypatch):
+    path = _dataset(tmp_path, monkeypatch, rows=3)
+    first = load_dataset("growing/v1.jsonl")
+    first_digests = first.row_digests
+
+    _write_rows(path, 3, 5, mode="a")
+    grown = load_dataset("growing/v1.jsonl")
+
+    assert grown.dataset_hash != first.dataset_hash
+    assert grown.rows[:3] == first.rows
+    assert [row["id"] for row in grown.rows[3:]] == ["row-3", "row-4"]
+    assert grown.row_digests[:3] == first_digests
+    assert grown.row_digests == [row_digest(row) for row in grown.rows]
+
+
+def test_incremental_run_only_generates_for_new_rows(client, db_session, tmp_path, monkeypatch):
+    path = _dataset(tmp_path, monkeypatch, rows=3)
+    calls: Counter = Counter()
+    original = MockProvider.generate
+
+    def counting_generate(self, task_input, model_config):
+        calls[model_config["model_name"]] += 1
+        return original(self, task_input, model_config)
+
+    monkeypatch.setattr(MockProvider, "generate", counting_generate)
+    payload = {
+        "name": "Incremental Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "growing/v1.jsonl",
+        "sampling": {},
+        "budget_usd": "5.00",
+        "seed": 2,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {}},
+            {"provider": "mock", "model_name": "mock-b", "config": {}},
+        ],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    first_run_id = client.post(f"/experiments/{experiment_id}/runs", json={}).json()["id"]
+    assert calls == {"mock-a": 3, "mock-b": 3}
+
+    _write_rows(path, 3, 5, mode="a")
+    calls.clear()
+    response = client.post(f"/experiments/{experiment_id}/runs", json={"incremental": True})
+    assert response.status_code == 201
+    second_run_id = response.json()["id"]
+
+    assert calls == {"mock-a": 2, "mock-b": 2}
+    count = select(func.count()).select_from(Attempt).where(Attempt.run_id == second_run_id)
+    assert db_session.scalar(count) == 10
+    summary = db_session.get(Run, second_run_id).summary_json
+    assert summary["total_attempts"] == 10
+    assert summary["incremental"] == {
+        "covered_attempts": 6,
+        "new_attempts": 4,
+        "source_run_ids": [first_run_id],
+    }
+
+
+def test_incremental_run_covers_every_arm_sharing_a_fingerprint(
+    client, db_session, tmp_path, monkeypatch
+):
+    path = _dataset(tmp_path, monkeypatch, rows=3)
+    arm = {"provider": "mock", "model_name": "mock-a", "config": {}}
+    payload = {
+        "name": "Duplicate Arms Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "growing/v1.jsonl",
+        "sampling": {},
+        "budget_usd": "5.00",
+        "seed": 2,
+        "model_arms": [{**arm, "display_name": "first"}, {**arm, "display_name": "second"}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    client.post(f"/experiments/{experiment_id}/runs", json={})
+
+    _write_rows(path, 3, 4, mode="a")
+    response = client.post(f"/experiments/{experiment_id}/runs", json={"incremental": True})
+    assert response.status_code == 201
+
+    summary = db_session.get(Run, response.json()["id"]).summary_json
+    assert summary["incremental"]["covered_attempts"] == 6
+    assert summary["incremental"]["new_attempts"] == 2
+
+
+def test_incremental_runs_reject_adaptive_sampling(client):
+    payload = {
+        "name": "Adaptive Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"mode": "adaptive", "batch_size": 2},
+        "budget_usd": "5.00",
+        "seed": 2,
+        "model_arms": [{"provider": "mock", "model_name": "mock-a", "config": {}}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+
+    response = client.post(f"/experiments/{experiment_id}/runs", json={"incremental": True})
+
+    assert response.status_code == 400
@@ -0,0 +1,68 @@
+import json
+import logging
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.logging import JsonLogFormatter
+from app.core.serialization import dumps, loads
+from app.models.entities import Attempt, Run
+from app.schemas.runs import AttemptResponse
+from benchmarks.json_serialization import run_benchmark
+
+
+def test_list_attempts_body_matches_the_response_model(client, db_session):
+    payload = {
+        "name": "Serialization Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": "5.00",
+        "seed": 3,
+        "model_arms": [{"provider": "mock", "model_name": "mock-a", "config": {}}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run_id = client.post(f"/experiments/{experiment_id}/runs", json={}).json()["id"]
+
+    response = client.get(f"/runs/{run_id}/attempts")
+
+    assert response.status_code == 200
+    attempts = db_session.scalars(
+        select(Attempt).where(Attempt.run_id == run_id).order_by(Attempt.created_at)
+    ).all()
+    expected = TypeAdapter(list[AttemptResponse]).dump_json(
+        [AttemptResponse.model_validate(attempt) for attempt in attempts]
+    )
+    assert response.content == expected
+    assert db_session.get(Run, run_id).summary_json["total_attempts"] == 3
+
+
+def test_serializer_matches_pydantic_conventions():
+    value = {
+        "cost_usd": Decimal("0.000123"),
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        1: "non-string key",
+    }
+    assert loads(dumps(value)) == {
+        "cost_usd": "0.000123",
+        "created_at": "2026-01-02T03:04:05Z",
+        "1": "non-string key",
+    }
+
+
+def test_log_lines_are_json():
+    record = logging.LogRecord("modeleval.api", logging.INFO, __file__, 0, "hello", None, None)
+    record.correlation_id = "abc"
+    line = json.loads(JsonLogFormatter().format(record))
+    assert line["message"] == "hello"
+    assert line["correlation_id"] == "abc"
+
+
+def test_json_serialization_benchmark_reports_timings(tmp_path):
+    result = run_benchmark(attempts=50, repeats=1, workdir=tmp_path)
+
+    assert result["response_bytes"] > 0
+    assert result["list_attempts"]["orjson_seconds"] > 0
+    assert set(result["log_lines"]) == {"stdlib_seconds", "orjson_seconds"}
@@ -0,0 +1,48 @@
+from app.models.entities import RunArmMetric
+
+
+def _sample_payload() -> dict:
+    return {
+        "name": "Leaderboard Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 2},
+        "budget_usd": "5.00",
+        "seed": 9,
+        "model_arms": [
+            {
+                "provider": "mock",
+                "model_name": "mock-cheap",
+                "display_name": "Mock Cheap",
+                "config": {"input_cost_per_1k": 0.001, "output_cost_per_1k": 0.001},
+            },
+            {
+                "provider": "mock",
+                "model_name": "mock-pricey",
+                "display_name": "Mock Pricey",
+                "config": {"input_cost_per_1k": 0.01, "output_cost_per_1k": 0.03},
+            },
+        ],
+    }
+
+
+def test_leaderboards_rank_arms_across_runs(client, db_session):
+    experiment_id = client.post("/experiments", json=_sample_payload()).json()["id"]
+    run_ids = [
+        client.post(
+            f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+        ).json()["id"]
+        for _ in range(2)
+    ]
+    assert db_session.query(RunArmMetric).count() == 4
+
+    response = client.get("/leaderboards", params={"experiment_id": experiment_id})
+    assert response.status_code == 200
+    body = response.json()
+    assert [entry["model_name"] for entry in body["cost"]] == ["mock-cheap", "mock-pricey"]
+    assert all(entry["run_count"] == 2 for entry in body["quality"])
+    assert all(entry["attempt_count"] == 4 for entry in body["quality"])
+    assert [entry["rank"] for entry in body["speed"]] == [1, 2]
+
+    scoped = client.get("/leaderboards", params={"run_id": run_ids[0]}).json()
+    assert all(entry["run_count"] == 1 for entry in scoped["quality"])
@@ -0,0 +1,48 @@
+from app.core.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(
+        Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    )
+    histogram.observe(0.05, stage="a")
+    histogram.observe(0.5, stage="a")
+    histogram.observe(5.0, stage="a")
+
+    rendered = registry.render()
+    assert "# TYPE demo_seconds histogram" in rendered
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in rendered
+    assert 'demo_seconds_bucket{stage="a",le="1"} 2' in rendered
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 3' in rendered
+    assert 'demo_seconds_count{stage="a"} 3' in rendered
+
+
+def test_metrics_endpoint_exposes_pipeline_metrics(client):
+    payload = {
+        "name": "Metrics Eval",
+        "workload_type": "ci_triage",
+        "dataset_ref": "ci_triage/v1.jsonl",
+        "sampling": {"max_tasks": 2},
+        "budget_usd": "5.00",
+        "seed": 1,
+        "model_arms": [{"provider": "mock", "model_name": "mock-metrics", "config": {}}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run_id = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+    ).json()["id"]
+    client.get(f"/runs/{run_id}/summary")
+    client.get(f"/runs/{run_id}/summary")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'modeleval_provider_latency_seconds_count{provider="mock",model="mock-metrics"}' in body
+    assert 'modeleval_run_stage_duration_seconds_count{stage="generation"}' in body
+    assert 'modeleval_db_operation_duration_seconds_count{operation="commit"}' in body
+    assert 'modeleval_cache_requests_total{cache="run_summary",result="hit"}' in body
+    assert 'route="/runs/{run_id}/summary"' in body
+    assert "modeleval_inflight_attempts 0" in body
+    assert "modeleval_pending_tasks 0" in body
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.models.entities import Run
+from app.services.partitions import (
+    add_months,
+    apply_retention,
+    ensure_partitions,
+    expired_partitions,
+    parse_partition,
+    partition_name,
+    run_partition_floor,
+)
+
+
+def test_partition_names_round_trip():
+    month = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    name = partition_name("attempts", month)
+
+    assert name == "attempts_p2026_01"
+    partition = parse_partition(name)
+    assert partition.table == "attempts"
+    assert partition.upper_bound == datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert parse_partition("attempts_default") is None
+    assert parse_partition("runs_p2026_01") is None
+    assert add_months(datetime(2025, 11, 30), 3) == datetime(2026, 2, 1)
+
+
+def test_retention_selects_only_fully_expired_months():
+    partitions = [parse_partition(f"scores_p2026_{month:02d}") for month in range(1, 11)]
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+    expired = expired_partitions(partitions, retain_months=3, now=now)
+
+    assert [partition.name for partition in expired] == [
+        "scores_p2026_01",
+        "scores_p2026_02",
+        "scores_p2026_03",
+        "scores_p2026_04",
+        "scores_p2026_05",
+        "scores_p2026_06",
+    ]
+
+
+def test_run_floor_starts_at_the_partition_boundary():
+    run = Run(created_at=datetime(2026, 10, 19, 14, 30, tzinfo=timezone.utc))
+    assert run_partition_floor(run) == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert run_partition_floor(Run()) is None
+
+
+def test_partition_maintenance_is_a_noop_without_postgres(db_session):
+    assert ensure_partitions(db_session) == []
+    assert apply_retention(db_session, retain_months=6) == []
+
+
+class _RecordingSession:
+    def __init__(self, existing, stranded):
+        self.existing = set(existing)
+        self.stranded = stranded
+        self.statements: list[str] = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "to_regclass" in sql:
+            return SimpleNamespace(scalar=lambda: params["name"] in self.existing)
+        if "date_trunc" in sql:
+            table = sql.rsplit(" ", 1)[-1].removesuffix("_default")
+            return SimpleNamespace(scalars=lambda: iter(self.stranded.get(table, [])))
+        self.statements.append(sql)
+        return SimpleNamespace()
+
+    def commit(self):
+        pass
+
+
+def test_missing_months_move_their_rows_out_of_the_default_partition():
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    existing = {"attempts_default", "scores_default", "attempts_p2026_11", "scores_p2026_10"}
+    existing |= {f"{table}_p2026_12" for table in ("attempts", "scores")}
+    session = _RecordingSession(existing, {"attempts": [datetime(2026, 9, 3, 12)]})
+
+    ensured = ensure_partitions(session, months_ahead=2, now=now)
+
+    assert ensured[:4] == [
+        "attempts_p2026_09",
+        "attempts_p2026_10",
+        "attempts_p2026_11",
+        "attempts_p2026_12",
+    ]
+    detach, create, move, delete, attach, *created = session.statements
+    assert detach == "ALTER TABLE attempts DETACH PARTITION attempts_default"
+    assert create.startswith("CREATE TABLE IF NOT EXISTS attempts_p2026_09 PARTITION OF attempts")
+    assert move.startswith("INSERT INTO attempts_p2026_09 SELECT * FROM attempts_default WHERE")
+    assert delete.startswith("DELETE FROM attempts_default WHERE created_at >= '2026-09-01'")
+    assert attach == "ALTER TABLE attempts ATTACH PARTITION attempts_default DEFAULT"
+    assert [statement.split(" PARTITION OF")[0] for statement in created] == [
+        "CREATE TABLE IF NOT EXISTS attempts_p2026_10",
+        "CREATE TABLE IF NOT EXISTS scores_p2026_11",
+    ]
@@ -0,0 +1,21 @@
+from app.core.config import get_settings
+from benchmarks.pipeline import Scenario, run_scenario
+
+
+def test_pipeline_benchmark_reports_throughput_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "dataset_root", str(tmp_path))
+    scenario = Scenario(
+        database_url=f"sqlite+pysqlite:///{tmp_path / 'bench.db'}",
+        attempts=20,
+        arms=2,
+        error_rate=0.5,
+    )
+
+    result = run_scenario(scenario, tmp_path)
+
+    assert result["backend"] == "sqlite"
+    assert result["executed_attempts"] == 20
+    assert 0 < result["errors"] < 20
+    assert result["attempts_per_second"] > 0
+    assert result["statements_per_attempt"] > 0
+    assert result["peak_rss_mb"] > 0
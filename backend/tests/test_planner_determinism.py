@@ -1,6 +1,10 @@
+import time
+
+import pytest
+
 from app.models.entities import Experiment, Run, WorkloadType
 from app.services.dataset_loader import DatasetBundle
-from app.services.planner import plan_task_instances
+from app.services.planner import plan_task_instances, select_row_indexes
 
 
 def test_planner_is_deterministic():
@@ -28,3 +32,69 @@ def test_planner_is_deterministic():
     task_ids_2 = [task.dataset_item_id for task in plan_task_instances(experiment, run_2, dataset)]
 
     assert task_ids_1 == task_ids_2
+
+
+def _imbalanced_dataset() -> DatasetBundle:
+    rows = [
+        {
+            "id": f"row-{i}",
+            "input": {"prompt": str(i)},
+            "expected": {"label": "common" if i % 10 else "rare"},
+        }
+        for i in range(100)
+    ]
+    return DatasetBundle(dataset_ref="test", dataset_hash="imbalanced", rows=rows)
+
+
+def test_stratified_sampling_balances_labels_deterministically():
+    dataset = _imbalanced_dataset()
+    sampling = {
+        "max_tasks": 20,
+        "strategy": "stratified",
+        "stratify_by": "expected.label",
+        "allocation": "equal",
+    }
+
+    first = select_row_indexes(dataset, sampling, seed=3)
+    second = select_row_indexes(dataset, sampling, seed=3)
+    assert first == second
+    assert len(set(first)) == 20
+    labels = [dataset.rows[index]["expected"]["label"] for index in first]
+    assert labels.count("rare") == 10
+
+    proportional = select_row_indexes(dataset, {**sampling, "allocation": "proportional"}, seed=3)
+    labels = [dataset.rows[index]["expected"]["label"] for index in proportional]
+    assert labels.count("rare") == 2
+
+
+def test_weighted_sampling_skips_zero_weight_rows():
+    rows = [{"id": str(i), "weight": 0 if i % 2 else 5} for i in range(40)]
+    dataset = DatasetBundle(dataset_ref="test", dataset_hash="weighted", rows=rows)
+
+    sparse = select_row_indexes(dataset, {"max_tasks": 5, "strategy": "weighted"}, seed=11)
+    dense = select_row_indexes(dataset, {"max_tasks": 30, "strategy": "weighted"}, seed=11)
+    assert sparse == select_row_indexes(dataset, {"max_tasks": 5, "strategy": "weighted"}, seed=11)
+    assert len(set(sparse)) == 5
+    assert len(dense) == 20
+    assert all(index % 2 == 0 for index in sparse + dense)
+
+
+@pytest.mark.parametrize("weight", [float("nan"), float("inf"), "2.5", True, -1])
+def test_weighted_sampling_rejects_invalid_weights(weight):
+    rows = [{"id": str(i), "weight": 1} for i in range(5)] + [{"id": "bad", "weight": weight}]
+    dataset = DatasetBundle(dataset_ref="test", dataset_hash=f"invalid-{weight!r}", rows=rows)
+
+    with pytest.raises(ValueError, match="sampling weight in field 'weight'"):
+        select_row_indexes(dataset, {"max_tasks": 3, "strategy": "weighted"}, seed=1)
+
+
+def test_weighted_sampling_handles_heavily_skewed_weights():
+    rows = [{"id": "heavy", "weight": 1e9}] + [{"id": str(i), "weight": 1} for i in range(999)]
+    dataset = DatasetBundle(dataset_ref="test", dataset_hash="skewed", rows=rows)
+
+    started = time.perf_counter()
+    selected = select_row_indexes(dataset, {"max_tasks": 400, "strategy": "weighted"}, seed=5)
+
+    assert time.perf_counter() - started < 1.0
+    assert len(selected) == len(set(selected)) == 400
+    assert 0 in selected
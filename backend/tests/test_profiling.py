@@ -0,0 +1,111 @@
+import json
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import execution
+from app.services.profiling import (
+    PROFILE_ARTIFACTS,
+    ProfilingBusyError,
+    profile_run,
+    profile_worker,
+    profiling_active,
+)
+
+
+def test_profiled_run_exposes_downloadable_artifacts(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "profile_root", str(tmp_path))
+    payload = {
+        "name": "Profile Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 2},
+        "budget_usd": "5.00",
+        "seed": 8,
+        "model_arms": [{"provider": "mock", "model_name": "mock-a", "config": {}}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run_id = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0, "profile": True}
+    ).json()["id"]
+
+    listing = client.get(f"/runs/{run_id}/profile")
+    assert listing.status_code == 200
+    names = {artifact["name"] for artifact in listing.json()}
+    assert set(PROFILE_ARTIFACTS) <= names
+
+    report = client.get(f"/runs/{run_id}/profile/cpu.txt")
+    assert report.status_code == 200
+    assert "execute_run" in report.text
+    assert pstats.Stats(str(tmp_path / run_id / "cpu.pstats")).total_calls > 0
+    assert client.get(f"/runs/{run_id}/profile/secrets.txt").status_code == 404
+
+    unprofiled = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+    ).json()
+    assert client.get(f"/runs/{unprofiled['id']}/profile").status_code == 404
+
+
+def test_only_one_run_is_profiled_at_a_time(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "profile_root", str(tmp_path))
+    payload = {
+        "name": "Profile Lock Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 2},
+        "budget_usd": "5.00",
+        "seed": 8,
+        "model_arms": [{"provider": "mock", "model_name": "mock-a", "config": {}}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+
+    with profile_run("in-progress"):
+        assert profiling_active()
+        with pytest.raises(ProfilingBusyError), profile_run("second"):
+            pass
+        response = client.post(
+            f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0, "profile": True}
+        )
+        assert response.status_code == 409
+        unprofiled = client.post(
+            f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+        )
+        assert unprofiled.status_code == 201
+
+    assert not profiling_active()
+    response = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0, "profile": True}
+    )
+    assert response.status_code == 201
+
+
+def _spin() -> int:
+    return sum(range(1000))
+
+
+def test_work_on_other_threads_is_merged_into_the_cpu_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "profile_root", str(tmp_path))
+
+    def in_worker() -> int:
+        with profile_worker():
+            return _spin()
+
+    async def on_generation_loop() -> int:
+        with profile_worker():
+            return _spin()
+
+    in_worker()
+    with profile_run("threads"):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(in_worker).result()
+        execution._run_on_generation_loop(on_generation_loop())
+        in_worker()
+
+    stats = pstats.Stats(str(tmp_path / "threads" / "cpu.pstats"))
+    spin_calls = [calls for (_, _, name), (_, calls, *_) in stats.stats.items() if name == "_spin"]
+    assert spin_calls == [3]
+    metadata = json.loads((tmp_path / "threads" / "profile.json").read_text())
+    assert metadata["worker_profiles"] == 2
+    assert "merged from 3 thread profiles" in (tmp_path / "threads" / "cpu.txt").read_text()
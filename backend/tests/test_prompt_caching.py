@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.models.entities import Attempt, Run
+from app.providers import anthropic_provider
+from app.providers.anthropic_provider import AnthropicProvider
+from app.providers.costs import estimate_cost_usd
+
+
+def test_cached_tokens_are_priced_at_their_own_rates():
+    config = {
+        "input_cost_per_1k": 1.0,
+        "output_cost_per_1k": 2.0,
+        "cache_read_cost_per_1k": 0.1,
+        "cache_write_cost_per_1k": 1.25,
+    }
+    assert estimate_cost_usd(3000, 1000, config) == pytest.approx(5.0)
+    assert estimate_cost_usd(3000, 1000, config, cache_read_tokens=2000) == pytest.approx(3.2)
+    assert estimate_cost_usd(3000, 1000, config, cache_write_tokens=2000) == pytest.approx(5.5)
+    # Without cache rates, cached tokens cost the same as any other input token.
+    plain = {"input_cost_per_1k": 1.0, "output_cost_per_1k": 2.0}
+    assert estimate_cost_usd(3000, 1000, plain, cache_read_tokens=2000) == 5.0
+
+
+def test_anthropic_marks_the_system_prompt_cacheable(monkeypatch):
+    requests = []
+
+    class FakeMessages:
+        def create(self, **kwargs):
+            requests.append(kwargs)
+            usage = SimpleNamespace(
+                input_tokens=10,
+                output_tokens=5,
+                cache_read_input_tokens=900,
+                cache_creation_input_tokens=0,
+            )
+            content = [SimpleNamespace(type="text", text="ok")]
+            message = SimpleNamespace(
+                content=content, usage=usage, model_dump=lambda: {"content": "ok"}
+            )
+            return SimpleNamespace(parse=lambda: message, retries_taken=0)
+
+        @property
+        def with_raw_response(self):
+            return self
+
+    monkeypatch.setattr(
+        anthropic_provider,
+        "_client",
+        lambda api_key, base_url=None: SimpleNamespace(messages=FakeMessages()),
+    )
+    provider = AnthropicProvider()
+    provider._api_key = "test-key"
+    config = {
+        "model_name": "claude-test",
+        "system_prompt": "You review pull requests.",
+        "prompt_caching": True,
+        "input_cost_per_1k": 1.0,
+        "cache_read_cost_per_1k": 0.1,
+    }
+
+    result = provider.generate(task_input="Review this diff", model_config=config)
+
+    assert result.error is None
+    assert requests[0]["system"] == [
+        {
+            "type": "text",
+            "text": "You review pull requests.",
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert result.usage.prompt_tokens == 910
+    assert result.usage.cache_read_tokens == 900
+    assert result.cost_usd == pytest.approx(0.1)
+
+
+def test_cached_prefix_tokens_are_recorded_on_attempts(client, db_session):
+    config = {
+        "system_prompt": "You are a meticulous reviewer of pull requests for null safety.",
+        "prompt_caching": True,
+        "input_cost_per_1k": 1.0,
+        "cache_read_cost_per_1k": 0.1,
+    }
+    payload = {
+        "name": "Caching Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 3},
+        "budget_usd": "5.00",
+        "seed": 4,
+        "model_arms": [{"provider": "mock", "model_name": "mock-cached", "config": config}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run_id = client.post(f"/experiments/{experiment_id}/runs", json={}).json()["id"]
+
+    attempts = db_session.scalars(select(Attempt).where(Attempt.run_id == run_id)).all()
+    writes = [attempt.usage_cache_write_tokens for attempt in attempts]
+    reads = [attempt.usage_cache_read_tokens for attempt in attempts]
+    assert sorted(writes, reverse=True) == [11, 0, 0]
+    assert sorted(reads) == [0, 11, 11]
+
+    arm = db_session.get(Run, run_id).summary_json["models"][0]
+    assert arm["cache_read_tokens"] == 22
+    assert arm["cache_write_tokens"] == 11
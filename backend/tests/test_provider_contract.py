@@ -14,3 +14,25 @@ def test_mock_provider_contract():
     assert result.usage.total_tokens == result.usage.prompt_tokens + result.usage.completion_tokens
     assert result.latency_ms >= 1
     assert result.cost_usd >= 0
+
+
+def test_mock_provider_injects_latency_errors_and_token_counts():
+    provider = MockProvider()
+    config = {
+        "model_name": "mock-slow",
+        "mock_latency_ms": 5,
+        "mock_latency_distribution": "fixed",
+        "mock_completion_tokens": 64,
+        "mock_seed": 1,
+    }
+    result = provider.generate(task_input="Classify this CI failure", model_config=config)
+    assert result.error is None
+    assert result.latency_ms >= 5
+    assert result.usage.completion_tokens == 64
+
+    failing = provider.generate(
+        task_input="anything", model_config={**config, "mock_error_rate": 1.0}
+    )
+    assert failing.error is not None
+    assert failing.raw_output is None
+    assert failing.cost_usd == 0
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+from importlib.metadata import EntryPoint
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.entities import Attempt
+from app.providers import openai_provider
+from app.providers import registry as registry_module
+from app.providers.base import (
+    AsyncClientCache,
+    ModelProvider,
+    ProviderCapabilities,
+    ProviderResult,
+    ProviderUsage,
+)
+from app.providers.mock import MockProvider
+from app.providers.openai_provider import OpenAIProvider
+from app.providers.registry import ENTRY_POINT_GROUP, ProviderRegistry, get_registry
+from app.services import execution
+from benchmarks.standin_server import StandinConfig, running_server
+
+
+def _result(task_input: str) -> ProviderResult:
+    return ProviderResult(
+        raw_output=f"echo: {task_input[:40]}",
+        usage=ProviderUsage(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+        latency_ms=1,
+        cost_usd=0.0,
+        raw_response={"provider": "echo"},
+    )
+
+
+class BatchEchoProvider(ModelProvider):
+    capabilities = ProviderCapabilities(supports_batch=True, supports_async=True)
+
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    def generate(self, task_input, model_config):
+        raise AssertionError("batch-capable providers should not be called one task at a time")
+
+    def generate_batch(self, task_inputs, model_config):
+        self.batches.append(len(task_inputs))
+        return [_result(task_input) for task_input in task_inputs]
+
+
+class AsyncEchoProvider(ModelProvider):
+    capabilities = ProviderCapabilities(supports_async=True)
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate(self, task_input, model_config):
+        raise AssertionError("async-capable providers should not block per task")
+
+    async def agenerate(self, task_input, model_config):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return _result(task_input)
+
+
+@pytest.fixture
+def plugin_provider():
+    registry = get_registry()
+    registered: list[str] = []
+
+    def register(name: str, factory) -> ModelProvider:
+        registry.register(name, factory)
+        registered.append(name)
+        return registry.get(name)
+
+    yield register
+    for name in registered:
+        registry.unregister(name)
+
+
+def _run_experiment(client, provider: str, config: dict, max_tasks: int = 4) -> dict:
+    payload = {
+        "name": f"{provider} plugin",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": max_tasks},
+        "budget_usd": "5.00",
+        "seed": 3,
+        "model_arms": [{"provider": provider, "model_name": f"{provider}-1", "config": config}],
+    }
+    created = client.post("/experiments", json=payload)
+    assert created.status_code == 201
+    run = client.post(
+        f"/experiments/{created.json()['id']}/runs", json={"failure_threshold": 1.0}
+    )
+    assert run.status_code == 201
+    return run.json()
+
+
+def test_builtin_providers_are_registered_as_singletons(client):
+    registry = get_registry()
+    assert {"openai", "anthropic", "mock"} <= set(registry.names())
+    assert registry.get("mock") is registry.get("mock")
+    assert isinstance(registry.get("mock"), MockProvider)
+    assert registry.capabilities("openai").supports_async
+    assert not registry.capabilities("mock").supports_async
+
+    response = client.get("/providers")
+    assert response.status_code == 200
+    providers = {item["name"]: item for item in response.json()}
+    assert providers["anthropic"]["supports_prompt_caching"] is True
+    assert providers["mock"]["supports_batch"] is False
+
+
+def test_entry_points_add_providers_without_shadowing_builtins(monkeypatch):
+    entry_points = [
+        EntryPoint(
+            name="echo",
+            value="app.providers.openai_provider:OpenAIProvider",
+            group=ENTRY_POINT_GROUP,
+        ),
+        EntryPoint(
+            name="mock",
+            value="app.providers.anthropic_provider:AnthropicProvider",
+            group=ENTRY_POINT_GROUP,
+        ),
+    ]
+    monkeypatch.setattr(registry_module, "_provider_entry_points", lambda: entry_points)
+    registry = ProviderRegistry.discover()
+
+    assert "echo" in registry.names()
+    assert isinstance(registry.get("echo"), OpenAIProvider)
+    assert isinstance(registry.get("mock"), MockProvider)
+
+
+def test_unknown_provider_is_rejected(client):
+    payload = {
+        "name": "Unknown provider",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "budget_usd": "5.00",
+        "model_arms": [{"provider": "azure_openai", "model_name": "gpt-4o", "config": {}}],
+    }
+    response = client.post("/experiments", json=payload)
+    assert response.status_code == 422
+    assert "provider must be one of" in response.text
+
+
+def test_batch_capable_provider_generates_each_chunk_in_one_call(
+    client, db_session, plugin_provider
+):
+    provider = plugin_provider("echo_batch", BatchEchoProvider)
+    run = _run_experiment(client, "echo_batch", {})
+
+    assert run["status"] == "succeeded"
+    assert provider.batches == [4]
+    attempts = db_session.scalar(
+        select(func.count()).select_from(Attempt).where(Attempt.run_id == run["id"])
+    )
+    assert attempts == 4
+
+
+def test_async_capable_provider_runs_attempts_concurrently(client, db_session, plugin_provider):
+    provider = plugin_provider("echo_async", AsyncEchoProvider)
+    run = _run_experiment(client, "echo_async", {"max_concurrency": 2}, max_tasks=5)
+
+    assert run["status"] == "succeeded"
+    assert provider.max_in_flight == 2
+    outputs = db_session.scalars(
+        select(Attempt.raw_output).where(Attempt.run_id == run["id"])
+    ).all()
+    assert len(outputs) == 5
+    assert all(output.startswith("echo: ") for output in outputs)
+
+
+def test_async_clients_are_reused_across_chunks_and_runs(
+    client, db_session, plugin_provider, monkeypatch
+):
+    created = []
+
+    def counting_async_client(api_key, base_url=None):
+        sdk_client = openai_provider._async_client(api_key, base_url)
+        created.append(sdk_client)
+        return sdk_client
+
+    monkeypatch.setattr(execution, "GENERATION_CHUNK_SIZE", 2)
+    with running_server(StandinConfig(latency_ms=1)) as base_url:
+        provider = plugin_provider(
+            "standin_openai",
+            lambda: OpenAIProvider(api_key="standin", base_url=f"{base_url}/v1"),
+        )
+        provider._async_clients = AsyncClientCache(
+            lambda: counting_async_client("standin", f"{base_url}/v1")
+        )
+        for _ in range(2):
+            run = _run_experiment(client, "standin_openai", {}, max_tasks=5)
+            assert run["status"] == "succeeded"
+            errors = db_session.scalars(
+                select(Attempt.error_message).where(Attempt.run_id == run["id"])
+            ).all()
+            assert errors == [None] * 5
+        execution._run_on_generation_loop(provider._async_clients.aclose())
+
+    assert len(created) == 1
+
+
+def test_replaced_async_client_is_closed():
+    closed = []
+
+    class FakeClient:
+        async def close(self):
+            closed.append(self)
+
+    cache = AsyncClientCache(FakeClient)
+
+    async def get_twice():
+        return await cache.get(), await cache.get()
+
+    first, again = asyncio.run(get_twice())
+    assert first is again
+    second, _ = asyncio.run(get_twice())
+    assert second is not first
+    assert closed == [first]
@@ -0,0 +1,88 @@
+import gzip
+
+import pytest
+from sqlalchemy import event
+
+from app.core.compression import CompressionMiddleware, accepted_encodings
+
+
+def _launch_run(client) -> tuple[str, str]:
+    payload = {
+        "name": "Compression Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 5},
+        "budget_usd": "5.00",
+        "seed": 5,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {}},
+            {"provider": "mock", "model_name": "mock-b", "config": {}},
+        ],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run_id = client.post(f"/experiments/{experiment_id}/runs", json={}).json()["id"]
+    return experiment_id, run_id
+
+
+def test_large_responses_are_gzipped_and_small_ones_are_not(client):
+    _, run_id = _launch_run(client)
+
+    response = client.get(
+        f"/runs/{run_id}/attempts", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert len(response.json()) == 10
+
+    small = client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    plain = client.get(f"/runs/{run_id}/attempts", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert len(gzip.compress(plain.content)) < len(plain.content)
+
+
+def test_brotli_is_preferred_when_installed(client):
+    pytest.importorskip("brotli")
+    _, run_id = _launch_run(client)
+
+    response = client.get(f"/runs/{run_id}/attempts", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_accept_encoding_parsing_skips_refused_codings():
+    assert accepted_encodings("gzip;q=1.0, br;q=0") == {"gzip"}
+    assert CompressionMiddleware(app=None).minimum_size == 1024
+
+
+def test_fields_limit_the_selected_columns(client, db_session):
+    experiment_id, run_id = _launch_run(client)
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(
+            f"/runs/{run_id}/attempts", params={"fields": "cost_usd,id,latency_ms"}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    assert list(response.json()[0]) == ["id", "latency_ms", "cost_usd"]
+    attempt_queries = [statement for statement in statements if "FROM attempts" in statement]
+    assert attempt_queries and all("raw_output" not in query for query in attempt_queries)
+
+    experiments = client.get("/experiments", params={"fields": "name,model_arms"}).json()
+    assert list(experiments[0]) == ["name", "model_arms"]
+    assert [arm["model_name"] for arm in experiments[0]["model_arms"]] == ["mock-a", "mock-b"]
+    single = client.get(f"/experiments/{experiment_id}", params={"fields": "budget_usd"})
+    assert single.json() == {"budget_usd": "5.0000"}
+
+    assert client.get(f"/runs/{run_id}/attempts", params={"fields": "nope"}).status_code == 400
+    missing = client.get("/experiments/missing", params={"fields": "name"})
+    assert missing.status_code == 404
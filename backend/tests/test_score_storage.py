@@ -0,0 +1,44 @@
+from sqlalchemy import func, select, text
+
+from app.models.entities import Score, TaskInstance
+from benchmarks.score_storage import run_benchmark
+
+
+def test_run_writes_one_score_row_per_attempt_and_compat_view(client, db_session):
+    payload = {
+        "name": "Pivot Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 2},
+        "budget_usd": "5.00",
+        "seed": 3,
+        "model_arms": [
+            {"provider": "mock", "model_name": "mock-a", "config": {}},
+            {"provider": "mock", "model_name": "mock-b", "config": {}},
+        ],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run = client.post(f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0})
+    run_id = run.json()["id"]
+
+    assert db_session.scalar(select(func.count()).select_from(Score)) == 4
+    tasks = db_session.scalars(select(TaskInstance).where(TaskInstance.run_id == run_id)).all()
+    assert all(task.scoring_details["expected_terms"] for task in tasks)
+
+    rows = db_session.execute(
+        text(
+            "SELECT metric_name, count(*) FROM score_metrics "
+            "WHERE run_id = :run_id GROUP BY metric_name"
+        ),
+        {"run_id": run_id},
+    ).all()
+    assert dict(rows) == {"pass": 4, "quality": 4}
+
+
+def test_score_storage_benchmark_reports_smaller_pivoted_table(tmp_path):
+    result = run_benchmark(attempts=400, workdir=tmp_path, repeats=1)
+
+    assert result["long"]["rows"] == 800
+    assert result["pivoted"]["rows"] == 400
+    assert result["pivoted"]["bytes"] < result["long"]["bytes"]
+    assert result["aggregation_speedup"] > 0
@@ -1,5 +1,5 @@
-from app.models.entities import Attempt, TaskInstance, WorkloadType
-from app.services.scorer import score_attempt
+from app.models.entities import Attempt, DatasetItem, TaskInstance, WorkloadType
+from app.services.scorer import metric_value, score_attempt
 
 
 def test_scorer_is_stable_for_expected_keywords():
@@ -9,9 +9,13 @@ def test_scorer_is_stable_for_expected_keywords():
         experiment_id="exp-1",
         sequence_no=1,
         dataset_item_id="item-1",
+        dataset_item_digest="digest-1",
         workload_type=WorkloadType.PR_REVIEW,
-        input_payload={"prompt": "Analyze risk"},
-        expected_payload={"keywords": ["null", "guard", "profile"]},
+        dataset_item=DatasetItem(
+            digest="digest-1",
+            input_payload={"prompt": "Analyze risk"},
+            expected_payload={"keywords": ["null", "guard", "profile"]},
+        ),
     )
     attempt = Attempt(
         id="att-1",
@@ -19,7 +23,6 @@ def test_scorer_is_stable_for_expected_keywords():
         task_instance_id="task-1",
         model_arm_id="arm-1",
         raw_output="Add a null guard around profile access.",
-        raw_response={},
         usage_prompt_tokens=10,
         usage_completion_tokens=20,
         usage_total_tokens=30,
@@ -27,10 +30,12 @@ def test_scorer_is_stable_for_expected_keywords():
         cost_usd=0,
     )
 
-    scores = score_attempt(task, attempt)
-    assert len(scores) == 2
-    quality = next(score for score in scores if score.metric_name == "quality")
-    passed = next(score for score in scores if score.metric_name == "pass")
+    score = score_attempt(task, attempt)
 
-    assert 0.0 <= quality.value <= 1.0
-    assert passed.value in {0.0, 1.0}
+    assert 0.0 <= score.quality <= 1.0
+    assert score.passed in {True, False}
+    assert metric_value(score, "pass") in {0.0, 1.0}
+    assert task.scoring_details == {
+        "expected_terms": ["null", "guard", "profile"],
+        "pass_threshold": 0.6,
+    }
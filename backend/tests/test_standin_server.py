@@ -0,0 +1,147 @@
+import asyncio
+
+import httpx
+from starlette.testclient import TestClient
+
+from app.providers.anthropic_provider import AnthropicProvider
+from app.providers.openai_provider import OpenAIProvider
+from benchmarks.provider_load import run_benchmark
+from benchmarks.standin_server import StandinConfig, create_app, running_server
+
+CONFIG = {"model_name": "standin-1", "system_prompt": "You review pull requests."}
+
+
+def test_serves_openai_and_anthropic_wire_formats():
+    client = TestClient(create_app(StandinConfig(latency_ms=0, completion_tokens=5)))
+
+    completion = client.post(
+        "/v1/chat/completions",
+        json={"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "check this diff"}]},
+    ).json()
+    assert completion["object"] == "chat.completion"
+    assert completion["choices"][0]["message"]["content"].startswith("standin-response:")
+    assert completion["usage"] == {
+        "prompt_tokens": 3,
+        "completion_tokens": 5,
+        "total_tokens": 8,
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+
+    message = client.post(
+        "/v1/messages",
+        json={
+            "model": "claude-haiku-4-5",
+            "max_tokens": 2,
+            "system": [{"type": "text", "text": "Be brief"}],
+            "messages": [{"role": "user", "content": "check this diff"}],
+        },
+    ).json()
+    assert message["type"] == "message"
+    assert message["usage"]["input_tokens"] == 5
+    assert message["usage"]["output_tokens"] == 2
+
+    stats = client.get("/stats").json()
+    assert stats["requests"] == 2
+    assert stats["by_api"] == {"openai": 1, "anthropic": 1}
+
+
+def test_injected_rate_limits_return_429_with_retry_after():
+    client = TestClient(
+        create_app(StandinConfig(latency_ms=0, rate_limit_error_rate=1.0, retry_after_s=0.25))
+    )
+    response = client.post("/v1/messages", json={"model": "m", "max_tokens": 8, "messages": []})
+
+    assert response.status_code == 429
+    assert response.headers["retry-after-ms"] == "250"
+    assert response.json()["error"]["type"] == "rate_limit_error"
+    assert client.get("/stats").json()["rate_limited"] == 1
+
+
+def test_real_providers_round_trip_through_the_standin():
+    with running_server(StandinConfig(latency_ms=1, completion_tokens=4)) as base_url:
+        openai = OpenAIProvider(api_key="standin", base_url=f"{base_url}/v1")
+        result = openai.generate("Review this retry loop", CONFIG)
+        assert result.error is None
+        assert result.raw_output.startswith("standin-response:")
+        assert result.usage.prompt_tokens == 8
+        assert result.usage.completion_tokens == 4
+        assert result.raw_response["object"] == "chat.completion"
+
+        anthropic = AnthropicProvider(api_key="standin", base_url=base_url)
+        result = asyncio.run(anthropic.agenerate("Review this retry loop", CONFIG))
+        assert result.error is None
+        assert result.usage.total_tokens == 12
+        assert result.raw_response["type"] == "message"
+
+        failing = OpenAIProvider(api_key="standin", base_url=f"{base_url}/v1/missing")
+        assert failing.generate("anything", CONFIG).error.startswith("openai_error:")
+
+
+def test_providers_report_the_retries_spent_on_429s():
+    config = StandinConfig(latency_ms=0, rate_limit_error_rate=0.5, retry_after_s=0.001, seed=7)
+    with running_server(config) as base_url:
+        openai = OpenAIProvider(api_key="standin", base_url=f"{base_url}/v1")
+        anthropic = AnthropicProvider(api_key="standin", base_url=base_url)
+        results = [openai.generate("Review this retry loop", CONFIG) for _ in range(4)]
+        results += [anthropic.generate("Review this retry loop", CONFIG) for _ in range(4)]
+
+        async def generate_async():
+            outcome = [
+                await openai.agenerate("Review this retry loop", CONFIG),
+                await anthropic.agenerate("Review this retry loop", CONFIG),
+            ]
+            await openai._async_clients.aclose()
+            await anthropic._async_clients.aclose()
+            return outcome
+
+        results += asyncio.run(generate_async())
+        rate_limited = httpx.get(f"{base_url}/stats").json()["rate_limited"]
+
+    # Each 429 is retried unless the SDK has run out of retries, which fails the call.
+    failed = sum(1 for result in results if result.error is not None)
+    assert rate_limited > 0
+    assert sum(result.retry_count for result in results) + failed == rate_limited
+    assert all(result.retry_count == 2 for result in results if result.error is not None)
+
+
+def test_streams_in_both_formats():
+    from anthropic import Anthropic
+    from openai import OpenAI
+
+    with running_server(StandinConfig(latency_ms=0, completion_tokens=6)) as base_url:
+        openai = OpenAI(api_key="standin", base_url=f"{base_url}/v1")
+        streamed = openai.chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}], stream=True
+        )
+        text = "".join(chunk.choices[0].delta.content or "" for chunk in streamed if chunk.choices)
+        complete = openai.chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}]
+        )
+        assert text == complete.choices[0].message.content
+
+        anthropic = Anthropic(api_key="standin", base_url=base_url)
+        with anthropic.messages.stream(
+            model="claude-haiku-4-5",
+            max_tokens=16,
+            messages=[{"role": "user", "content": "hi"}],
+        ) as stream:
+            message = stream.get_final_message()
+        assert message.content[0].text == text
+        assert message.usage.output_tokens == 6
+
+        assert httpx.get(f"{base_url}/stats").json()["in_flight"] == 0
+
+
+def test_provider_load_benchmark_smoke():
+    result = run_benchmark(requests=8, concurrency=4, config=StandinConfig(latency_ms=1))
+
+    assert {(item["provider"], item["path"]) for item in result["scenarios"]} == {
+        ("openai", "sync"),
+        ("openai", "async"),
+        ("anthropic", "sync"),
+        ("anthropic", "async"),
+    }
+    for scenario in result["scenarios"]:
+        assert scenario["errors"] == 0, scenario["first_error"]
+        assert scenario["server_requests"] == 8
+        assert scenario["requests_per_second"] > 0
@@ -0,0 +1,67 @@
+from app.services.summary_cache import (
+    CachedPayload,
+    InMemorySummaryCache,
+    compute_etag,
+    etag_matches,
+    get_summary_cache,
+)
+
+
+def _sample_payload() -> dict:
+    return {
+        "name": "Cache Eval",
+        "workload_type": "ci_triage",
+        "dataset_ref": "ci_triage/v1.jsonl",
+        "sampling": {"max_tasks": 2},
+        "budget_usd": "5.00",
+        "seed": 3,
+        "model_arms": [{"provider": "mock", "model_name": "mock-a", "config": {}}],
+    }
+
+
+def test_lru_evicts_least_recently_used():
+    cache = InMemorySummaryCache(max_entries=2)
+    payload = CachedPayload(body=b"{}", etag=compute_etag(b"{}"))
+    cache.set("run-1", "summary", payload)
+    cache.set("run-2", "summary", payload)
+    assert cache.get("run-1", "summary") is payload
+    cache.set("run-3", "summary", payload)
+
+    assert cache.get("run-2", "summary") is None
+    assert cache.get("run-1", "summary") is payload
+    cache.invalidate("run-1")
+    assert cache.get("run-1", "summary") is None
+
+
+def test_etag_matching_handles_lists_and_weak_tags():
+    etag = compute_etag(b"body")
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_completed_run_summary_supports_conditional_get(client):
+    experiment_id = client.post("/experiments", json=_sample_payload()).json()["id"]
+    run_id = client.post(
+        f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}
+    ).json()["id"]
+
+    first = client.get(f"/runs/{run_id}/summary")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert get_summary_cache().get(run_id, "summary") is not None
+
+    second = client.get(f"/runs/{run_id}/summary", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+
+    run_response = client.get(f"/runs/{run_id}")
+    assert run_response.status_code == 200
+    assert run_response.json()["id"] == run_id
+    revalidated = client.get(
+        f"/runs/{run_id}", headers={"If-None-Match": run_response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+    assert client.get("/runs/missing/summary").status_code == 404
@@ -0,0 +1,42 @@
+import uuid
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from app.core.tracing import configure_tracing
+
+
+def test_run_spans_share_correlation_trace_id(client):
+    exporter = configure_tracing("memory")
+    exporter.clear()
+    payload = {
+        "name": "Tracing Eval",
+        "workload_type": "pr_review",
+        "dataset_ref": "pr_review/v1.jsonl",
+        "sampling": {"max_tasks": 2},
+        "budget_usd": "5.00",
+        "seed": 2,
+        "model_arms": [{"provider": "mock", "model_name": "mock-trace", "config": {}}],
+    }
+    experiment_id = client.post("/experiments", json=payload).json()["id"]
+    run = client.post(f"/experiments/{experiment_id}/runs", json={"failure_threshold": 1.0}).json()
+
+    spans = exporter.get_finished_spans()
+    names = {span.name for span in spans}
+    assert {
+        "execute_run",
+        "run.dataset_load",
+        "run.planning",
+        "provider.generate",
+        "db.commit",
+    } <= names
+    assert "POST /experiments/{experiment_id}/runs" in names
+
+    trace_id = uuid.UUID(run["correlation_id"]).int
+    run_spans = [span for span in spans if span.context.trace_id == trace_id]
+    generate_spans = [span for span in run_spans if span.name == "provider.generate"]
+    assert len(generate_spans) == 2
+    assert generate_spans[0].attributes["modeleval.model"] == "mock-trace"
+    assert generate_spans[0].attributes["modeleval.usage.prompt_tokens"] > 0
+    assert generate_spans[0].attributes["modeleval.retry_count"] == 0
@@ -19,13 +19,18 @@ def _base_url() -> str:
     return os.getenv("MODELEVAL_API_URL", "http://localhost:8000")
 
 
-def _request(method: str, path: str, payload: Optional[dict] = None) -> Any:
+def _send(method: str, path: str, payload: Optional[dict] = None) -> httpx.Response:
     url = f"{_base_url().rstrip('/')}{path}"
     with httpx.Client(timeout=300) as client:
         response = client.request(method=method, url=url, json=payload)
     if response.status_code >= 400:
         typer.echo(f"Request failed ({response.status_code}): {response.text}")
         raise typer.Exit(code=1)
+    return response
+
+
+def _request(method: str, path: str, payload: Optional[dict] = None) -> Any:
+    response = _send(method, path, payload)
     return response.json() if response.content else None
 
 
@@ -49,13 +54,39 @@ def create_experiment(file: Path = typer.Option(..., "--file", "-f", exists=True
     _print(_request("POST", "/experiments", payload=payload))
 
 
+@experiments_app.command("estimate")
+def estimate_experiment(
+    experiment_id: str, seed: Optional[int] = typer.Option(None, "--seed")
+) -> None:
+    payload: dict[str, Any] = {}
+    if seed is not None:
+        payload["seed"] = seed
+    _print(_request("POST", f"/experiments/{experiment_id}/estimate", payload=payload))
+
+
 @runs_app.command("launch")
 def launch_run(
     experiment_id: str,
     seed: Optional[int] = typer.Option(None, "--seed"),
     failure_threshold: float = typer.Option(0.5, "--failure-threshold", min=0.0, max=1.0),
+    profile: bool = typer.Option(False, "--profile", help="Capture cProfile and tracemalloc artifacts."),
+    reuse: bool = typer.Option(
+        True, "--reuse/--no-reuse", help="Copy attempts for unchanged arms from a matching earlier run."
+    ),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="Only evaluate dataset rows earlier runs have not covered."
+    ),
+    budget_check: bool = typer.Option(
+        True, "--budget-check/--no-budget-check", help="Refuse runs projected to exceed the budget."
+    ),
 ) -> None:
-    payload: dict[str, Any] = {"failure_threshold": failure_threshold}
+    payload: dict[str, Any] = {
+        "failure_threshold": failure_threshold,
+        "profile": profile,
+        "reuse_attempts": reuse,
+        "incremental": incremental,
+        "enforce_budget": budget_check,
+    }
     if seed is not None:
         payload["seed"] = seed
     _print(_request("POST", f"/experiments/{experiment_id}/runs", payload=payload))
@@ -71,5 +102,41 @@ def run_summary(run_id: str) -> None:
     _print(_request("GET", f"/runs/{run_id}/summary"))
 
 
+@runs_app.command("profile")
+def run_profile(
+    run_id: str,
+    artifact: Optional[str] = typer.Option(None, "--download", help="Artifact name, e.g. cpu.pstats."),
+    output: Optional[Path] = typer.Option(None, "--output", "-o"),
+) -> None:
+    if artifact is None:
+        _print(_request("GET", f"/runs/{run_id}/profile"))
+        return
+    response = _send("GET", f"/runs/{run_id}/profile/{artifact}")
+    target = output or Path(f"{run_id}-{artifact}")
+    target.write_bytes(response.content)
+    typer.echo(str(target))
+
+
+@runs_app.command("export")
+def export_runs(
+    run_ids: list[str] = typer.Argument(..., help="One or more run IDs."),
+    export_format: str = typer.Option("parquet", "--format", help="parquet or arrow (IPC stream)."),
+    output: Optional[Path] = typer.Option(None, "--output", "-o"),
+    chunk_size: int = typer.Option(10_000, "--chunk-size", min=100, max=100_000),
+) -> None:
+    url = f"{_base_url().rstrip('/')}/runs/export"
+    params = [("run_id", run_id) for run_id in run_ids]
+    params += [("format", export_format), ("chunk_size", str(chunk_size))]
+    target = output or Path(f"{run_ids[0] if len(run_ids) == 1 else 'runs'}.{export_format}")
+    with httpx.Client(timeout=None) as client, client.stream("GET", url, params=params) as response:
+        if response.status_code >= 400:
+            typer.echo(f"Request failed ({response.status_code}): {response.read().decode()}")
+            raise typer.Exit(code=1)
+        with target.open("wb") as handle:
+            for chunk in response.iter_bytes():
+                handle.write(chunk)
+    typer.echo(str(target))
+
+
 if __name__ == "__main__":
     app()
@@ -1,4 +1,5 @@
-export type ProviderType = 'openai' | 'anthropic' | 'mock'
+// Built-in providers; the backend may register more through plugins.
+export type ProviderType = 'openai' | 'anthropic' | 'mock' | (string & {})
 export type WorkloadType = 'pr_review' | 'ci_triage'
 
 export interface ModelArm {